@@ -0,0 +1,143 @@
+from app.labels import CATEGORIES, TYPES
+from app.transaction import datetime_from_ordinal, to_rubles
+
+
+class LedgerTotals:
+    """
+    Накопленные итоги по транзакциям: суммы по типам, по категориям и по
+    месяцам. Каждое значение хранится как [сумма в копейках, количество],
+    чтобы ключ можно было удалить, когда по нему не осталось транзакций.
+    Суммы целые, поэтому не накапливают ошибку округления; в рубли они
+    переводятся только при чтении. Типы и категории в ключах - коды таблиц
+    TYPES и CATEGORIES, строки подставляются тоже только при чтении.
+    """
+    def __init__(self):
+        self.by_type = {}  # код типа -> [сумма, количество]
+        self.by_category = {}  # (код типа, код категории) -> [сумма, количество]
+        self.by_month = {}  # (код типа, год, месяц) -> [сумма, количество]
+        self.count = 0
+
+    @staticmethod
+    def _bump(totals, key, amount, sign):
+        entry = totals.get(key)
+        if entry is None:
+            totals[key] = [amount, 1]
+        elif entry[1] + sign == 0:
+            del totals[key]
+        else:
+            entry[0] += sign * amount
+            entry[1] += sign
+
+    def add(self, kopecks, category_code, ordinal, type_code, sign=1):
+        """
+        Учитывает одну транзакцию, заданную значениями полей (сумма в копейках,
+        коды категории и типа).
+        :param sign: 1 для добавления, -1 для удаления.
+        """
+        day = datetime_from_ordinal(ordinal)
+        self._bump(self.by_type, type_code, kopecks, sign)
+        self._bump(self.by_category, (type_code, category_code), kopecks, sign)
+        self._bump(self.by_month, (type_code, day.year, day.month), kopecks, sign)
+        self.count += sign
+
+    def add_many(self, transactions):
+        """
+        Учитывает пачку транзакций: суммы сначала собираются по пачке,
+        затем одним проходом переносятся в итоги.
+        """
+        by_type, by_category, by_month = {}, {}, {}
+        months = {}
+        count = 0
+        for t in transactions:
+            count += 1
+            month = months.get(t.ordinal)
+            if month is None:
+                day = datetime_from_ordinal(t.ordinal)
+                month = months[t.ordinal] = (day.year, day.month)
+            for totals, key in (
+                (by_type, t.type_code),
+                (by_category, (t.type_code, t.category_code)),
+                (by_month, (t.type_code, *month)),
+            ):
+                entry = totals.get(key)
+                if entry is None:
+                    totals[key] = [t.kopecks, 1]
+                else:
+                    entry[0] += t.kopecks
+                    entry[1] += 1
+        for target, source in (
+            (self.by_type, by_type),
+            (self.by_category, by_category),
+            (self.by_month, by_month),
+        ):
+            for key, (amount, rows) in source.items():
+                entry = target.get(key)
+                if entry is None:
+                    target[key] = [amount, rows]
+                else:
+                    entry[0] += amount
+                    entry[1] += rows
+        self.count += count
+
+    def add_transaction(self, transaction):
+        """Учитывает транзакцию."""
+        self.add(transaction.kopecks, transaction.category_code, transaction.ordinal, transaction.type_code)
+
+    def remove_transaction(self, transaction):
+        """Исключает ранее учтенную транзакцию."""
+        self.add(transaction.kopecks, transaction.category_code, transaction.ordinal, transaction.type_code, -1)
+
+    def total(self, transaction_type) -> float:
+        """Сумма всех транзакций указанного типа."""
+        return to_rubles(self.total_kopecks(transaction_type))
+
+    def total_kopecks(self, transaction_type) -> int:
+        """Сумма всех транзакций указанного типа в копейках."""
+        entry = self.by_type.get(TYPES.get(transaction_type))
+        return entry[0] if entry else 0
+
+    @property
+    def income(self) -> float:
+        return self.total("income")
+
+    @property
+    def expense(self) -> float:
+        return self.total("expense")
+
+    @property
+    def balance(self) -> float:
+        return to_rubles(self.total_kopecks("income") - self.total_kopecks("expense"))
+
+    def category_totals(self, transaction_type) -> dict:
+        """Суммы по категориям для указанного типа."""
+        code = TYPES.get(transaction_type)
+        names = CATEGORIES.names
+        return {
+            names[category]: to_rubles(entry[0])
+            for (kind, category), entry in self.by_category.items()
+            if kind == code
+        }
+
+    def month_total(self, transaction_type, month: int, year: int) -> float:
+        """Сумма транзакций указанного типа за месяц."""
+        return to_rubles(self.month_total_kopecks(transaction_type, month, year))
+
+    def month_total_kopecks(self, transaction_type, month: int, year: int) -> int:
+        """Сумма транзакций указанного типа за месяц в копейках."""
+        entry = self.by_month.get((TYPES.get(transaction_type), year, month))
+        return entry[0] if entry else 0
+
+    def month_series(self):
+        """Список (год, месяц, доходы, расходы) по всем месяцам в порядке дат."""
+        income, expense = TYPES.get("income"), TYPES.get("expense")
+        months = {}
+        for (kind, year, month), entry in self.by_month.items():
+            totals = months.setdefault((year, month), [0, 0])
+            if kind == income:
+                totals[0] += entry[0]
+            elif kind == expense:
+                totals[1] += entry[0]
+        return [
+            (year, month, to_rubles(income), to_rubles(expense))
+            for (year, month), (income, expense) in sorted(months.items())
+        ]
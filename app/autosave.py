@@ -0,0 +1,99 @@
+import sys
+import threading
+import time
+
+AUTOSAVE_DELAY = 2.0  # секунд после первого изменения до записи
+AUTOSAVE_MAX_PENDING = 200  # изменений, после которых запись не откладывается
+
+
+class AutosaveWriter:
+    """
+    Фоновый поток, который откладывает и объединяет записи на диск.
+
+    Вызывающий поток только отмечает изменения (mark_dirty) и не ждет диска.
+    Поток записи вызывает save() не раньше чем через delay секунд после
+    первого незаписанного изменения или сразу, когда изменений накопилось
+    max_pending. Все изменения, пришедшие до вызова, записываются одним save().
+    """
+    def __init__(self, save, delay: float = AUTOSAVE_DELAY, max_pending: int = AUTOSAVE_MAX_PENDING):
+        self._save = save
+        self.delay = delay
+        self.max_pending = max_pending
+        self.flushes = 0
+        self.error = None
+        self._pending = 0
+        self._first_change = None
+        self._requested = 0  # номер запрошенной немедленной записи
+        self._completed = 0  # номер последней завершенной записи
+        self._closing = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self, changes: int = 1) -> None:
+        """Отмечает изменения, которые нужно записать."""
+        with self._condition:
+            self._pending += changes
+            if self._first_change is None:
+                self._first_change = time.monotonic()
+            if self._pending >= self.max_pending:
+                self._condition.notify_all()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _due(self) -> bool:
+        if self._closing or self._requested > self._completed:
+            return True
+        if not self._pending:
+            return False
+        return self._pending >= self.max_pending or time.monotonic() - self._first_change >= self.delay
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._due():
+                    timeout = None
+                    if self._pending:
+                        timeout = max(self.delay - (time.monotonic() - self._first_change), 0)
+                    self._condition.wait(timeout)
+                requested = self._requested
+                closing = self._closing
+                changes, self._pending, self._first_change = self._pending, 0, None
+            if changes:
+                try:
+                    self._save()
+                    self.flushes += 1
+                    self.error = None
+                except Exception as e:
+                    # Изменения остаются незаписанными до следующей попытки
+                    self.error = e
+                    print(f"Ошибка автосохранения: {e}", file=sys.stderr)
+                    with self._condition:
+                        self._pending += changes
+                        if self._first_change is None:
+                            self._first_change = time.monotonic()
+            with self._condition:
+                self._completed = max(self._completed, requested)
+                self._condition.notify_all()
+                if closing:
+                    return
+
+    def flush(self) -> None:
+        """Немедленно записывает накопленные изменения и дожидается записи."""
+        with self._condition:
+            if not self._thread.is_alive():
+                return
+            self._requested += 1
+            ticket = self._requested
+            self._condition.notify_all()
+            while self._completed < ticket and self._thread.is_alive():
+                self._condition.wait(0.1)
+
+    def close(self) -> None:
+        """Записывает накопленные изменения и останавливает поток."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join()
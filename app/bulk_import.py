@@ -0,0 +1,117 @@
+import csv
+import io
+import os
+import time
+from collections import namedtuple
+from app.journal import pending_operations
+from app.streaming import column_positions, compression_of, iter_rows, open_csv
+from app.transaction import Transaction, parse_date, to_kopecks
+
+CHUNK_BYTES = 8 * 1024 * 1024  # файлы крупнее делятся на части по границам строк
+
+FileImportStats = namedtuple("FileImportStats", "path rows seconds chunks skipped", defaults=(0,))
+
+
+def _read_header(path):
+    """
+    Возвращает (номера колонок, смещение первой строки данных).
+    У пустого файла (или с пустой первой строкой) колонок нет - в нем нет строк.
+    """
+    with open_csv(path, "rb") as file:
+        header = file.readline()
+        offset = file.tell()
+    row = next(csv.reader([header.decode("utf-8-sig")]), None)
+    if not row:
+        return None, offset
+    return column_positions(row), offset
+
+
+def split_ranges(path, data_start: int, chunk_bytes: int = CHUNK_BYTES):
+    """
+    Делит файл на диапазоны байтов [начало, конец), выровненные по началу
+    строк. Поля с переводами строк внутри кавычек при делении не поддерживаются.
+    Сжатый файл не делится: распаковать его можно только последовательно,
+    поэтому он разбирается одним диапазоном до конца файла (конец - None).
+    """
+    if compression_of(path):
+        return [(data_start, None)]
+    size = os.path.getsize(path)
+    bounds = [data_start]
+    with open(path, "rb") as file:
+        target = data_start + chunk_bytes
+        while target < size:
+            file.seek(target)
+            file.readline()
+            position = file.tell()
+            if position >= size:
+                break
+            bounds.append(position)
+            target = position + chunk_bytes
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _parse_range(path, columns, start: int, end: int):
+    """
+    Разбирает строки файла в диапазоне байтов (выполняется в процессе пула);
+    end=None - до конца файла, смещения для сжатых файлов - в распакованных данных;
+    start=None - весь файл с операциями его журнала.
+    Возвращает (строки (копейки, категория, дата, тип), время разбора).
+    """
+    began = time.perf_counter()
+    if start is None:
+        rows = [
+            (to_kopecks(amount), category, parse_date(day), transaction_type)
+            for day, transaction_type, category, amount in iter_rows(path)
+        ]
+        return rows, time.perf_counter() - began
+    with open_csv(path, "rb") as file:
+        file.seek(start)
+        text = file.read(-1 if end is None else end - start).decode("utf-8")
+    date_col, type_col, category_col, amount_col = columns
+    rows = [
+        (to_kopecks(row[amount_col]), row[category_col], parse_date(row[date_col]), row[type_col])
+        for row in csv.reader(io.StringIO(text, newline=""))
+        if row
+    ]
+    return rows, time.perf_counter() - began
+
+
+def import_csv_files(paths, max_workers: int = None, chunk_bytes: int = CHUNK_BYTES):
+    """
+    Параллельно разбирает CSV-файлы (крупные - по частям) в пуле процессов.
+    Возвращает (транзакции в порядке файлов и строк, статистика по файлам).
+    """
+    tasks = []
+    for path in paths:
+        columns, data_start = _read_header(path)
+        if columns and pending_operations(path):
+            # Операции журнала ссылаются на позиции во всем файле: он не делится
+            ranges = [(None, None)]
+        else:
+            ranges = split_ranges(path, data_start, chunk_bytes) if columns else []
+        tasks.append((path, columns, ranges))
+
+    jobs = [(path, columns, start, end) for path, columns, ranges in tasks for start, end in ranges]
+    if len(jobs) > 1 and max_workers != 1:
+        # Пул процессов импортируется только здесь, чтобы не замедлять запуск
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_parse_range, *zip(*jobs)))
+    else:
+        results = [_parse_range(*job) for job in jobs]
+
+    transactions = []
+    stats = []
+    results = iter(results)
+    from_ordinal = Transaction.from_ordinal
+    for path, _, ranges in tasks:
+        rows = seconds = 0
+        for _ in ranges:
+            parsed, elapsed = next(results)
+            transactions.extend(from_ordinal(*row) for row in parsed)
+            rows += len(parsed)
+            seconds += elapsed
+        stats.append(FileImportStats(path, rows, seconds, len(ranges)))
+    return transactions, stats
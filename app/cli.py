@@ -0,0 +1,318 @@
+import argparse
+import calendar
+import csv
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from datetime import date
+from app.finance_traker import FinanceTracker, ensure_files_directory_exists
+from app.streaming import CSV_HEADER, column_positions, open_csv, transaction_to_row
+from app.transaction import Transaction
+
+# Коды завершения
+EXIT_OK = 0
+EXIT_ERROR = 1  # файл не найден или ошибка ввода-вывода
+EXIT_INVALID = 2  # некорректные входные данные (как и ошибки аргументов argparse)
+
+TRANSACTION_TYPES = ("income", "expense")
+
+
+def transaction_dict(transaction) -> dict:
+    date, transaction_type, category, _ = transaction_to_row(transaction)
+    return {"date": date, "type": transaction_type, "category": category, "amount": transaction.amount}
+
+
+def parse_transaction(amount, category, date, transaction_type) -> Transaction:
+    """Создает транзакцию из внешних данных с проверкой полей."""
+    if transaction_type not in TRANSACTION_TYPES:
+        raise ValueError("тип должен быть 'income' или 'expense'")
+    if not category:
+        raise ValueError("категория не может быть пустой")
+    return Transaction(amount, category, date, transaction_type)
+
+
+def _jsonl_fields(line):
+    record = json.loads(line)
+    return record["amount"], record["category"], record["date"], record["type"]
+
+
+def read_transactions(stream, input_format="jsonl"):
+    """
+    Построчно читает транзакции из потока JSONL или CSV с заголовком.
+    Возвращает (транзакции, ошибки), где ошибки - сообщения с номером строки.
+    """
+    transactions, errors = [], []
+    if input_format == "jsonl":
+        rows = ((number, line) for number, line in enumerate(stream, 1) if line.strip())
+        fields = _jsonl_fields
+    else:
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            return transactions, errors
+        try:
+            date_col, type_col, category_col, amount_col = column_positions(header)
+        except ValueError as e:
+            return transactions, [f"строка 1: {e}"]
+        rows = ((reader.line_num, row) for row in reader if row)
+
+        def fields(row):
+            return row[amount_col], row[category_col], row[date_col], row[type_col]
+
+    for number, raw in rows:
+        try:
+            transactions.append(parse_transaction(*fields(raw)))
+        except (TypeError, ValueError, KeyError, IndexError) as e:
+            errors.append(f"строка {number}: {e}")
+    return transactions, errors
+
+
+def _load(args, **filters) -> FinanceTracker:
+    """
+    Загружает журнал транзакций. Сообщения трекера уходят в stderr, чтобы
+    не смешиваться с результатом команды; ошибки чтения и разбора не
+    перехватываются (см. main), чтобы команда не работала с частью журнала. С --db трекер ничего не загружает,
+    а передает запросы базе SQLite (FinanceTracker.attach_storage).
+    :param filters: Условия отбора для load_from_csv (start, end, categories, transaction_type).
+    """
+    tracker = FinanceTracker()
+    if args.db:
+        # sqlite3 импортируется только для --db, чтобы не замедлять запуск
+        from app.storage import SqliteStorage
+
+        tracker.attach_storage(SqliteStorage(args.db))
+        return tracker
+    with redirect_stdout(sys.stderr):
+        tracker.load_from_csv(args.file, strict=True, **filters)
+    return tracker
+
+
+def _open_for_append(args) -> FinanceTracker:
+    """
+    Трекер, который дописывает транзакции в журнал, не загружая его
+    (CsvStorage.append или SqliteStorage.append). CSV-файл до дозаписи
+    проверяется одним потоковым проходом, чтобы не дописывать в поврежденный.
+    """
+    if args.db:
+        return _load(args)
+    from app.storage import CsvStorage
+
+    ensure_files_directory_exists()
+    tracker = FinanceTracker()
+    tracker.attach_storage(CsvStorage(os.path.join("files", args.file)))
+    return tracker
+
+
+def _require_ledger(args) -> bool:
+    path = args.db or os.path.join("files", args.file)
+    if os.path.exists(path):
+        return True
+    print(f"Файл {path} не найден.", file=sys.stderr)
+    return False
+
+
+def _require_csv(args) -> bool:
+    if not args.db:
+        return True
+    print(f"Команда {args.command} работает только с CSV-журналом (без --db).", file=sys.stderr)
+    return False
+
+
+def _save(tracker: FinanceTracker, args) -> None:
+    with redirect_stdout(sys.stderr):
+        if not args.db:
+            tracker.export_to_csv(args.file, "a", strict=True)
+        tracker.close()
+
+
+def _emit(args, data, lines) -> None:
+    """Печатает результат как JSON или как готовые текстовые строки."""
+    if args.json:
+        json.dump(data, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write("".join(line + "\n" for line in lines))
+
+
+def cmd_add(args) -> int:
+    if args.input == "-":
+        transactions, errors = read_transactions(sys.stdin, args.format)
+    else:
+        with open_csv(args.input) as stream:
+            transactions, errors = read_transactions(stream, args.format)
+    if errors:
+        for error in errors:
+            print(f"Ошибка: {error}", file=sys.stderr)
+        print("Транзакции не добавлены.", file=sys.stderr)
+        return EXIT_INVALID
+    tracker = _open_for_append(args)
+    try:
+        path = args.db or os.path.join("files", args.file)
+        total = tracker.get_transaction_count() if os.path.exists(path) else 0
+        tracker.add_transactions(transactions)
+    finally:
+        tracker.close()
+    total += len(transactions)
+    _emit(args, {"added": len(transactions), "total": total},
+          [f"Добавлено транзакций: {len(transactions)}"])
+    return EXIT_OK
+
+
+def cmd_import(args) -> int:
+    if not _require_csv(args):
+        return EXIT_INVALID
+    missing = [name for name in args.files if not os.path.exists(os.path.join("files", name))]
+    if missing:
+        print(f"Файлы не найдены: {', '.join(missing)}", file=sys.stderr)
+        return EXIT_ERROR
+    tracker = _load(args)
+    stats = tracker.import_csv_files(args.files, args.workers, skip_known=args.skip_known)
+    _save(tracker, args)
+    _emit(args, {
+        "files": [{"path": item.path, "rows": item.rows, "skipped": item.skipped} for item in stats],
+        "total": len(tracker.transactions),
+    }, [f"{item.path}: {item.rows} транзакций, пропущено повторов: {item.skipped}" for item in stats])
+    return EXIT_OK
+
+
+def cmd_export(args) -> int:
+    if not _require_csv(args):
+        return EXIT_INVALID
+    if not _require_ledger(args):
+        return EXIT_ERROR
+    tracker = _load(args, start=args.start, end=args.end, categories=args.category,
+                    transaction_type=args.type)
+    out = sys.stdout if args.output == "-" else open_csv(args.output, "w")
+    try:
+        if args.json:
+            out.writelines(
+                json.dumps(transaction_dict(t), ensure_ascii=False) + "\n" for t in tracker.transactions)
+        else:
+            writer = csv.writer(out)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(transaction_to_row(t) for t in tracker.transactions)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return EXIT_OK
+
+
+def cmd_balance(args) -> int:
+    if not _require_ledger(args):
+        return EXIT_ERROR
+    tracker = _load(args)
+    income, expense = tracker.get_totals(args.as_of)
+    # Баланс считается в копейках, а не вычитанием сумм в рублях
+    balance = tracker.get_balance() if args.as_of is None else tracker.get_balance_as_of(args.as_of)
+    tracker.close()
+    _emit(args, {"income": income, "expense": expense, "balance": balance}, [
+        f"Доходы: {income:.2f} руб.",
+        f"Расходы: {expense:.2f} руб.",
+        f"Баланс: {balance:.2f} руб.",
+    ])
+    return EXIT_OK
+
+
+def cmd_report(args) -> int:
+    if not _require_ledger(args):
+        return EXIT_ERROR
+    # Загружаются только строки месяца: остальные отбрасываются до разбора
+    last_day = calendar.monthrange(args.year, args.month)[1]
+    tracker = _load(args, start=date(args.year, args.month, 1), end=date(args.year, args.month, last_day))
+    transactions = tracker.get_monthly_report(args.month, args.year)
+    income, expense = tracker.get_monthly_totals(args.month, args.year)
+    tracker.close()
+    _emit(args, {
+        "month": args.month,
+        "year": args.year,
+        "income": income,
+        "expense": expense,
+        "transactions": [transaction_dict(t) for t in transactions],
+    }, [str(t) for t in transactions] + [
+        f"Доходы: {income:.2f} руб., расходы: {expense:.2f} руб."])
+    return EXIT_OK
+
+
+def cmd_categories(args) -> int:
+    if not _require_ledger(args):
+        return EXIT_ERROR
+    tracker = _load(args, transaction_type=args.type)
+    totals = tracker.get_category_totals(args.type)
+    tracker.close()
+    ordered = sorted(totals.items(), key=lambda item: -item[1])
+    _emit(args, dict(ordered), [f"{category}: {amount:.2f} руб." for category, amount in ordered])
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Пакетные операции финансового трекера без интерактивного меню.")
+    parser.add_argument("--file", default="data.csv", help="CSV-файл журнала в папке files")
+    parser.add_argument("--db", default=None,
+                        help="База SQLite вместо CSV-файла (см. python -m app.migrate); "
+                             "баланс и отчеты считаются запросами SQL")
+    parser.add_argument("--json", action="store_true", help="Вывод в формате JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Добавить транзакции из stdin или файла")
+    add.add_argument("--input", default="-", help="Файл с транзакциями (- для stdin)")
+    add.add_argument("--format", choices=("jsonl", "csv"), default="jsonl",
+                     help="jsonl: объекты с полями amount, category, date, type; "
+                          "csv: колонки Date, Type, Category, Amount")
+    add.set_defaults(handler=cmd_add)
+
+    import_ = commands.add_parser("import", help="Импортировать CSV-файлы из папки files")
+    import_.add_argument("files", nargs="+", help="Имена CSV-файлов")
+    import_.add_argument("--workers", type=int, default=None, help="Число процессов разбора")
+    import_.add_argument("--skip-known", action="store_true",
+                         help="Пропускать транзакции, которые уже есть в журнале (пересекающиеся выписки)")
+    import_.set_defaults(handler=cmd_import)
+
+    export = commands.add_parser("export", help="Выгрузить транзакции (CSV или JSONL с --json)")
+    export.add_argument("--output", default="-", help="Файл для выгрузки (- для stdout)")
+    export.add_argument("--from", dest="start", type=date.fromisoformat, default=None, metavar="ГГГГ-ММ-ДД",
+                        help="Только транзакции с даты включительно")
+    export.add_argument("--to", dest="end", type=date.fromisoformat, default=None, metavar="ГГГГ-ММ-ДД",
+                        help="Только транзакции по дату включительно")
+    export.add_argument("--category", action="append", default=None,
+                        help="Только указанная категория (можно повторять)")
+    export.add_argument("--type", choices=TRANSACTION_TYPES, default=None)
+    export.set_defaults(handler=cmd_export)
+
+    balance = commands.add_parser("balance", help="Показать доходы, расходы и баланс")
+    balance.add_argument("--as-of", type=date.fromisoformat, default=None, metavar="ГГГГ-ММ-ДД",
+                         help="Учитывать только транзакции до даты включительно")
+    balance.set_defaults(handler=cmd_balance)
+
+    report = commands.add_parser("report", help="Отчет за месяц")
+    report.add_argument("--month", type=int, required=True, choices=range(1, 13), metavar="MONTH")
+    report.add_argument("--year", type=int, required=True)
+    report.set_defaults(handler=cmd_report)
+
+    categories = commands.add_parser("categories", help="Суммы по категориям")
+    categories.add_argument("--type", choices=TRANSACTION_TYPES, default="expense")
+    categories.set_defaults(handler=cmd_categories)
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Точка входа пакетного режима.
+    Пример: python cli.py --json balance
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except OSError as e:
+        print(f"Ошибка ввода-вывода: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    except (ValueError, csv.Error) as e:
+        print(f"Ошибка в данных журнала: {e}", file=sys.stderr)
+        return EXIT_INVALID
+    finally:
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
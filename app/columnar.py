@@ -0,0 +1,125 @@
+from array import array
+from collections.abc import MutableSequence
+from functools import lru_cache
+from app.transaction import Transaction
+
+
+@lru_cache(maxsize=None)
+def _np():
+    """
+    Возвращает модуль numpy или None, если он не установлен.
+    Импорт откладывается до первого векторного запроса.
+    """
+    try:
+        import numpy
+    except ImportError:  # numpy не обязателен, без него работают циклы по array
+        return None
+    return numpy
+
+
+class ColumnarStore(MutableSequence):
+    """
+    Колоночное хранилище транзакций.
+
+    Каждое поле хранится в отдельном типизированном массиве: сумма в копейках,
+    порядковый номер даты, код типа и код категории (коды общих таблиц TYPES
+    и CATEGORIES). Объекты Transaction создаются только при обращении к
+    строке по индексу.
+    """
+    def __init__(self, transactions=()):
+        self.kopecks = array("q")
+        self.ordinals = array("i")
+        self.type_codes = array("b")
+        self.category_codes = array("i")
+        self.extend(transactions)
+
+    def _row(self, i):
+        return Transaction.from_codes(
+            self.kopecks[i], self.category_codes[i], self.ordinals[i], self.type_codes[i])
+
+    @staticmethod
+    def _columns(t):
+        return t.kopecks, t.ordinal, t.type_code, t.category_code
+
+    def __len__(self):
+        return len(self.kopecks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("индекс транзакции вне диапазона")
+        return self._row(index)
+
+    def __setitem__(self, index, transaction):
+        kopecks, ordinal, type_code, category_code = self._columns(transaction)
+        self.kopecks[index] = kopecks
+        self.ordinals[index] = ordinal
+        self.type_codes[index] = type_code
+        self.category_codes[index] = category_code
+
+    def __delitem__(self, index):
+        del self.kopecks[index]
+        del self.ordinals[index]
+        del self.type_codes[index]
+        del self.category_codes[index]
+
+    def insert(self, index, transaction):
+        kopecks, ordinal, type_code, category_code = self._columns(transaction)
+        self.kopecks.insert(index, kopecks)
+        self.ordinals.insert(index, ordinal)
+        self.type_codes.insert(index, type_code)
+        self.category_codes.insert(index, category_code)
+
+    def append(self, transaction):
+        kopecks, ordinal, type_code, category_code = self._columns(transaction)
+        self.kopecks.append(kopecks)
+        self.ordinals.append(ordinal)
+        self.type_codes.append(type_code)
+        self.category_codes.append(category_code)
+
+    def clear(self):
+        self.__init__()
+
+    def rows(self, positions):
+        """Строит объекты Transaction для указанных позиций."""
+        return [self._row(i) for i in positions]
+
+    # Векторные запросы. Массивы копируются в numpy (np.array), а не
+    # оборачиваются через frombuffer: экспорт буфера запретил бы append.
+
+    def filter_positions(self, positions, low=None, high=None, min_kopecks=None, max_kopecks=None):
+        """
+        Оставляет из positions позиции транзакций с порядковым номером даты
+        в [low, high] и суммой в копейках в [min_kopecks, max_kopecks].
+        Граница None не ограничивает выборку; порядок позиций сохраняется.
+        """
+        np = _np()
+        if np is not None:
+            if isinstance(positions, range):
+                positions = np.arange(positions.start, positions.stop, positions.step, dtype=np.int64)
+            else:
+                positions = np.asarray(positions, dtype=np.int64)
+            mask = np.ones(len(positions), dtype=bool)
+            if low is not None or high is not None:
+                ordinals = np.array(self.ordinals, dtype=np.int32)[positions]
+                if low is not None:
+                    mask &= ordinals >= low
+                if high is not None:
+                    mask &= ordinals <= high
+            if min_kopecks is not None or max_kopecks is not None:
+                kopecks = np.array(self.kopecks, dtype=np.int64)[positions]
+                if min_kopecks is not None:
+                    mask &= kopecks >= min_kopecks
+                if max_kopecks is not None:
+                    mask &= kopecks <= max_kopecks
+            return positions[mask].tolist()
+        ordinals, kopecks = self.ordinals, self.kopecks
+        return [
+            p for p in positions
+            if (low is None or ordinals[p] >= low) and (high is None or ordinals[p] <= high)
+            and (min_kopecks is None or kopecks[p] >= min_kopecks)
+            and (max_kopecks is None or kopecks[p] <= max_kopecks)
+        ]
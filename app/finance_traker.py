@@ -1,7 +1,30 @@
 import csv
 import os
-import matplotlib.pyplot as plt
-from app.transaction import Transaction
+import threading
+from datetime import date
+from app import bulk_import
+from app.autosave import AUTOSAVE_DELAY, AUTOSAVE_MAX_PENDING, AutosaveWriter
+from app.instrumentation import instrumented, result_rows, tracker_rows
+from app.transaction import datetime_from_ordinal, parse_date, to_kopecks
+from app.columnar import ColumnarStore
+from app.aggregates import LedgerTotals
+from app.indexes import TransactionIndex
+from app.timeseries import LedgerTimeSeries
+from app.reports import ReportGrid, build_report
+from app.journal import Journal, check_no_pending, file_state
+from app.snapshot import iter_snapshot_batches, snapshot_path, write_snapshot
+from app.fingerprints import FingerprintIndex, count_fingerprints, transaction_fingerprint
+from app.manifest import read_manifest, remove_manifest, row_checksum, rows_checksum, write_manifest
+from app.streaming import (
+    RowFilter, aggregate_csv, compression_of, iter_transaction_batches, open_csv, row_to_transaction,
+    sync_file, transaction_to_row)
+
+JOURNAL_THRESHOLD = 1000  # записей журнала до сжатия в CSV
+
+
+def to_ordinal(value) -> int:
+    """Порядковый номер даты из строки ГГГГ-ММ-ДД или объекта date."""
+    return parse_date(value) if isinstance(value, str) else value.toordinal()
 
 
 def ensure_files_directory_exists():
@@ -12,66 +35,623 @@ def ensure_files_directory_exists():
 
 class FinanceTracker:
     """Класс для управления финансами."""
-    def __init__(self):
-        self.transactions = []
+    def __init__(self, columnar: bool = False):
+        """
+        :param columnar: Хранить транзакции в колоночном виде (ColumnarStore)
+            вместо списка объектов Transaction.
+        """
+        self.columnar = columnar
+        self.transactions = self._new_store()
+        self.totals = LedgerTotals()
+        self._index = TransactionIndex()
+        self._timeseries = None  # строится при первом запросе по датам
+        self._fingerprints = None  # отпечаток -> число транзакций; строится при первом импорте без повторов
+        self._journal = None
+        self._journal_synced = 0
+        self.journal_threshold = JOURNAL_THRESHOLD
+        self._export_marks = {}
+        self._partial_source = None  # файл, из которого загружена только часть транзакций
+        self._storage = None  # хранилище, которое само отвечает на запросы (attach_storage)
+        # Автосохранение: операции копятся в очереди и пишутся фоновым потоком
+        self._lock = threading.RLock()
+        self._autosave = None
+        self._autosave_path = None
+        self._pending_ops = []
+
+    def _new_store(self):
+        """Создает пустое хранилище транзакций выбранного вида."""
+        return ColumnarStore() if self.columnar else []
+
+    @instrumented("tracker.aggregate", rows=lambda result, self, transactions: len(transactions))
+    def _on_append(self, transactions) -> None:
+        """
+        Обновляет поддерживаемые структуры после добавления транзакций в конец;
+        через этот метод проходит любое добавление (в том числе из журнала).
+        """
+        self.totals.add_many(transactions)
+        self._index.extend(transactions)
+        if self._timeseries is not None:
+            self._timeseries.add_many(transactions)
+        if self._fingerprints is not None:
+            for t in transactions:
+                self._count_fingerprint(t, 1)
+
+    def _on_replace(self, position: int, old, new) -> None:
+        """Обновляет поддерживаемые структуры после замены транзакции."""
+        self.totals.remove_transaction(old)
+        self.totals.add_transaction(new)
+        self._index.replace(position, old, new)
+        if self._timeseries is not None:
+            self._timeseries.remove_transaction(old)
+            self._timeseries.add_transaction(new)
+        if self._fingerprints is not None:
+            self._count_fingerprint(old, -1)
+            self._count_fingerprint(new, 1)
+        self._forget_exports(position)
+
+    def _on_pop(self, position: int, old) -> None:
+        """Обновляет поддерживаемые структуры после удаления транзакции."""
+        self.totals.remove_transaction(old)
+        self._index.pop(position, old)
+        if self._timeseries is not None:
+            self._timeseries.remove_transaction(old)
+        if self._fingerprints is not None:
+            self._count_fingerprint(old, -1)
+        self._forget_exports(position)
+
+    def _count_fingerprint(self, transaction, delta: int) -> None:
+        key = transaction_fingerprint(transaction)
+        count = self._fingerprints.get(key, 0) + delta
+        if count > 0:
+            self._fingerprints[key] = count
+        else:
+            self._fingerprints.pop(key, None)
+
+    def _forget_exports(self, position: int) -> None:
+        """Сбрасывает отметки экспорта, которые покрывали измененную позицию."""
+        self._export_marks = {
+            path: mark for path, mark in self._export_marks.items()
+            if mark["rows"] <= position
+        }
+
+    def _reset(self) -> None:
+        """Очищает транзакции и все поддерживаемые структуры."""
+        self.transactions = self._new_store()
+        self.totals = LedgerTotals()
+        self._index = TransactionIndex()
+        self._timeseries = None
+        self._fingerprints = None
+        self._export_marks = {}
+        self._partial_source = None
+        self._storage = None
+
+    def _check_complete(self, filepath) -> None:
+        """Запрещает перезаписывать файл, из которого загружена только часть транзакций."""
+        if self._partial_source is not None and self._partial_source == os.path.abspath(filepath):
+            raise ValueError(
+                f"в трекере только часть транзакций файла {filepath} (загрузка с фильтром), "
+                "сохраните их в другой файл")
 
+    def _require_memory(self, operation: str) -> None:
+        """
+        Запрещает операцию над транзакциями в памяти в режиме хранилища
+        (attach_storage): список пуст, и ответ был бы неверным.
+        """
+        if self._storage is not None:
+            raise NotImplementedError(
+                f"{operation} недоступно в режиме хранилища, загрузите транзакции в трекер")
+
+    def _rows(self, positions):
+        """Возвращает транзакции по списку позиций (с нуля)."""
+        if self.columnar:
+            return self.transactions.rows(positions)
+        return [self.transactions[p] for p in positions]
+
+    def _append(self, transaction) -> None:
+        """Добавляет транзакцию в конец списка без сохранения."""
+        self.transactions.append(transaction)
+        self._on_append((transaction,))
+
+    @instrumented("tracker.add_transaction")
     def add_transaction(self, transaction):
         """Добавление новой транзакции в список."""
-        self.transactions.append(transaction)
+        if self._storage is not None:
+            self._storage.append([transaction])
+            return
+        with self._lock:
+            self._append(transaction)
+            self._queue_autosave(("add", None, transaction))
 
+    @instrumented("tracker.add_transactions", rows=lambda result, self, transactions: len(transactions))
+    def add_transactions(self, transactions) -> None:
+        """Добавление пачки транзакций в конец списка."""
+        if self._storage is not None:
+            self._storage.append(transactions)
+            return
+        with self._lock:
+            self.transactions.extend(transactions)
+            self._on_append(transactions)
+            self._queue_autosave(*(("add", None, t) for t in transactions))
+
+    @instrumented("tracker.edit_transaction")
     def edit_transaction(self, index: int, new_transaction, filename: str = "data.csv") -> None:
         """
         Редактирует транзакцию по индексу.
         :param index: Индекс транзакции (начинается с 1).
         :param new_transaction: Новая транзакция.
         """
+        self._require_memory("изменение транзакции")
         if 1 <= index <= len(self.transactions):
-            self.transactions[index - 1] = new_transaction
-            self.export_to_csv(filename)
+            filepath = os.path.join("files", filename)
+            if self._autosaves_to(filepath):
+                with self._lock:
+                    self._replace(index, new_transaction)
+                    self._queue_autosave(("edit", index, new_transaction))
+                return
+            journal = self._journal_for(filepath)
+            self._replace(index, new_transaction)
+            if journal is None:
+                self.export_to_csv(filename)
+            else:
+                journal.append("edit", index, transaction_to_row(new_transaction))
+                self._journal_committed()
 
+    @instrumented("tracker.delete_transaction")
     def delete_transaction(self, index: int, filename: str = "data.csv") -> None:
         """
         Удаляет транзакцию по индексу
         :param index: Индекс транзакции (начинается с 1)
         """
+        self._require_memory("удаление транзакции")
         if 1 <= index <= len(self.transactions):
-            self.transactions.pop(index - 1)
-            self.export_to_csv(filename)
+            filepath = os.path.join("files", filename)
+            if self._autosaves_to(filepath):
+                with self._lock:
+                    self._pop(index)
+                    self._queue_autosave(("delete", index, None))
+                return
+            journal = self._journal_for(filepath)
+            self._pop(index)
+            if journal is None:
+                self.export_to_csv(filename)
+            else:
+                journal.append("delete", index)
+                self._journal_committed()
+
+    def _replace(self, index: int, new_transaction) -> None:
+        """Заменяет транзакцию по индексу (начинается с 1) без сохранения."""
+        old = self.transactions[index - 1]
+        self.transactions[index - 1] = new_transaction
+        self._on_replace(index - 1, old, new_transaction)
+
+    def _pop(self, index: int) -> None:
+        """Удаляет транзакцию по индексу (начинается с 1) без сохранения."""
+        self._on_pop(index - 1, self.transactions.pop(index - 1))
+
+    def _journal_for(self, filepath):
+        """
+        Возвращает журнал, если трекер привязан к файлу filepath, иначе None.
+        Транзакции, добавленные после последней записи в журнал, сначала
+        дописываются в него, чтобы индексы последующих операций совпадали.
+        """
+        if self._journal is None or not self._journal.matches(filepath):
+            return None
+        for t in self.transactions[self._journal_synced:]:
+            self._journal.append("add", row=transaction_to_row(t))
+        self._journal_synced = len(self.transactions)
+        return self._journal
 
+    def _journal_committed(self) -> None:
+        """Отмечает запись в журнал и сжимает его при превышении порога."""
+        self._journal_synced = len(self.transactions)
+        if self._journal.entries >= self.journal_threshold:
+            self.compact_journal()
+
+    def _bind_journal(self, journal) -> None:
+        """Привязывает трекер к журналу CSV-файла, закрывая предыдущий."""
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = journal
+        self._journal_synced = len(self.transactions)
+
+    def _apply_journal_entry(self, entry) -> None:
+        """Применяет операцию из журнала к транзакциям в памяти."""
+        if entry["op"] == "add":
+            self._append(row_to_transaction(entry["row"]))
+        elif entry["op"] == "edit":
+            self._replace(entry["index"], row_to_transaction(entry["row"]))
+        elif entry["op"] == "delete":
+            self._pop(entry["index"])
+
+    def compact_journal(self) -> None:
+        """Сворачивает журнал в CSV-файл, к которому привязан трекер."""
+        self.flush()
+        if self._journal is not None:
+            self._rewrite_csv(self._journal.csv_path)
+
+    @instrumented("csv.write_full", rows=lambda result, self, filepath, transactions=None: len(
+        self.transactions if transactions is None else transactions))
+    def _rewrite_csv(self, filepath, transactions=None) -> None:
+        """
+        Атомарно перезаписывает CSV-файл всеми транзакциями (через временный
+        файл и os.replace). Журнал прежнего содержимого файла удаляется;
+        новый журнал начинается, только если трекер ведет журнал этого
+        файла (см. _binds_to): полная копия в другой файл привязку не меняет.
+        :param transactions: Копия списка транзакций, снятая под блокировкой
+            (для записи из потока автосохранения); по умолчанию - текущий список.
+        """
+        self._check_complete(filepath)
+        if transactions is None:
+            transactions = self.transactions
+        temp_path = filepath + ".tmp"
+        with open_csv(temp_path, "w", compression_of(filepath)) as file:
+            self._writer_header(file, "w")
+            checksum = self._write_transactions(file, transactions)
+        sync_file(temp_path)
+        os.replace(temp_path, filepath)
+        if os.path.exists(snapshot_path(filepath)):
+            write_snapshot(filepath, transactions)
+        with self._lock:
+            self._export_marks[os.path.abspath(filepath)] = write_manifest(
+                filepath, len(transactions), checksum)
+            stale = self._journal if self._journal is not None and self._journal.matches(filepath) else Journal(filepath, None)
+            stale.discard()
+            if self._binds_to(filepath):
+                self._bind_journal(Journal(filepath, file_state(filepath)))
+
+    def _binds_to(self, filepath) -> bool:
+        """
+        Проверяет, что после полной записи filepath трекер должен вести его
+        журнал: при автосохранении - только для файла автосохранения, иначе -
+        для уже привязанного файла или первого записанного, если привязки нет.
+        """
+        if self._autosave is not None:
+            return os.path.abspath(filepath) == os.path.abspath(self._autosave_path)
+        return self._journal is None or self._journal.matches(filepath)
+
+    def enable_autosave(self, filename: str = "data.csv", delay: float = AUTOSAVE_DELAY,
+                        max_pending: int = AUTOSAVE_MAX_PENDING) -> None:
+        """
+        Включает фоновое автосохранение. Добавление, редактирование и удаление
+        транзакций только ставят операции в очередь, а поток записи через
+        delay секунд (или после max_pending операций) дописывает их одной
+        пачкой в журнал файла filename, если трекер к нему привязан
+        (например, загружен из него), иначе атомарно перезаписывает filename.
+        Экспорт в другие файлы на то, куда пишет автосохранение, не влияет.
+        """
+        if self._autosave is not None:
+            return
+        with self._lock:
+            self._autosave_path = os.path.join("files", filename)
+            self._autosave = AutosaveWriter(self._autosave_write, delay, max_pending)
+            # Транзакции, добавленные раньше и еще не записанные в журнал
+            start = self._journal_synced if self._autosave_journal() is not None else 0
+            self._queue_autosave(*(("add", None, t) for t in self.transactions[start:]))
+
+    def _autosave_target(self):
+        """Файл, в который пишет автосохранение."""
+        return self._autosave_path
+
+    def _autosave_journal(self):
+        """Журнал файла автосохранения, если трекер к нему привязан, иначе None."""
+        if self._journal is not None and self._journal.matches(self._autosave_path):
+            return self._journal
+        return None
+
+    def _autosaves_to(self, filepath) -> bool:
+        """Проверяет, что изменения для filepath сохраняет поток автосохранения."""
+        if self._autosave is None:
+            return False
+        if os.path.abspath(self._autosave_target()) == os.path.abspath(filepath):
+            return True
+        self.flush()  # запись в другой файл идет после уже накопленных изменений
+        return False
+
+    def _queue_autosave(self, *operations) -> None:
+        """Ставит операции (op, индекс, транзакция) в очередь автосохранения."""
+        if self._autosave is not None and operations:
+            self._pending_ops.extend(operations)
+            self._autosave.mark_dirty(len(operations))
+
+    @instrumented("autosave.write", rows=lambda result, self: result or 0)
+    def _autosave_write(self) -> int:
+        """
+        Записывает накопленные операции (выполняется в потоке автосохранения).
+        Операции дописываются в журнал, а если журнала нет или он превысит
+        порог - файл перезаписывается копией списка транзакций.
+        Возвращает число записанных операций.
+        """
+        with self._lock:
+            operations, self._pending_ops = self._pending_ops, []
+            filepath = self._autosave_target()
+            journal = self._autosave_journal()
+            snapshot = None
+            if journal is None or journal.entries + len(operations) >= self.journal_threshold:
+                snapshot = list(self.transactions)
+            self._journal_synced = len(self.transactions)
+        try:
+            if snapshot is not None:
+                ensure_files_directory_exists()
+                self._rewrite_csv(filepath, snapshot)
+            else:
+                for op, index, transaction in operations:
+                    journal.append(op, index, transaction_to_row(transaction) if transaction else None)
+                journal.sync()
+        except Exception:
+            with self._lock:
+                # Вернуть операции в начало очереди для следующей попытки
+                self._pending_ops[:0] = operations
+            raise
+        return len(operations)
+
+    def flush(self) -> None:
+        """Дожидается записи всех изменений, накопленных автосохранением."""
+        if self._autosave is not None:
+            self._autosave.flush()
+
+    def close(self) -> None:
+        """Записывает накопленные изменения, сбрасывает на диск журнал и закрывает хранилище."""
+        if self._autosave is not None:
+            self._autosave.close()
+            self._autosave = None
+        if self._journal is not None:
+            self._journal.close()
+        if self._storage is not None:
+            self._storage.close()
+
+    @instrumented("tracker.get_balance")
     def get_balance(self) -> float:
         """Расчет текущего баланса (доходы минус расходы)."""
-        income = sum(t.amount for t in self.transactions if t.type == "income")
-        expense = sum(t.amount for t in self.transactions if t.type == "expense")
-        return income - expense
+        if self._storage is not None:
+            return self._storage.balance()
+        return self.totals.balance
+
+    def get_totals(self, end=None) -> tuple:
+        """
+        Возвращает (доходы, расходы) по всем транзакциям или только до даты
+        end (ГГГГ-ММ-ДД или date) включительно.
+        """
+        if self._storage is not None:
+            return self._storage.totals(end)
+        if end is None:
+            return self.totals.income, self.totals.expense
+        return self.get_totals_between(date.min, end)
+
+    def get_transaction_count(self) -> int:
+        """Число транзакций (в режиме хранилища - в самом хранилище)."""
+        if self._storage is not None:
+            return self._storage.count()
+        return len(self.transactions)
+
+    def get_monthly_totals(self, month: int, year: int) -> tuple:
+        """Возвращает (доходы, расходы) за указанный месяц и год."""
+        if self._storage is not None:
+            return self._storage.monthly_totals(month, year)
+        return (
+            self.totals.month_total("income", month, year),
+            self.totals.month_total("expense", month, year),
+        )
 
+    def verify_aggregates(self) -> bool:
+        """
+        Сверяет накопленные итоги с полным пересчетом по всем транзакциям.
+        Возвращает True, если расхождений нет.
+        """
+        expected = LedgerTotals()
+        for t in self.transactions:
+            expected.add_transaction(t)
+        for actual_totals, expected_totals in (
+            (self.totals.by_type, expected.by_type),
+            (self.totals.by_category, expected.by_category),
+            (self.totals.by_month, expected.by_month),
+        ):
+            if actual_totals.keys() != expected_totals.keys():
+                return False
+            for key, entry in expected_totals.items():
+                if actual_totals[key] != entry:
+                    return False
+        return self.totals.count == expected.count
+
+    @instrumented("tracker.get_transaction_by_category", rows=result_rows)
     def get_transaction_by_category(self, category):
         """Получение всех транзакций по указанной категории."""
-        return [t for t in self.transactions if t.category == category]
+        if self._storage is not None:
+            return self._storage.transactions_by_category(category)
+        return self._rows(self._index.positions_for_category(category))
 
+    @instrumented("tracker.get_monthly_report", rows=result_rows)
     def get_monthly_report(self, month: int, year: int):
         """Получение всех транзакций за указанный месяц и год."""
-        monthly_transactions = [
-            t for t in self.transactions
-            if t.date.month == month and t.date.year == year
+        if self._storage is not None:
+            return self._storage.monthly_report(month, year)
+        return self._rows(self._index.positions_for_month(month, year))
+
+    @instrumented("tracker.get_transactions_between", rows=result_rows)
+    def get_transactions_between(self, start, end):
+        """
+        Получение транзакций за период, упорядоченных по дате.
+        :param start: Начальная дата (ГГГГ-ММ-ДД или date), включительно.
+        :param end: Конечная дата (ГГГГ-ММ-ДД или date), включительно.
+        """
+        if self._storage is not None:
+            return self._storage.transactions_between(start, end)
+        return self._rows(self._index.positions_between(to_ordinal(start), to_ordinal(end)))
+
+    @property
+    def fingerprints(self) -> dict:
+        """
+        Число транзакций по отпечаткам (app.fingerprints); строится при первом
+        обращении и далее обновляется. Если трекер совпадает с файлом, к
+        которому привязан, счетчики берутся из индекса файла без хэширования.
+        """
+        self._require_memory("сверка с известными транзакциями")
+        if self._fingerprints is None:
+            with self._lock:
+                journal = self._journal
+                if (journal is not None and journal.entries == 0 and not self._pending_ops
+                        and self._journal_synced == len(self.transactions)
+                        and journal.base == file_state(journal.csv_path)):
+                    counts = dict(FingerprintIndex.for_csv(journal.csv_path).counts)
+                else:
+                    counts = count_fingerprints(self.transactions)
+                self._fingerprints = counts
+        return self._fingerprints
+
+    @property
+    def timeseries(self) -> LedgerTimeSeries:
+        """
+        Ряды сумм по дням; строятся при первом обращении и далее обновляются.
+        В режиме хранилища недоступны (отчеты по рядам хранилище не строит).
+        """
+        self._require_memory("отчет по рядам сумм по дням")
+        if self._timeseries is None:
+            timeseries = LedgerTimeSeries()
+            timeseries.add_many(self.transactions)
+            self._timeseries = timeseries
+        return self._timeseries
+
+    def get_balance_as_of(self, day) -> float:
+        """
+        Баланс по транзакциям до даты включительно.
+        :param day: Дата (ГГГГ-ММ-ДД или date).
+        """
+        if self._storage is not None:
+            return self._storage.balance(day)
+        return self.timeseries.balance_as_of(to_ordinal(day))
+
+    def get_totals_between(self, start, end) -> tuple:
+        """Возвращает (доходы, расходы) за период [start, end] (ГГГГ-ММ-ДД или date)."""
+        if self._storage is not None:
+            return self._storage.totals(end, start)
+        start, end = to_ordinal(start), to_ordinal(end)
+        return (
+            self.timeseries.total_between("income", start, end),
+            self.timeseries.total_between("expense", start, end),
+        )
+
+    def get_category_total_between(self, category, start, end, transaction_type: str = "expense") -> float:
+        """Сумма транзакций категории указанного типа за период [start, end]."""
+        return self.timeseries.total_between(
+            transaction_type, to_ordinal(start), to_ordinal(end), category)
+
+    def get_report(self, start, end) -> ReportGrid:
+        """
+        Отчет за период [start, end] (ГГГГ-ММ-ДД или date): суммы по сетке
+        месяц x категория x тип, посчитанные по рядам сумм по дням.
+        """
+        return build_report(self.timeseries, to_ordinal(start), to_ordinal(end))
+
+    def get_running_balance(self, start, end):
+        """Список (дата, баланс на конец дня) для каждого дня периода [start, end]."""
+        return [
+            (datetime_from_ordinal(ordinal), balance)
+            for ordinal, balance in self.timeseries.running_balance(to_ordinal(start), to_ordinal(end))
         ]
-        return monthly_transactions
 
-    def export_to_csv(self, filename, mode="w"):
+    @instrumented("tracker.find_positions", rows=result_rows)
+    def find_positions(self, start=None, end=None, category=None, min_amount=None, max_amount=None):
+        """
+        Позиции (с нуля) транзакций, подходящих под фильтр, в порядке списка.
+        Кандидаты берутся из индекса категорий или дат, суммы проверяются
+        только у кандидатов (в колоночном хранилище - векторно, см.
+        ColumnarStore.filter_positions). Пропущенные условия не ограничивают выборку.
+        :param start: Начальная дата (ГГГГ-ММ-ДД), включительно.
+        :param end: Конечная дата (ГГГГ-ММ-ДД), включительно.
+        """
+        self._require_memory("поиск по позициям")
+        low = parse_date(start) if start is not None else None
+        high = parse_date(end) if end is not None else None
+        if category is not None:
+            positions = self._index.positions_for_category(category)
+        elif low is not None or high is not None:
+            positions = sorted(self._index.positions_between(
+                low if low is not None else date.min.toordinal(),
+                high if high is not None else date.max.toordinal()))
+        else:
+            positions = range(len(self.transactions))
+        if low is None and high is None and min_amount is None and max_amount is None:
+            return list(positions)
+        min_kopecks = to_kopecks(min_amount) if min_amount is not None else None
+        max_kopecks = to_kopecks(max_amount) if max_amount is not None else None
+        if self.columnar:
+            # Даты и суммы кандидатов сравниваются по колонкам, без объектов Transaction
+            return self.transactions.filter_positions(positions, low, high, min_kopecks, max_kopecks)
+        transactions = self.transactions
+        result = []
+        for position in positions:
+            t = transactions[position]
+            if (low is not None and t.ordinal < low) or (high is not None and t.ordinal > high):
+                continue
+            if (min_kopecks is not None and t.kopecks < min_kopecks) \
+                    or (max_kopecks is not None and t.kopecks > max_kopecks):
+                continue
+            result.append(position)
+        return result
+
+    @instrumented("tracker.export_to_csv")
+    def export_to_csv(self, filename, mode="w", strict: bool = False):
         """
         Экспортирует транзакции в CSV-файл.
-        :param filename: Имя файла.
+        :param filename: Имя файла; файлы .csv.gz, .csv.bz2 и .csv.xz сжимаются при записи.
         :param mode: Режим записи ("w" для перезаписи, "a" для добавления).
+        :param strict: Передавать ошибки вызывающему коду вместо печати.
         """
+        self._require_memory("экспорт в CSV")
         ensure_files_directory_exists()
         filepath = os.path.join("files", filename)  # Полный путь к файлу
+        self.flush()
         try:
-            with open(filepath, mode=mode, newline="", encoding="utf-8") as file:
-                self._writer_header(file, mode)
-                new_transactions = self._get_new_transaction(filepath, mode)
-                self._write_transactions(file, new_transactions)
+            if mode == "w" or (self._journal is not None and self._journal.matches(filepath)):
+                # Файл с журналом всегда пишется целиком, иначе журнал устареет
+                self._rewrite_csv(filepath)
+                return
+            self._append_csv(filepath)
         except Exception as e:
+            if strict:
+                raise
             print(f"Ошибка при экспорте данных: {e}")
     
+    @instrumented("csv.append")
+    def _append_csv(self, filepath) -> None:
+        """
+        Дописывает в CSV-файл транзакции, которых в нем еще нет.
+        Если известно, что файл совпадает с первыми N транзакциями трекера
+        (по отметке этой сессии или по манифесту рядом с файлом), дописывается
+        только хвост без чтения файла. Иначе файл сверяется построчно.
+        Файл с несвернутым журналом другого трекера не дописывается.
+        """
+        self._check_complete(filepath)
+        check_no_pending(filepath)
+        key = os.path.abspath(filepath)
+        state = file_state(filepath)
+        if state is None or state[0] == 0:
+            mark = {"rows": 0, "checksum": 0}
+        else:
+            mark = self._export_marks.get(key)
+            if mark is None or mark["state"] != state:
+                mark = read_manifest(filepath)
+                if mark is not None and (
+                    mark["rows"] > len(self.transactions)
+                    or rows_checksum(self.transactions[:mark["rows"]]) != mark["checksum"]
+                ):
+                    mark = None
+
+        with open_csv(filepath, "a") as file:
+            if state is None or state[0] == 0:
+                self._writer_header(file, "w")
+            if mark is None:
+                self._write_transactions(file, self._get_new_transaction(filepath, "a"))
+            else:
+                checksum = self._write_transactions(
+                    file, self.transactions[mark["rows"]:], mark["checksum"])
+
+        if mark is None:
+            # Файл больше не совпадает с началом списка транзакций
+            remove_manifest(filepath)
+            self._export_marks.pop(key, None)
+        else:
+            self._export_marks[key] = write_manifest(filepath, len(self.transactions), checksum)
+
     def _writer_header(self, file, mode):
         """
         Записывает заголовок CSV-файла, если файл открыт в режиме перезаписи
@@ -85,74 +665,226 @@ class FinanceTracker:
         Возвращает список новых транзакций, которые еще не записаны в файл.
         """
         if mode == "a":
-            existing_transactions = self._load_existing_transactions(filename)
-
-            # Используем множества для поиска новых транзакций
-            existing_set = set(existing_transactions)
-            current_set = set(self.transactions)
-            new_transaction = list(current_set - existing_set)
+            # Считаем вхождения, чтобы сохранить порядок и настоящие повторы
+            existing = self._existing_fingerprints(filename)
+            new_transaction = []
+            for t in self.transactions:
+                key = transaction_fingerprint(t)
+                if existing.get(key, 0) > 0:
+                    existing[key] -= 1
+                else:
+                    new_transaction.append(t)
             return new_transaction
         return self.transactions
 
-    def _write_transactions(self, file, transactions):
+    def _write_transactions(self, file, transactions, checksum: int = 0) -> int:
         """
         Записывает транзакции в CSV-файл.
+        Возвращает контрольную сумму записанного, продолженную от checksum.
         """
         writer = csv.writer(file)
         for t in transactions:
-            writer.writerow([t.date.strftime("%Y-%m-%d"), t.type, t.category, t.amount])
+            row = transaction_to_row(t)
+            writer.writerow(row)
+            checksum = row_checksum(row, checksum)
+        return checksum
 
-    def _load_existing_transactions(self, filename):
+    def _existing_fingerprints(self, filename) -> dict:
         """
-        Загружает существующие транзакции из CSV-файла.
+        Возвращает число строк CSV-файла по отпечаткам из его индекса
+        (app.fingerprints): после дозаписи разбираются только новые строки.
         """
-        existing_transactions = []
         try:
-            with open(filename, mode="r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    amount = float(row["Amount"])
-                    category = row["Category"]
-                    date = row["Date"]
-                    transaction_type = row["Type"]
-                    transaction = Transaction(amount, category, date, transaction_type)
-                    existing_transactions.append(transaction)
+            return dict(FingerprintIndex.for_csv(filename).counts)
         except Exception as e:
             print(f"Ошибка при загрузке существующих транзакций: {e}")
-        return existing_transactions
+            return {}
 
-    def load_from_csv(self, filename):
-        """Загружает тразакции из csv."""
+    @instrumented("tracker.load_from_csv", rows=tracker_rows)
+    def load_from_csv(self, filename, use_snapshot: bool = True, start=None, end=None,
+                      categories=None, transaction_type=None, strict: bool = False):
+        """
+        Загружает тразакции из csv (в том числе сжатого .csv.gz, .csv.bz2, .csv.xz).
+        :param use_snapshot: Читать свежий бинарный снимок рядом с файлом
+            вместо разбора CSV, а после разбора CSV - записать снимок
+            (кроме сжатых файлов: несжатый снимок свел бы экономию места на нет).
+        :param start, end, categories, transaction_type: Загрузить только
+            транзакции за период (ГГГГ-ММ-ДД или date), указанных категорий
+            и типа. Строки отбрасываются до разбора суммы и даты (см.
+            streaming.RowFilter). Трекер с такой частью файла не привязывается
+            к журналу и не перезаписывает исходный файл.
+        :param strict: Передавать ошибки чтения и разбора вызывающему коду
+            (пакетный режим) вместо печати и продолжения с тем, что успело
+            загрузиться. Отсутствующий файл и здесь означает пустой список.
+        """
         ensure_files_directory_exists()  # Убедимся, что папка 'files' существует
         filepath = os.path.join("files", filename)
+        self.flush()  # изменения прошлого файла записываются до загрузки нового
         try:
-            self.transactions = []
-            with open(filepath, "r", encoding="utf-8") as my_file:
-                reader = csv.DictReader(my_file)
-                for row in reader:
-                    amount = float(row["Amount"])
-                    category = row["Category"]
-                    date = row["Date"]
-                    transaction_type = row["Type"]
-                    transaction = Transaction(amount, category, date, transaction_type)
-                    self.add_transaction(transaction)
-            print(f"Данные успешно загружены из {filepath}")
+            self._reset()
+            self._bind_journal(None)
+            row_filter = RowFilter(start, end, categories, transaction_type)
+            if row_filter:
+                self._load_filtered(filepath, row_filter)
+                print(f"Данные успешно загружены из {filepath} (с фильтром)")
+            else:
+                self._load_full(filepath, use_snapshot)
+                print(f"Данные успешно загружены из {filepath}")
         except FileNotFoundError:
             print(f"Файл {filepath} не найден. Начните с пустого списка транзакций.")
         except Exception as e:
+            if strict:
+                raise
             print(f"Ошибка при загрузке данных: {e}")
 
+    def _load_full(self, filepath, use_snapshot: bool) -> None:
+        """Загружает все транзакции файла (из снимка или CSV) и применяет журнал."""
+        batches = iter_snapshot_batches(filepath) if use_snapshot else None
+        from_snapshot = batches is not None
+        if not from_snapshot:
+            batches = iter_transaction_batches(filepath, journal=False)
+        for batch in batches:
+            self.transactions.extend(batch)
+            self._on_append(batch)
+        if use_snapshot and not from_snapshot and not compression_of(filepath):
+            write_snapshot(filepath, self.transactions)
+        journal, operations = Journal.open_for(filepath)
+        for entry in operations:
+            self._apply_journal_entry(entry)
+        self._bind_journal(journal)
+
+    def _load_filtered(self, filepath, row_filter: RowFilter) -> None:
+        """Загружает подходящие под фильтр транзакции (с учетом операций журнала файла)."""
+        for batch in iter_transaction_batches(filepath, row_filter=row_filter):
+            self.transactions.extend(batch)
+            self._on_append(batch)
+        self._partial_source = os.path.abspath(filepath)
+
+    @instrumented("tracker.import_csv_files", rows=lambda result, *args: sum(item.rows for item in result or ()))
+    def import_csv_files(self, filenames, max_workers: int = None, skip_known: bool = False):
+        """
+        Параллельно загружает несколько CSV-файлов из папки files и добавляет
+        их транзакции в конец списка в порядке файлов.
+        Возвращает статистику по файлам (строки, время разбора, число частей,
+        пропущенные повторы).
+        :param skip_known: Не добавлять уже известные транзакции (см. _skip_known).
+        """
+        paths = [os.path.join("files", filename) for filename in filenames]
+        self.flush()  # файл трекера читается вместе с уже накопленными изменениями
+        transactions, stats = bulk_import.import_csv_files(paths, max_workers)
+        if skip_known:
+            transactions, stats = self._skip_known(transactions, stats)
+        self.add_transactions(transactions)
+        return stats
+
+    def _skip_known(self, transactions, stats):
+        """
+        Отбрасывает импортированные транзакции, которые уже есть в трекере.
+        Ключ, встречающийся в файле m раз при k известных, добавляется
+        m - k раз: настоящие повторы внутри выписки сохраняются, а строки
+        пересекающихся выписок не дублируются. Проверка строки - O(1).
+        """
+        known = self.fingerprints
+        added = {}
+        kept, result = [], []
+        position = 0
+        for item in stats:
+            seen = {}
+            skipped = 0
+            for t in transactions[position:position + item.rows]:
+                key = transaction_fingerprint(t)
+                seen[key] = seen.get(key, 0) + 1
+                if seen[key] > known.get(key, 0) + added.get(key, 0):
+                    kept.append(t)
+                    added[key] = added.get(key, 0) + 1
+                else:
+                    skipped += 1
+            position += item.rows
+            result.append(item._replace(skipped=skipped))
+        return kept, result
+
+    def load_from_storage(self, storage) -> None:
+        """Загружает все транзакции из хранилища (см. app.storage)."""
+        self.flush()
+        self._reset()
+        self._bind_journal(None)
+        for batch in storage.iter_batches():
+            self.transactions.extend(batch)
+            self._on_append(batch)
+
+    def attach_storage(self, storage) -> None:
+        """
+        Переводит трекер на запросы к хранилищу (см. app.storage) без загрузки
+        транзакций в память: баланс, итоги, отчеты за месяц и по категориям
+        считает само хранилище (в SQLite - запросами по индексам), а новые
+        транзакции дописываются в него. Список transactions остается пустым,
+        поэтому изменение и удаление по номеру, поиск позиций, экспорт,
+        сохранение в другое хранилище, импорт без повторов и отчеты по рядам сумм по дням (get_report,
+        get_running_balance) в этом режиме вызывают NotImplementedError.
+        Хранилище закрывается в close(); загрузка из CSV или хранилища
+        возвращает трекер в обычный режим.
+        """
+        self.flush()
+        self._reset()
+        self._bind_journal(None)
+        self._storage = storage
+
+    def save_to_storage(self, storage) -> None:
+        """Заменяет содержимое хранилища транзакциями трекера."""
+        self._require_memory("сохранение в другое хранилище")
+        storage.save(self.transactions)
+
+    def get_category_totals(self, transaction_type: str = "expense") -> dict:
+        """Суммы транзакций указанного типа по категориям."""
+        if self._storage is not None:
+            return self._storage.category_totals(transaction_type)
+        return self.totals.category_totals(transaction_type)
+
+    def get_expenses_by_category(self) -> dict:
+        """Суммы расходов по категориям."""
+        return self.get_category_totals("expense")
+
+    def get_monthly_series(self):
+        """Список (год, месяц, доходы, расходы) по всем месяцам в порядке дат."""
+        if self._storage is not None:
+            return self._storage.monthly_series()
+        return self.totals.month_series()
+
+    @instrumented("tracker.render_charts")
+    def render_charts(self, out_dir=None, formats=("png",)):
+        """
+        Сохраняет графики (расходы по категориям, доходы и расходы по месяцам,
+        баланс) в файлы без оконного интерфейса. Данные берутся из накопленных
+        итогов; при неизменных данных используются ранее сохраненные файлы.
+        :return: (пути к файлам, True если файлы взяты из кэша).
+        """
+        from app import visualization
+
+        return visualization.render_charts(
+            self.get_expenses_by_category(),
+            self.get_monthly_series(),
+            out_dir or visualization.CHARTS_DIR,
+            formats,
+        )
+
+    @instrumented("tracker.summarize_csv", rows=lambda result, *args: result.count if result else 0)
+    def summarize_csv(self, filename) -> LedgerTotals:
+        """
+        Считает итоги по CSV-файлу за один проход, не загружая транзакции
+        в трекер. Подходит для файлов, которые не помещаются в память.
+        """
+        self.flush()
+        return aggregate_csv(os.path.join("files", filename))
+
+    @instrumented("tracker.plot_spending_by_category")
     def plot_spending_by_category(self):
         """Визуализация расходов по категориям в виде круговой диаграммы."""
-        categories = {}
-        for t in self.transactions:
-            if t.type == "expense":
-                categories[t.category] = categories.get(t.category, 0) + t.amount
+        categories = self.get_expenses_by_category()
         if not categories:
             print("Нет данных для построения графика расходов")
             return
 
-        plt.figure(figsize=(8, 8))
-        plt.pie(categories.values(), labels=categories.keys(), autopct="%1.1f%%", startangle=140)
-        plt.title("Распределение расходов по категориям")
-        plt.show()
+        # matplotlib импортируется только здесь: он долго загружается
+        from app import visualization
+
+        visualization.plot_spending_pie(categories)
@@ -0,0 +1,157 @@
+import csv
+import io
+import os
+import struct
+import zlib
+from array import array
+from hashlib import blake2b
+from app.journal import file_state
+from app.streaming import column_positions, compression_of, iter_rows
+from app.transaction import parse_date, to_kopecks
+
+FINGERPRINTS_SUFFIX = ".fingerprints"
+MAGIC = b"FPIX"
+VERSION = 1
+# Заголовок: магия, версия, состояние CSV (размер, mtime_ns, inode),
+# проиндексировано байт, crc32 хвоста проиндексированной части, число ключей
+HEADER = struct.Struct("<4sHQqQQIQ")
+TAIL_BYTES = 4096  # байт перед концом проиндексированной части для проверки дозаписи
+
+
+def fingerprint(kopecks: int, category: str, ordinal: int, transaction_type: str) -> int:
+    """
+    64-битный отпечаток нормализованного ключа транзакции: дата, тип,
+    категория без учета регистра и лишних пробелов, сумма в копейках.
+    Не зависит от процесса (в отличие от hash), поэтому хранится на диске.
+    """
+    category = " ".join(category.split()).casefold()
+    key = f"{ordinal}\x1f{transaction_type.strip().lower()}\x1f{category}\x1f{kopecks}"
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def transaction_fingerprint(transaction) -> int:
+    return fingerprint(transaction.kopecks, transaction.category, transaction.ordinal, transaction.type)
+
+
+def count_fingerprints(transactions) -> dict:
+    """Число транзакций по отпечаткам."""
+    counts = {}
+    for t in transactions:
+        key = transaction_fingerprint(t)
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def _row_fingerprint(date, transaction_type, category, amount) -> int:
+    return fingerprint(to_kopecks(amount), category, parse_date(date), transaction_type)
+
+
+def _tail_crc(file, covered: int) -> int:
+    start = max(0, covered - TAIL_BYTES)
+    file.seek(start)
+    return zlib.crc32(file.read(covered - start))
+
+
+class FingerprintIndex:
+    """
+    Хэш-множество с числом вхождений отпечатков строк CSV-файла, хранимое
+    рядом с ним (*.fingerprints): массивы ключей (8 байт) и счетчиков
+    (4 байта), без строк транзакций. Проверка строки - O(1) в словаре.
+
+    Индекс привязан к состоянию файла. Если файл только дописан (тот же inode,
+    больше размер, не изменился хвост проиндексированной части), разбираются
+    лишь новые строки; иначе индекс строится заново одним проходом.
+    """
+    def __init__(self, csv_path, counts=None, state=None, covered: int = 0, tail_crc: int = 0):
+        self.csv_path = str(csv_path)
+        self.counts = counts if counts is not None else {}
+        self.state = state
+        self.covered = covered
+        self.tail_crc = tail_crc
+
+    @property
+    def path(self) -> str:
+        return self.csv_path + FINGERPRINTS_SUFFIX
+
+    @classmethod
+    def for_csv(cls, csv_path):
+        """Возвращает актуальный индекс файла, обновляя и сохраняя его при необходимости."""
+        state = file_state(csv_path)
+        if state is None:
+            return cls(csv_path)
+        index = cls.read(csv_path)
+        if index is not None and index.state == state:
+            return index
+        if index is not None and index._extendable(state):
+            index._extend(state)
+        else:
+            index = cls.build(csv_path)
+        index.save()
+        return index
+
+    @classmethod
+    def read(cls, csv_path):
+        """Читает индекс с диска; None, если его нет или он поврежден."""
+        try:
+            with open(str(csv_path) + FINGERPRINTS_SUFFIX, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, version, size, mtime_ns, inode, covered, tail_crc, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or len(data) != HEADER.size + 12 * count:
+            return None
+        keys, values = array("Q"), array("I")
+        keys.frombytes(data[HEADER.size:HEADER.size + 8 * count])
+        values.frombytes(data[HEADER.size + 8 * count:])
+        return cls(csv_path, dict(zip(keys, values)), [size, mtime_ns, inode], covered, tail_crc)
+
+    @classmethod
+    def build(cls, csv_path):
+        """Строит индекс по всему файлу."""
+        state = file_state(csv_path)
+        counts = {}
+        for row in iter_rows(csv_path, journal=False):  # индекс описывает сам файл, см. _extend
+            key = _row_fingerprint(*row)
+            counts[key] = counts.get(key, 0) + 1
+        tail_crc = 0
+        if not compression_of(csv_path):
+            with open(csv_path, "rb") as file:
+                tail_crc = _tail_crc(file, state[0])
+        return cls(csv_path, counts, state, state[0], tail_crc)
+
+    def _extendable(self, state) -> bool:
+        """Проверяет, что с момента индексации файл был только дописан."""
+        if compression_of(self.csv_path) or self.state is None or self.covered == 0:
+            return False
+        if state[2] != self.state[2] or state[0] <= self.covered:
+            return False
+        with open(self.csv_path, "rb") as file:
+            return _tail_crc(file, self.covered) == self.tail_crc
+
+    def _extend(self, state) -> None:
+        """Добавляет в индекс строки, дописанные после проиндексированной части (до размера из state)."""
+        with open(self.csv_path, "rb") as file:
+            header = next(csv.reader([file.readline().decode("utf-8-sig")]))
+            date_col, type_col, category_col, amount_col = column_positions(header)
+            file.seek(self.covered)
+            tail = file.read(state[0] - self.covered)
+            self.covered = state[0]
+            self.tail_crc = _tail_crc(file, self.covered)
+        for row in csv.reader(io.StringIO(tail.decode("utf-8"), newline="")):
+            if row:
+                key = _row_fingerprint(row[date_col], row[type_col], row[category_col], row[amount_col])
+                self.counts[key] = self.counts.get(key, 0) + 1
+        self.state = state
+
+    def save(self) -> None:
+        """Атомарно записывает индекс рядом с CSV-файлом."""
+        size, mtime_ns, inode = self.state
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(HEADER.pack(
+                MAGIC, VERSION, size, mtime_ns, inode, self.covered, self.tail_crc, len(self.counts)))
+            file.write(array("Q", self.counts.keys()).tobytes())
+            file.write(array("I", self.counts.values()).tobytes())
+        os.replace(temp_path, self.path)
@@ -0,0 +1,141 @@
+from array import array
+from bisect import bisect_left, insort
+from app.labels import CATEGORIES
+from app.transaction import datetime_from_ordinal
+
+# Ключ индекса дат: порядковый номер даты в старших битах, id строки в младших.
+_ID_BITS = 40
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+def _month_key(ordinal):
+    day = datetime_from_ordinal(ordinal)
+    return day.year, day.month
+
+
+class TransactionIndex:
+    """
+    Вторичные индексы по транзакциям трекера.
+
+    Каждой строке присваивается постоянный id, который растет в порядке
+    добавления, поэтому список id по позициям всегда отсортирован и позиция
+    строки находится бинарным поиском. Индексы хранят только id:
+    - по категории (код категории -> отсортированные id);
+    - по месяцу (хэш (год, месяц) -> отсортированные id);
+    - по дате (отсортированные ключи дата+id для запросов по диапазону).
+    """
+    def __init__(self):
+        self._ids = array("q")
+        self._next_id = 0
+        self._by_category = {}
+        self._by_month = {}
+        self._date_keys = array("q")
+        self._dates_sorted = True
+
+    def _add(self, row_id, transaction):
+        bucket = self._by_category.get(transaction.category_code)
+        if bucket is None:
+            bucket = self._by_category[transaction.category_code] = array("q")
+        insort(bucket, row_id)
+        month = _month_key(transaction.ordinal)
+        bucket = self._by_month.get(month)
+        if bucket is None:
+            bucket = self._by_month[month] = array("q")
+        insort(bucket, row_id)
+        key = (transaction.ordinal << _ID_BITS) | row_id
+        if self._dates_sorted:
+            insort(self._date_keys, key)
+        else:
+            self._date_keys.append(key)
+
+    def _discard(self, row_id, transaction):
+        for buckets, key in (
+            (self._by_category, transaction.category_code),
+            (self._by_month, _month_key(transaction.ordinal)),
+        ):
+            bucket = buckets[key]
+            del bucket[bisect_left(bucket, row_id)]
+            if not bucket:
+                del buckets[key]
+        self._sort_dates()
+        key = (transaction.ordinal << _ID_BITS) | row_id
+        del self._date_keys[bisect_left(self._date_keys, key)]
+
+    def _sort_dates(self):
+        if not self._dates_sorted:
+            self._date_keys = array("q", sorted(self._date_keys))
+            self._dates_sorted = True
+
+    def append(self, transaction):
+        """Индексирует транзакцию, добавленную в конец списка."""
+        row_id = self._next_id
+        self._next_id += 1
+        self._ids.append(row_id)
+        self._add(row_id, transaction)
+
+    def extend(self, transactions):
+        """
+        Индексирует пачку транзакций, добавленных в конец списка.
+        Новые id больше всех существующих, поэтому в корзины категорий и
+        месяцев они просто дописываются, а индекс дат досортировывается
+        при первом запросе.
+        """
+        ids, keys = self._ids, self._date_keys
+        by_category, by_month = self._by_category, self._by_month
+        months = {}
+        row_id = self._next_id
+        for t in transactions:
+            ids.append(row_id)
+            bucket = by_category.get(t.category_code)
+            if bucket is None:
+                bucket = by_category[t.category_code] = array("q")
+            bucket.append(row_id)
+            month = months.get(t.ordinal)
+            if month is None:
+                month = months[t.ordinal] = _month_key(t.ordinal)
+            bucket = by_month.get(month)
+            if bucket is None:
+                bucket = by_month[month] = array("q")
+            bucket.append(row_id)
+            keys.append((t.ordinal << _ID_BITS) | row_id)
+            row_id += 1
+        if row_id != self._next_id:
+            self._dates_sorted = False
+            self._next_id = row_id
+
+    def replace(self, position, old, new):
+        """Переиндексирует строку в позиции position (с нуля) после изменения."""
+        row_id = self._ids[position]
+        self._discard(row_id, old)
+        self._add(row_id, new)
+
+    def pop(self, position, old):
+        """Удаляет из индексов строку в позиции position (с нуля)."""
+        row_id = self._ids.pop(position)
+        self._discard(row_id, old)
+
+    def _positions(self, row_ids):
+        ids = self._ids
+        return [bisect_left(ids, row_id) for row_id in row_ids]
+
+    def positions_for_category(self, category):
+        """Позиции транзакций с указанной категорией в порядке списка."""
+        return self._positions(self._by_category.get(CATEGORIES.get(category), ()))
+
+    def positions_for_month(self, month: int, year: int):
+        """Позиции транзакций за месяц в порядке списка."""
+        return self._positions(self._by_month.get((year, month), ()))
+
+    def positions_between(self, start: int, end: int):
+        """
+        Позиции транзакций с порядковым номером даты в [start, end],
+        упорядоченные по дате.
+        """
+        self._sort_dates()
+        lo = bisect_left(self._date_keys, start << _ID_BITS)
+        hi = bisect_left(self._date_keys, (end + 1) << _ID_BITS)
+        return self._positions(key & _ID_MASK for key in self._date_keys[lo:hi])
+
+    def categories(self):
+        """Список категорий, по которым есть транзакции."""
+        return [CATEGORIES.names[code] for code in self._by_category]
@@ -0,0 +1,123 @@
+import functools
+import os
+import sys
+import time
+from bisect import bisect_right
+
+STATS_ENV = "FINANCE_TRACKER_STATS"
+PROFILE_ENV = "FINANCE_TRACKER_PROFILE"
+# Верхние границы корзин гистограммы времени, секунды
+BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0)
+BUCKET_LABELS = ("<1мс", "<10мс", "<100мс", "<1с", "<10с", "≥10с")
+
+
+class OperationStats:
+    """Статистика одной операции: вызовы, время, гистограмма, строки."""
+    __slots__ = ("calls", "total", "max", "rows", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.histogram = [0] * (len(BUCKETS) + 1)
+
+    def record(self, seconds: float, rows: int) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.rows += rows
+        self.histogram[bisect_right(BUCKETS, seconds)] += 1
+
+
+class StatsRegistry:
+    """Реестр статистики по именам операций."""
+    def __init__(self):
+        self.operations = {}
+
+    def record(self, name: str, seconds: float, rows: int = 0) -> None:
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = self.operations[name] = OperationStats()
+        stats.record(seconds, rows)
+
+    def reset(self) -> None:
+        self.operations.clear()
+
+    def format(self) -> str:
+        """Таблица статистики, отсортированная по суммарному времени."""
+        lines = [
+            f"{'Операция':<32} {'Вызовов':>7} {'Всего, с':>9} {'Макс, с':>8} {'Строк':>10}  Гистограмма",
+            "-" * 100,
+        ]
+        for name, stats in sorted(self.operations.items(), key=lambda item: -item[1].total):
+            histogram = " ".join(
+                f"{label}:{count}" for label, count in zip(BUCKET_LABELS, stats.histogram) if count)
+            lines.append(
+                f"{name:<32} {stats.calls:>7} {stats.total:>9.4f} {stats.max:>8.4f} {stats.rows:>10}  {histogram}")
+        return "\n".join(lines)
+
+
+STATS = StatsRegistry()
+
+
+def instrumented(name: str, rows=None):
+    """
+    Декоратор: учитывает вызовы и время работы функции в STATS.
+    :param rows: Функция (результат, *аргументы) -> число обработанных строк.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            began = time.perf_counter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                processed = rows(result, *args) if rows is not None else 0
+                STATS.record(name, time.perf_counter() - began, processed)
+        return wrapper
+    return decorator
+
+
+def tracker_rows(result, tracker, *args):
+    """Число транзакций в трекере после операции."""
+    return len(tracker.transactions)
+
+
+def result_rows(result, *args):
+    """Число элементов в результате операции."""
+    return len(result) if result is not None else 0
+
+
+def start_session():
+    """
+    Включает cProfile на время сессии, если задана переменная
+    FINANCE_TRACKER_PROFILE. Возвращает профилировщик или None.
+    """
+    if not os.environ.get(PROFILE_ENV):
+        return None
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def finish_session(profiler=None) -> None:
+    """
+    Завершает сессию: сохраняет профиль в файл pstats (путь из
+    FINANCE_TRACKER_PROFILE, при значении 1 - в папку files) и печатает
+    статистику, если задана переменная FINANCE_TRACKER_STATS.
+    """
+    if profiler is not None:
+        profiler.disable()
+        path = os.environ.get(PROFILE_ENV)
+        if path == "1":
+            os.makedirs("files", exist_ok=True)
+            path = os.path.join("files", f"profile-{time.strftime('%Y%m%d-%H%M%S')}.pstats")
+        profiler.dump_stats(path)
+        print(f"\nПрофиль сессии сохранен в {path}", file=sys.stderr)
+    if os.environ.get(STATS_ENV):
+        print("\n" + STATS.format(), file=sys.stderr)
@@ -0,0 +1,150 @@
+import json
+import os
+
+JOURNAL_SUFFIX = ".journal"
+SYNC_EVERY = 32
+
+
+def file_state(path):
+    """Возвращает [размер, mtime_ns, inode] файла или None, если его нет."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def _read_record(line: bytes):
+    """Разбирает строку журнала; None, если запись недописана (нет перевода строки) или повреждена."""
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+class Journal:
+    """
+    Журнал изменений (write-ahead log) рядом с CSV-файлом.
+
+    Каждая операция add/edit/delete дописывается отдельной JSON-строкой.
+    Первая строка журнала хранит состояние CSV-файла (размер, mtime, inode),
+    поверх которого записаны операции: если CSV с тех пор перезаписан,
+    журнал считается устаревшим и не применяется. fsync выполняется
+    пачками раз в sync_every записей, а также при sync() и close().
+    """
+    def __init__(self, csv_path, base, entries: int = 0, sync_every: int = SYNC_EVERY, valid_bytes: int = None):
+        """
+        :param valid_bytes: Длина целой части файла журнала (заголовок и
+            entries записей); хвост после нее обрезается перед дозаписью.
+        """
+        self.csv_path = csv_path
+        self.path = csv_path + JOURNAL_SUFFIX
+        self.base = base
+        self.entries = entries
+        self.sync_every = sync_every
+        self.valid_bytes = valid_bytes
+        self._file = None
+        self._unsynced = 0
+
+    @classmethod
+    def open_for(cls, csv_path):
+        """
+        Открывает журнал CSV-файла.
+        Возвращает (журнал, операции для повторного применения).
+        """
+        base = file_state(csv_path)
+        operations = []
+        valid_bytes = None
+        try:
+            with open(csv_path + JOURNAL_SUFFIX, "rb") as file:
+                header = _read_record(file.readline())
+                if header is not None and header.get("base") == base:
+                    valid_bytes = file.tell()
+                    for line in file:
+                        entry = _read_record(line)
+                        if entry is None:
+                            break  # недописанная последняя запись после сбоя
+                        operations.append(entry)
+                        valid_bytes += len(line)
+        except FileNotFoundError:
+            pass
+        journal = cls(csv_path, base, len(operations), valid_bytes=valid_bytes)
+        return journal, operations
+
+    def matches(self, csv_path) -> bool:
+        """Проверяет, что журнал относится к указанному CSV-файлу."""
+        return os.path.abspath(self.csv_path) == os.path.abspath(csv_path)
+
+    def append(self, op: str, index: int = None, row=None) -> None:
+        """
+        Дописывает операцию в журнал.
+        :param op: "add", "edit" или "delete".
+        :param index: Индекс транзакции (начинается с 1) для edit и delete.
+        :param row: Поля транзакции [дата, тип, категория, сумма].
+        """
+        if self._file is None:
+            if self.entries:
+                self._file = open(self.path, "a", encoding="utf-8")
+                if self.valid_bytes is not None:
+                    # Обрезает недописанную запись, иначе новая склеится с ней
+                    self._file.truncate(self.valid_bytes)
+                    self.valid_bytes = None
+            else:
+                self._file = open(self.path, "w", encoding="utf-8")
+                self._file.write(json.dumps({"base": self.base}) + "\n")
+        entry = {"op": op}
+        if index is not None:
+            entry["index"] = index
+        if row is not None:
+            entry["row"] = row
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.entries += 1
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Сбрасывает накопленные записи на диск (fsync)."""
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self) -> None:
+        """Синхронизирует и закрывает файл журнала."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Закрывает и удаляет файл журнала (после сжатия в CSV)."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.entries = 0
+
+
+def pending_operations(csv_path):
+    """
+    Операции действующего журнала CSV-файла, еще не свернутые в него;
+    пустой список, если журнала нет или он устарел.
+    """
+    return Journal.open_for(csv_path)[1]
+
+
+def check_no_pending(csv_path) -> None:
+    """
+    Запрещает дописывать CSV-файл с несвернутым журналом: дозапись изменила
+    бы состояние файла, журнал перестал бы применяться и его операции
+    (например, удаления) потерялись бы.
+    """
+    if pending_operations(csv_path):
+        raise ValueError(
+            f"у файла {csv_path} есть несвернутый журнал изменений, "
+            "загрузите файл и сохраните его целиком")
@@ -0,0 +1,41 @@
+class LabelTable:
+    """
+    Таблица строк с целыми кодами (словарное кодирование).
+    Каждая строка хранится один раз, коды выдаются по порядку появления и
+    не меняются, поэтому группировать и сравнивать можно по кодам.
+    """
+    def __init__(self, names=()):
+        self.names = []
+        self.codes = {}
+        for name in names:
+            self.encode(name)
+
+    def encode(self, name) -> int:
+        """Код строки; новая строка добавляется в таблицу."""
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def get(self, name):
+        """Код строки или None, если ее нет в таблице."""
+        return self.codes.get(name)
+
+    def decode(self, code) -> str:
+        return self.names[code]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self.codes
+
+
+# Общие для всего процесса таблицы: их используют транзакции, загрузчики,
+# итоги, индексы и подсказки ввода.
+CATEGORIES = LabelTable()
+TYPES = LabelTable(("income", "expense"))
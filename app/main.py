@@ -1,4 +1,7 @@
+import time
+from app import instrumentation
 from app.finance_traker import FinanceTracker
+from app.visualization import ChartRenderer
 from prompt_toolkit import prompt
 from app.ui import (
     common, show_results, add_and_edit, work_csv, delete)
@@ -15,56 +18,80 @@ def main_menu() -> None:
         tracker.load_from_csv(selected_file)
         print(f"\n✅ Данные успешно загружены из {selected_file}")
     else:
-        print("\nРаботаем с новым файлом данных.")
+        # Новый файл получает уникальное имя, чтобы не перезаписать существующий
+        selected_file = time.strftime("session-%Y%m%d-%H%M%S.csv")
+        print(f"\nРаботаем с новым файлом данных: изменения сохраняются в {selected_file}.")
+    tracker.enable_autosave(selected_file)
 
     input("\nНажмите Enter для продолжения...")
 
-    while True:
-        common.clean_screen()
-        common.display_header("Личный финансовый трекер")
-        print("\nДоступные действия:")
-        print("1. 📝 Добавить транзакцию")
-        print("2. 💰 Показать баланс")
-        print("3. 📅 Показать отчет за месяц")
-        print("4. 📊 Визуализировать расходы")
-        print("5. 💾 Экспорт в CSV")
-        print("6. ✏️ Редактировать транзакцию")
-        print("7. ❌ Удалить транзакцию")
-        print("8. 🚪 Выйти")
+    renderer = ChartRenderer()
+    try:
+        while True:
+            common.clean_screen()
+            common.display_header("Личный финансовый трекер")
+            print("\nДоступные действия:")
+            print("1. 📝 Добавить транзакцию")
+            print("2. 💰 Показать баланс")
+            print("3. 📅 Показать отчет за месяц")
+            print("4. 📊 Визуализировать расходы")
+            print("5. 💾 Экспорт в CSV")
+            print("6. ✏️ Редактировать транзакцию")
+            print("7. ❌ Удалить транзакцию")
+            print("8. 📥 Импорт нескольких CSV")
+            print("9. 🖼 Сохранить графики в файлы")
+            print("10. 📆 Отчет за квартал или год")
+            print("11. 🚪 Выйти")
 
-        choice = prompt("\nВыберите действие (1-8): ").strip()
+            choice = prompt("\nВыберите действие (1-11): ").strip()
 
-        if choice == "1":
-            common.clean_screen()
-            add_and_edit.add_transaction_ui(tracker)
-        elif choice == "2":
-            common.clean_screen()
-            show_results.show_balance_ui(tracker)
-        elif choice == "3":
-            common.clean_screen()
-            show_results.show_monthly_report_ui(tracker)
-        elif choice == "4":
-            common.clean_screen()
-            show_results.plot_spending_ui(tracker)
-        elif choice == "5":
-            common.clean_screen()
-            work_csv.export_to_csv_ui(tracker)
-        elif choice == "6":
-            common.clean_screen()
-            add_and_edit.edit_transaction_ui(tracker)
-        elif choice == "7":
-            common.clean_screen()
-            delete.delete_transaction_ui(tracker)
-        elif choice == "8":
-            print("\nДо свидания! 👋")
-            break
-        else:
-            print("❌ Неверный выбор. Попробуйте снова.")
+            if choice == "1":
+                common.clean_screen()
+                add_and_edit.add_transaction_ui(tracker)
+            elif choice == "2":
+                common.clean_screen()
+                show_results.show_balance_ui(tracker)
+            elif choice == "3":
+                common.clean_screen()
+                show_results.show_monthly_report_ui(tracker)
+            elif choice == "4":
+                common.clean_screen()
+                show_results.plot_spending_ui(tracker)
+            elif choice == "5":
+                common.clean_screen()
+                work_csv.export_to_csv_ui(tracker)
+            elif choice == "6":
+                common.clean_screen()
+                add_and_edit.edit_transaction_ui(tracker)
+            elif choice == "7":
+                common.clean_screen()
+                delete.delete_transaction_ui(tracker)
+            elif choice == "8":
+                common.clean_screen()
+                work_csv.import_csv_files_ui(tracker)
+            elif choice == "9":
+                common.clean_screen()
+                show_results.render_charts_ui(tracker, renderer)
+            elif choice == "10":
+                common.clean_screen()
+                show_results.show_period_report_ui(tracker)
+            elif choice == "11":
+                print("\nДо свидания! 👋")
+                break
+            elif choice == "stats":
+                # Скрытый пункт: статистика времени операций за сессию
+                print("\n" + instrumentation.STATS.format())
+            else:
+                print("❌ Неверный выбор. Попробуйте снова.")
         
-        input("\nНажмите Enter для продолжения...")
+            input("\nНажмите Enter для продолжения...")
+    finally:
+        renderer.shutdown()
+        tracker.close()
 
 
 def main():
+    profiler = instrumentation.start_session()
     try:
         main_menu()
     except KeyboardInterrupt:
@@ -72,4 +99,5 @@ def main():
     except Exception as e:
         print(f"\n❌ Критическая ошибка: {e}")
     finally:
+        instrumentation.finish_session(profiler)
         print("\nСпасибо за использование финансового трекера!")
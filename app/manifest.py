@@ -0,0 +1,57 @@
+import json
+import os
+import zlib
+from app.journal import file_state
+from app.streaming import transaction_to_row
+
+MANIFEST_SUFFIX = ".manifest"
+
+
+def row_checksum(row, checksum: int = 0) -> int:
+    """Продолжает цепочку crc32 строкой CSV (список полей)."""
+    line = "\x1f".join(map(str, row)) + "\n"
+    return zlib.crc32(line.encode("utf-8"), checksum)
+
+
+def rows_checksum(transactions, checksum: int = 0) -> int:
+    """
+    Цепочка crc32 по содержимому транзакций.
+    Передав checksum предыдущей части, можно продолжить подсчет для хвоста.
+    """
+    for t in transactions:
+        checksum = row_checksum(transaction_to_row(t), checksum)
+    return checksum
+
+
+def read_manifest(csv_path):
+    """
+    Читает манифест CSV-файла: сколько первых транзакций трекера уже записано
+    в файл и их контрольную сумму. Возвращает None, если манифеста нет или он
+    не соответствует текущему состоянию файла.
+    """
+    try:
+        with open(csv_path + MANIFEST_SUFFIX, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return None
+    if manifest.get("state") != file_state(csv_path):
+        return None
+    return manifest
+
+
+def write_manifest(csv_path, rows: int, checksum: int):
+    """Записывает манифест для только что сохраненного CSV-файла и возвращает его."""
+    manifest = {"rows": rows, "checksum": checksum, "state": file_state(csv_path)}
+    temp_path = csv_path + MANIFEST_SUFFIX + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file)
+    os.replace(temp_path, csv_path + MANIFEST_SUFFIX)
+    return manifest
+
+
+def remove_manifest(csv_path) -> None:
+    """Удаляет манифест, если файл больше не совпадает с началом трекера."""
+    try:
+        os.remove(csv_path + MANIFEST_SUFFIX)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+from app.storage import SqliteStorage, migrate_csv_files
+from app.streaming import is_csv_name
+
+
+def main(argv=None) -> int:
+    """
+    Переносит CSV-файлы в базу SQLite.
+    Пример: python -m app.migrate --db files/ledger.db files/data.csv
+    Без списка файлов переносятся все CSV из папки files.
+    """
+    parser = argparse.ArgumentParser(description="Перенос CSV-файлов в базу SQLite.")
+    parser.add_argument("files", nargs="*", help="CSV-файлы для переноса")
+    parser.add_argument("--db", default=os.path.join("files", "ledger.db"), help="Путь к базе SQLite")
+    args = parser.parse_args(argv)
+
+    csv_paths = args.files
+    if not csv_paths:
+        if not os.path.isdir("files"):
+            print("Папка files не найдена.", file=sys.stderr)
+            return 1
+        csv_paths = sorted(
+            os.path.join("files", f) for f in os.listdir("files") if is_csv_name(f))
+
+    storage = SqliteStorage(args.db)
+    try:
+        imported = migrate_csv_files(csv_paths, storage)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка при переносе данных: {e}", file=sys.stderr)
+        return 1
+    finally:
+        storage.close()
+    for path, count in imported.items():
+        print(f"{path}: {count} транзакций")
+    print(f"Всего перенесено: {sum(imported.values())} в {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import json
+import os
+from bisect import bisect_left
+from app.journal import file_state
+
+MONTH_INDEX_SUFFIX = ".months"
+
+
+def build_month_index(csv_path) -> dict:
+    """
+    Одним проходом по байтам файла (без разбора CSV) находит смещение первой
+    строки каждого месяца. Смещения пригодны для перехода, только если дата -
+    первая колонка, все даты в строгом формате ГГГГ-ММ-ДД и строки отсортированы
+    по дате; иначе индекс помечается как неотсортированный ("sorted": False).
+    """
+    months = {}
+    previous = b""
+    with open(csv_path, "rb") as file:
+        header = file.readline()
+        offset = file.tell()
+        ordered = header.lstrip(b"\xef\xbb\xbf").startswith(b"Date,")
+        for line in file if ordered else ():
+            if not line.strip():
+                offset += len(line)
+                continue
+            day = line[:10]
+            if day < previous or day[4:5] != b"-" or day[7:8] != b"-" or line[10:11] != b",":
+                # Порядок нарушен или строка не начинается с даты (в том числе
+                # продолжение поля с переводом строки)
+                ordered = False
+                break
+            if day[:7] != previous[:7]:
+                months[day[:7].decode("ascii")] = offset
+            previous = day
+            offset += len(line)
+    return {
+        "state": file_state(csv_path),
+        "sorted": ordered,
+        "months": months if ordered else {},
+        "end": offset,
+    }
+
+
+def read_month_index(csv_path):
+    """Читает индекс месяцев; None, если его нет или файл с тех пор изменился."""
+    try:
+        with open(csv_path + MONTH_INDEX_SUFFIX, "r", encoding="utf-8") as file:
+            index = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return None
+    if index.get("state") != file_state(csv_path):
+        return None
+    return index
+
+
+def write_month_index(csv_path, index) -> None:
+    temp_path = csv_path + MONTH_INDEX_SUFFIX + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(index, file)
+    os.replace(temp_path, csv_path + MONTH_INDEX_SUFFIX)
+
+
+def month_index_for(csv_path):
+    """
+    Возвращает актуальный индекс месяцев отсортированного по дате файла,
+    при необходимости перестраивая его. None - если файл не отсортирован
+    (это тоже запоминается, чтобы не проверять файл при каждой загрузке).
+    """
+    index = read_month_index(csv_path)
+    if index is None:
+        index = build_month_index(csv_path)
+        write_month_index(csv_path, index)
+    return index if index["sorted"] else None
+
+
+def month_offset(index, day: str) -> int:
+    """Смещение первой строки месяца дня ГГГГ-ММ-ДД или более позднего; конец файла, если таких нет."""
+    months = list(index["months"])
+    position = bisect_left(months, day[:7])
+    return index["months"][months[position]] if position < len(months) else index["end"]
@@ -0,0 +1,130 @@
+from datetime import date
+from app.labels import CATEGORIES, TYPES
+from app.transaction import to_rubles
+
+MONTHS_IN_QUARTER = 3
+
+
+def quarter_range(year: int, quarter: int):
+    """Первый и последний день квартала (1-4)."""
+    first_month = (quarter - 1) * MONTHS_IN_QUARTER + 1
+    return date(year, first_month, 1), _month_end(year, first_month + MONTHS_IN_QUARTER - 1)
+
+
+def year_range(year: int):
+    """Первый и последний день года."""
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def _month_end(year: int, month: int) -> date:
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    return date.fromordinal(next_month.toordinal() - 1)
+
+
+def month_bounds(start: int, end: int):
+    """
+    Месяцы периода [start, end] (порядковые номера дней) в виде
+    (год, месяц, первый день, последний день); крайние месяцы обрезаются
+    по границам периода.
+    """
+    bounds = []
+    day = date.fromordinal(start)
+    year, month = day.year, day.month
+    while True:
+        first = max(date(year, month, 1).toordinal(), start)
+        last = min(_month_end(year, month).toordinal(), end)
+        if first > end:
+            break
+        bounds.append((year, month, first, last))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return bounds
+
+
+class ReportGrid:
+    """
+    Отчет за период: суммы по сетке месяц x категория x тип.
+    Хранит копейки, в рубли переводит при чтении.
+    """
+    def __init__(self, months, cells):
+        """
+        :param months: Список (год, месяц) в порядке дат.
+        :param cells: Словарь (год, месяц, тип, категория) -> сумма в копейках.
+        """
+        self.months = months
+        self.cells = cells
+
+    def month_total(self, year: int, month: int, transaction_type: str) -> float:
+        """Сумма транзакций типа за месяц."""
+        return to_rubles(sum(
+            kopecks for (y, m, kind, _), kopecks in self.cells.items()
+            if (y, m, kind) == (year, month, transaction_type)
+        ))
+
+    def category_totals(self, transaction_type: str = "expense") -> dict:
+        """Суммы по категориям за весь период, по убыванию."""
+        totals = {}
+        for (_, _, kind, category), kopecks in self.cells.items():
+            if kind == transaction_type:
+                totals[category] = totals.get(category, 0) + kopecks
+        return {
+            category: to_rubles(kopecks)
+            for category, kopecks in sorted(totals.items(), key=lambda item: -item[1])
+        }
+
+    def category_series(self, category: str, transaction_type: str = "expense"):
+        """Суммы категории по месяцам периода."""
+        return [
+            to_rubles(self.cells.get((year, month, transaction_type, category), 0))
+            for year, month in self.months
+        ]
+
+    def rows(self):
+        """Список (год, месяц, доходы, расходы, баланс) по месяцам периода."""
+        income, expense = {}, {}
+        for (year, month, kind, _), kopecks in self.cells.items():
+            target = income if kind == "income" else expense if kind == "expense" else None
+            if target is not None:
+                target[(year, month)] = target.get((year, month), 0) + kopecks
+        return [
+            (year, month,
+             to_rubles(income.get((year, month), 0)),
+             to_rubles(expense.get((year, month), 0)),
+             to_rubles(income.get((year, month), 0) - expense.get((year, month), 0)))
+            for year, month in self.months
+        ]
+
+    def month_over_month(self, transaction_type: str = "expense"):
+        """
+        Изменение суммы типа относительно предыдущего месяца:
+        список (год, месяц, сумма, разница, процент или None).
+        """
+        column = 2 if transaction_type == "income" else 3
+        result = []
+        previous = None
+        for row in self.rows():
+            value = row[column]
+            if previous is None:
+                result.append((row[0], row[1], value, None, None))
+            else:
+                delta = value - previous
+                percent = delta / previous * 100 if previous else None
+                result.append((row[0], row[1], value, delta, percent))
+            previous = value
+        return result
+
+
+def build_report(timeseries, start: int, end: int) -> ReportGrid:
+    """
+    Строит сетку отчета за период [start, end] по рядам сумм по дням:
+    для каждой пары (тип, категория) и каждого месяца - одна сумма по
+    дереву Фенвика, без прохода по транзакциям.
+    """
+    bounds = month_bounds(start, end)
+    cells = {}
+    for (type_code, category_code), series in timeseries.by_category.items():
+        kind, category = TYPES.names[type_code], CATEGORIES.names[category_code]
+        for year, month, first, last in bounds:
+            kopecks = series.between(first, last)
+            if kopecks:
+                cells[(year, month, kind, category)] = kopecks
+    return ReportGrid([(year, month) for year, month, _, _ in bounds], cells)
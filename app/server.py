@@ -0,0 +1,336 @@
+"""
+Локальный JSON-сервис поверх одного трекера в памяти.
+
+Запуск: python server.py [--file data.csv] [--host 127.0.0.1] [--port 8765]
+
+Запросы:
+    GET  /balance[?as_of=ГГГГ-ММ-ДД]      доходы, расходы и баланс
+    GET  /report/monthly?month=M&year=Y    транзакции и суммы за месяц
+    GET  /report/categories[?type=expense] суммы по категориям
+    GET  /report/period?start=...&end=...  доходы и расходы по месяцам периода
+    POST /transactions                     список объектов {"amount", "category", "date", "type"}
+
+Все соединения обслуживаются одним циклом asyncio: чтения отвечают сразу,
+а записи ставятся в очередь единственной задачи записи, которая применяет
+накопившиеся пачки одним вызовом add_transactions. Поэтому чтение никогда
+не видит половину пачки, а автосохранение получает одно изменение на группу.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from contextlib import redirect_stdout
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+from app.cli import TRANSACTION_TYPES, parse_transaction, transaction_dict
+from app.finance_traker import FinanceTracker
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 16 * 1024 * 1024  # предельный размер тела запроса
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    """Ошибка запроса, которая возвращается клиенту как {"error": сообщение}."""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def read_request(reader):
+    """
+    Читает один запрос HTTP/1.1.
+    Возвращает (метод, путь, параметры, заголовки, тело) или None, если клиент закрыл соединение.
+    """
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "некорректная строка запроса")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HttpError(400, "некорректный Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, "слишком большое тело запроса")
+    body = await reader.readexactly(length) if length else b""
+    url = urlsplit(target)
+    return method.upper(), url.path, parse_qs(url.query), headers, body
+
+
+def encode_response(status: int, data, keep_alive: bool = True) -> bytes:
+    """Формирует ответ HTTP/1.1 с телом JSON."""
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def _param(query, name, convert=str, default=None, required=False):
+    """Значение параметра запроса, приведенное функцией convert."""
+    values = query.get(name)
+    if not values:
+        if required:
+            raise HttpError(400, f"не указан параметр {name}")
+        return default
+    try:
+        return convert(values[0])
+    except ValueError:
+        raise HttpError(400, f"некорректный параметр {name}: {values[0]}")
+
+
+class TrackerService:
+    """
+    Обработчики запросов и очередь записи для одного трекера.
+    Все методы вызываются из цикла событий; трекер не разделяется с другими потоками,
+    кроме собственного потока автосохранения.
+    """
+    def __init__(self, tracker: FinanceTracker):
+        self.tracker = tracker
+        self.server = None
+        self.writes = 0  # применено пачек (после объединения в очереди)
+        self._queue = None
+        self._writer = None
+        self._connections = {}  # поток записи соединения -> задача, которая его обслуживает
+        self._routes = {
+            "/balance": ("GET", self.balance),
+            "/report/monthly": ("GET", self.monthly_report),
+            "/report/categories": ("GET", self.category_report),
+            "/report/period": ("GET", self.period_report),
+            "/transactions": ("POST", self.add_transactions),
+        }
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """Запускает задачу записи и принимает соединения (port=0 - любой свободный порт)."""
+        self._queue = asyncio.Queue()
+        self._writer = asyncio.create_task(self._write_loop())
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Перестает принимать соединения, дожидается поставленных записей и закрывает соединения."""
+        self.server.close()
+        await self._queue.join()
+        self._writer.cancel()
+        tasks = list(self._connections.values())
+        for writer in list(self._connections):
+            writer.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def submit(self, transactions) -> int:
+        """Ставит пачку транзакций в очередь записи; возвращает число транзакций после записи."""
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put((transactions, done))
+        return await done
+
+    async def _write_loop(self) -> None:
+        """
+        Единственная задача, изменяющая трекер. Пачки, накопившиеся в очереди,
+        пока применялась предыдущая, применяются вместе.
+        """
+        while True:
+            items = [await self._queue.get()]
+            while not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            try:
+                self.tracker.add_transactions([t for batch, _ in items for t in batch])
+                self.writes += 1
+                total = len(self.tracker.transactions)
+                for _, done in items:
+                    if not done.done():
+                        done.set_result(total)
+            except Exception as e:
+                for _, done in items:
+                    if not done.done():
+                        done.set_exception(e)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    async def _handle_connection(self, reader, writer) -> None:
+        """Обслуживает запросы одного соединения (keep-alive) до его закрытия."""
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HttpError as e:
+                    writer.write(encode_response(e.status, {"error": e.message}, keep_alive=False))
+                    await writer.drain()
+                    return
+                if request is None:
+                    return
+                method, path, query, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, data = await self.dispatch(method, path, query, body)
+                writer.write(encode_response(status, data, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def dispatch(self, method: str, path: str, query, body: bytes):
+        """Вызывает обработчик пути; возвращает (код ответа, данные JSON)."""
+        route = self._routes.get(path.rstrip("/") or "/")
+        if route is None:
+            return 404, {"error": f"неизвестный путь {path}"}
+        allowed, handler = route
+        if method != allowed:
+            return 405, {"error": f"для {path} поддерживается только {allowed}"}
+        try:
+            return await handler(query, body)
+        except HttpError as e:
+            return e.status, {"error": e.message}
+        except Exception as e:
+            print(f"Ошибка обработки {method} {path}: {e}", file=sys.stderr)
+            return 500, {"error": str(e)}
+
+    async def balance(self, query, body):
+        as_of = _param(query, "as_of", date.fromisoformat)
+        # Баланс считается в копейках, а не вычитанием сумм в рублях
+        if as_of is None:
+            income, expense = self.tracker.totals.income, self.tracker.totals.expense
+            balance = self.tracker.get_balance()
+        else:
+            income, expense = self.tracker.get_totals_between(date.min, as_of)
+            balance = self.tracker.get_balance_as_of(as_of)
+        return 200, {"income": income, "expense": expense, "balance": balance}
+
+    async def monthly_report(self, query, body):
+        month = _param(query, "month", int, required=True)
+        year = _param(query, "year", int, required=True)
+        if not 1 <= month <= 12:
+            raise HttpError(400, "месяц должен быть от 1 до 12")
+        income, expense = self.tracker.get_monthly_totals(month, year)
+        return 200, {
+            "month": month,
+            "year": year,
+            "income": income,
+            "expense": expense,
+            "transactions": [transaction_dict(t) for t in self.tracker.get_monthly_report(month, year)],
+        }
+
+    async def category_report(self, query, body):
+        transaction_type = _param(query, "type", default="expense")
+        if transaction_type not in TRANSACTION_TYPES:
+            raise HttpError(400, "тип должен быть 'income' или 'expense'")
+        totals = self.tracker.totals.category_totals(transaction_type)
+        return 200, dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+    async def period_report(self, query, body):
+        start = _param(query, "start", date.fromisoformat, required=True)
+        end = _param(query, "end", date.fromisoformat, required=True)
+        if end < start:
+            raise HttpError(400, "конец периода раньше начала")
+        report = self.tracker.get_report(start, end)
+        return 200, {
+            "months": [
+                {"year": year, "month": month, "income": income, "expense": expense, "balance": balance}
+                for year, month, income, expense, balance in report.rows()
+            ],
+            "categories": report.category_totals("expense"),
+        }
+
+    async def add_transactions(self, query, body):
+        try:
+            records = json.loads(body or b"null")
+        except ValueError as e:
+            raise HttpError(400, f"некорректный JSON: {e}")
+        if isinstance(records, dict):
+            records = [records]
+        if not isinstance(records, list) or not records:
+            raise HttpError(400, "ожидается объект транзакции или непустой список")
+        transactions, errors = [], []
+        for number, record in enumerate(records, 1):
+            try:
+                transactions.append(parse_transaction(
+                    record["amount"], record["category"], record["date"], record["type"]))
+            except (TypeError, ValueError, KeyError) as e:
+                errors.append(f"транзакция {number}: {e}")
+        if errors:
+            # Пачка применяется целиком или не применяется вовсе
+            return 400, {"error": "транзакции не добавлены", "errors": errors}
+        total = await self.submit(transactions)
+        return 201, {"added": len(transactions), "total": total}
+
+
+async def serve(tracker: FinanceTracker, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """Обслуживает запросы до отмены (Ctrl+C)."""
+    service = TrackerService(tracker)
+    await service.start(host, port)
+    print(f"Сервис запущен: http://{host}:{service.port}", file=sys.stderr)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Локальный JSON-сервис финансового трекера для нескольких клиентов.")
+    parser.add_argument("--file", default="data.csv", help="CSV-файл журнала в папке files")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Загружает журнал, включает автосохранение в него и обслуживает запросы.
+    Пример: python server.py --file data.csv --port 8765
+    """
+    args = build_parser().parse_args(argv)
+    tracker = FinanceTracker()
+    try:
+        with redirect_stdout(sys.stderr):
+            tracker.load_from_csv(args.file, strict=True)
+    except Exception as e:
+        # С частью журнала сервис не запускается: автосохранение перезаписало бы файл
+        print(f"Ошибка при загрузке данных: {e}", file=sys.stderr)
+        return 1
+    tracker.enable_autosave(args.file)
+    try:
+        asyncio.run(serve(tracker, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        with redirect_stdout(sys.stderr):
+            tracker.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import mmap
+import os
+import struct
+from app.journal import file_state
+from app.labels import CATEGORIES, TYPES, LabelTable
+from app.transaction import Transaction
+
+SNAPSHOT_SUFFIX = ".snap"
+MAGIC = b"FTSN"
+VERSION = 2
+# magic, версия, размер/mtime_ns/inode исходного CSV, число записей,
+# число категорий, число типов
+HEADER = struct.Struct("<4sHQqQQII")
+# сумма в копейках, порядковый номер даты, код типа, код категории
+RECORD = struct.Struct("<qiBI")
+LENGTH = struct.Struct("<I")
+BATCH_SIZE = 10_000
+
+
+def snapshot_path(csv_path) -> str:
+    return str(csv_path) + SNAPSHOT_SUFFIX
+
+
+def write_snapshot(csv_path, transactions) -> None:
+    """
+    Записывает бинарный снимок транзакций рядом с CSV-файлом.
+    Снимок привязан к текущему состоянию CSV (размер, mtime, inode) и должен
+    содержать ровно те транзакции, что записаны в файле.
+    """
+    state = file_state(csv_path)
+    if state is None:
+        return
+    # В файле свои коды: коды общих таблиц действительны только в процессе,
+    # поэтому коды процесса перекодируются своими таблицами снимка
+    file_categories, file_types = LabelTable(), LabelTable()
+    encode_category, encode_type = file_categories.encode, file_types.encode
+    records = bytearray()
+    for t in transactions:
+        records += RECORD.pack(t.kopecks, t.ordinal, encode_type(t.type_code), encode_category(t.category_code))
+    categories = [CATEGORIES.decode(code) for code in file_categories]
+    types = [TYPES.decode(code) for code in file_types]
+    path = snapshot_path(csv_path)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(
+            MAGIC, VERSION, *state, len(records) // RECORD.size, len(categories), len(types)))
+        file.write(records)
+        for name in categories + types:
+            encoded = name.encode("utf-8")
+            file.write(LENGTH.pack(len(encoded)))
+            file.write(encoded)
+    os.replace(temp_path, path)
+
+
+def _read_strings(view, offset, count):
+    names = []
+    for _ in range(count):
+        (length,) = LENGTH.unpack_from(view, offset)
+        offset += LENGTH.size
+        names.append(bytes(view[offset:offset + length]).decode("utf-8"))
+        offset += length
+    return names, offset
+
+
+def iter_snapshot_batches(csv_path, batch_size: int = BATCH_SIZE):
+    """
+    Читает снимок через mmap и выдает транзакции пачками.
+    Возвращает None, если снимка нет, он поврежден или устарел
+    относительно CSV-файла.
+    """
+    try:
+        with open(snapshot_path(csv_path), "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+    try:
+        magic, version, size, mtime_ns, inode, count, n_categories, n_types = \
+            HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != VERSION or [size, mtime_ns, inode] != file_state(csv_path):
+            mapped.close()
+            return None
+        records_end = HEADER.size + count * RECORD.size
+        with memoryview(mapped) as view:
+            categories, offset = _read_strings(view, records_end, n_categories)
+            types, _ = _read_strings(view, offset, n_types)
+    except (struct.error, UnicodeDecodeError):
+        mapped.close()
+        return None
+    categories = [CATEGORIES.encode(name) for name in categories]
+    types = [TYPES.encode(name) for name in types]
+    return _snapshot_batches(mapped, count, categories, types, batch_size)
+
+
+def _snapshot_batches(mapped, count, categories, types, batch_size):
+    from_codes = Transaction.from_codes
+    view = memoryview(mapped)
+    try:
+        for start in range(0, count, batch_size):
+            stop = min(start + batch_size, count)
+            chunk = view[HEADER.size + start * RECORD.size:HEADER.size + stop * RECORD.size]
+            try:
+                batch = [
+                    from_codes(kopecks, categories[category], ordinal, types[kind])
+                    for kopecks, ordinal, kind, category in RECORD.iter_unpack(chunk)
+                ]
+            finally:
+                chunk.release()
+            yield batch
+    finally:
+        view.release()
+        mapped.close()
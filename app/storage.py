@@ -0,0 +1,358 @@
+import csv
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import date
+from app.journal import Journal
+from app.streaming import (
+    CSV_HEADER, aggregate_csv, compression_of, iter_transaction_batches, open_csv, transaction_to_row)
+from app.transaction import Transaction, parse_date, to_rubles
+
+INSERT_BATCH_SIZE = 10_000
+
+
+def _month_range(month: int, year: int):
+    """Границы месяца в виде ISO-строк: [начало, начало следующего)."""
+    start = date(year, month, 1)
+    end = date(year + month // 12, month % 12 + 1, 1)
+    return start.isoformat(), end.isoformat()
+
+
+def _iso_date(value) -> str:
+    """Дата (ГГГГ-ММ-ДД или date) в виде ISO-строки, как она хранится в базе."""
+    if isinstance(value, str):
+        value = date.fromordinal(parse_date(value))
+    return value.isoformat()
+
+
+class StorageBackend(ABC):
+    """
+    Интерфейс хранилища транзакций.
+    Запросы баланса, отчетов и разбивки по категориям выполняются самим
+    хранилищем, без загрузки всех транзакций в FinanceTracker
+    (см. FinanceTracker.attach_storage).
+    """
+    @abstractmethod
+    def iter_batches(self):
+        """Выдает все транзакции пачками в порядке добавления."""
+
+    @abstractmethod
+    def save(self, transactions) -> None:
+        """Заменяет содержимое хранилища указанными транзакциями."""
+
+    @abstractmethod
+    def append(self, transactions) -> int:
+        """Добавляет транзакции, возвращает их количество."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Число транзакций."""
+
+    @abstractmethod
+    def balance(self, end=None) -> float:
+        """Доходы минус расходы (посчитанные в копейках); end - только транзакции до даты включительно."""
+
+    @abstractmethod
+    def totals(self, end=None, start=None) -> tuple:
+        """Возвращает (доходы, расходы); start, end - учитывать только транзакции периода (включительно)."""
+
+    @abstractmethod
+    def transactions_between(self, start, end):
+        """Транзакции за период [start, end] (включительно), упорядоченные по дате."""
+
+    @abstractmethod
+    def monthly_report(self, month: int, year: int):
+        """Транзакции за месяц в порядке добавления."""
+
+    @abstractmethod
+    def monthly_totals(self, month: int, year: int) -> tuple:
+        """Возвращает (доходы, расходы) за месяц."""
+
+    @abstractmethod
+    def transactions_by_category(self, category):
+        """Транзакции указанной категории в порядке добавления."""
+
+    @abstractmethod
+    def category_totals(self, transaction_type: str) -> dict:
+        """Суммы по категориям для указанного типа."""
+
+    @abstractmethod
+    def monthly_series(self):
+        """Список (год, месяц, доходы, расходы) по всем месяцам в порядке дат."""
+
+    def close(self) -> None:
+        """Освобождает ресурсы хранилища."""
+
+
+class CsvStorage(StorageBackend):
+    """
+    Хранилище в CSV-файле. Каждый запрос - полный проход по файлу с учетом
+    его журнала изменений (app.journal), как при загрузке в FinanceTracker.
+    """
+    def __init__(self, filepath):
+        self.filepath = str(filepath)
+
+    def iter_batches(self):
+        return iter_transaction_batches(self.filepath)
+
+    def save(self, transactions) -> None:
+        temp_path = self.filepath + ".tmp"
+        with open_csv(temp_path, "w", compression_of(self.filepath)) as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(transaction_to_row(t) for t in transactions)
+        os.replace(temp_path, self.filepath)
+        Journal(self.filepath, None).discard()  # операции относились к прежнему содержимому
+
+    def append(self, transactions) -> int:
+        """
+        Дописывает строки в конец файла без его чтения. Если у файла есть
+        несвернутый журнал, строки добавляются операциями журнала: дозапись
+        в CSV сделала бы журнал устаревшим, и его операции потерялись бы.
+        """
+        rows = [transaction_to_row(t) for t in transactions]
+        journal, operations = Journal.open_for(self.filepath)
+        if operations:
+            for row in rows:
+                journal.append("add", row=row)
+            journal.close()
+            return len(rows)
+        is_new = not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0
+        with open_csv(self.filepath, "a") as file:
+            writer = csv.writer(file)
+            if is_new:
+                writer.writerow(CSV_HEADER)
+            writer.writerows(rows)
+        return len(rows)
+
+    def _scan(self, predicate):
+        return [t for batch in self.iter_batches() for t in batch if predicate(t)]
+
+    def count(self) -> int:
+        return aggregate_csv(self.filepath).count
+
+    def _type_totals(self, end=None, start=None) -> dict:
+        """Суммы в копейках по типам за период; без границ - по итогам файла."""
+        if start is None and end is None:
+            totals = aggregate_csv(self.filepath)
+            return {kind: totals.total_kopecks(kind) for kind in ("income", "expense")}
+        first = parse_date(_iso_date(start)) if start is not None else date.min.toordinal()
+        last = parse_date(_iso_date(end)) if end is not None else date.max.toordinal()
+        kopecks = {"income": 0, "expense": 0}
+        for t in self._scan(lambda t: first <= t.ordinal <= last):
+            kopecks[t.type] = kopecks.get(t.type, 0) + t.kopecks
+        return kopecks
+
+    def balance(self, end=None) -> float:
+        totals = self._type_totals(end)
+        return to_rubles(totals["income"] - totals["expense"])
+
+    def totals(self, end=None, start=None) -> tuple:
+        totals = self._type_totals(end, start)
+        return to_rubles(totals["income"]), to_rubles(totals["expense"])
+
+    def transactions_between(self, start, end):
+        first, last = parse_date(_iso_date(start)), parse_date(_iso_date(end))
+        return sorted(self._scan(lambda t: first <= t.ordinal <= last), key=lambda t: t.ordinal)
+
+    def monthly_report(self, month: int, year: int):
+        return self._scan(lambda t: t.date.month == month and t.date.year == year)
+
+    def monthly_totals(self, month: int, year: int) -> tuple:
+        totals = aggregate_csv(self.filepath)
+        return totals.month_total("income", month, year), totals.month_total("expense", month, year)
+
+    def transactions_by_category(self, category):
+        return self._scan(lambda t: t.category == category)
+
+    def category_totals(self, transaction_type: str) -> dict:
+        return aggregate_csv(self.filepath).category_totals(transaction_type)
+
+    def monthly_series(self):
+        return aggregate_csv(self.filepath).month_series()
+
+
+class SqliteStorage(StorageBackend):
+    """
+    Хранилище в базе SQLite.
+    Даты хранятся ISO-строками, поэтому сравниваются лексически; суммы -
+    целыми копейками, поэтому SUM точен. По дате и по (категория, тип)
+    построены индексы. Колонка source хранит файл, из которого строка
+    перенесена (см. replace_source); у добавленных напрямую она пуста.
+    """
+    SCHEMA_VERSION = 1
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            kopecks INTEGER NOT NULL,
+            source TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date)",
+        "CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (category, type)",
+        "CREATE INDEX IF NOT EXISTS idx_transactions_source ON transactions (source)",
+    )
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(str(path))
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Создает таблицу и индексы в одной транзакции (если их еще нет)."""
+        with self.connection:
+            # Без явного BEGIN модуль sqlite3 выполняет CREATE вне транзакции
+            self.connection.execute("BEGIN")
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+            self.connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    @staticmethod
+    def _to_transactions(rows):
+        return [
+            Transaction.from_ordinal(kopecks, category, parse_date(day), transaction_type)
+            for day, transaction_type, category, kopecks in rows
+        ]
+
+    def iter_batches(self, batch_size: int = INSERT_BATCH_SIZE):
+        cursor = self.connection.execute(
+            "SELECT date, type, category, kopecks FROM transactions ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield self._to_transactions(rows)
+
+    def _insert(self, transactions, source=None) -> int:
+        count = 0
+        batch = []
+        for t in transactions:
+            batch.append((*transaction_to_row(t)[:3], t.kopecks, source))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                count += self._insert_rows(batch)
+                batch = []
+        return count + self._insert_rows(batch)
+
+    def _insert_rows(self, rows) -> int:
+        self.connection.executemany(
+            "INSERT INTO transactions (date, type, category, kopecks, source) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def save(self, transactions) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM transactions")
+            self._insert(transactions)
+
+    def append(self, transactions) -> int:
+        with self.connection:
+            return self._insert(transactions)
+
+    def replace_source(self, source, batches) -> int:
+        """
+        Заменяет транзакции, ранее перенесенные из источника source (пути
+        CSV-файла), транзакциями из пачек batches в одной транзакции SQLite:
+        повторный перенос того же файла не дублирует строки.
+        Возвращает количество перенесенных строк.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM transactions WHERE source = ?", (source,))
+            return sum(self._insert(batch, source) for batch in batches)
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def _type_totals(self, end=None, start=None) -> dict:
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("date >= ?")
+            params.append(_iso_date(start))
+        if end is not None:
+            conditions.append("date <= ?")
+            params.append(_iso_date(end))
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return dict(self.connection.execute(
+            f"SELECT type, SUM(kopecks) FROM transactions{where} GROUP BY type", params))
+
+    def balance(self, end=None) -> float:
+        totals = self._type_totals(end)
+        return to_rubles(totals.get("income", 0) - totals.get("expense", 0))
+
+    def totals(self, end=None, start=None) -> tuple:
+        totals = self._type_totals(end, start)
+        return to_rubles(totals.get("income", 0)), to_rubles(totals.get("expense", 0))
+
+    def transactions_between(self, start, end):
+        return self._to_transactions(self.connection.execute(
+            "SELECT date, type, category, kopecks FROM transactions"
+            " WHERE date >= ? AND date <= ? ORDER BY date, id",
+            (_iso_date(start), _iso_date(end)),
+        ))
+
+    def monthly_report(self, month: int, year: int):
+        start, end = _month_range(month, year)
+        return self._to_transactions(self.connection.execute(
+            "SELECT date, type, category, kopecks FROM transactions"
+            " WHERE date >= ? AND date < ? ORDER BY id",
+            (start, end),
+        ))
+
+    def monthly_totals(self, month: int, year: int) -> tuple:
+        start, end = _month_range(month, year)
+        totals = dict(self.connection.execute(
+            "SELECT type, SUM(kopecks) FROM transactions"
+            " WHERE date >= ? AND date < ? GROUP BY type",
+            (start, end),
+        ))
+        return to_rubles(totals.get("income", 0)), to_rubles(totals.get("expense", 0))
+
+    def transactions_by_category(self, category):
+        return self._to_transactions(self.connection.execute(
+            "SELECT date, type, category, kopecks FROM transactions"
+            " WHERE category = ? ORDER BY id",
+            (category,),
+        ))
+
+    def category_totals(self, transaction_type: str) -> dict:
+        return {
+            category: to_rubles(kopecks)
+            for category, kopecks in self.connection.execute(
+                "SELECT category, SUM(kopecks) FROM transactions"
+                " WHERE type = ? GROUP BY category ORDER BY MIN(id)",
+                (transaction_type,),
+            )
+        }
+
+    def monthly_series(self):
+        months = {}
+        for month, transaction_type, kopecks in self.connection.execute(
+                "SELECT substr(date, 1, 7), type, SUM(kopecks) FROM transactions"
+                " GROUP BY substr(date, 1, 7), type"):
+            totals = months.setdefault(month, [0, 0])
+            if transaction_type == "income":
+                totals[0] += kopecks
+            elif transaction_type == "expense":
+                totals[1] += kopecks
+        return [
+            (int(month[:4]), int(month[5:]), to_rubles(income), to_rubles(expense))
+            for month, (income, expense) in sorted(months.items())
+        ]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def migrate_csv_files(csv_paths, storage: SqliteStorage) -> dict:
+    """
+    Переносит транзакции из CSV-файлов в базу (пачками). Строки каждого
+    файла заменяют перенесенные из него раньше, поэтому повторный перенос
+    не дублирует транзакции, а обновляет их.
+    Возвращает словарь: путь к файлу -> количество перенесенных строк.
+    """
+    imported = {}
+    for path in csv_paths:
+        imported[path] = storage.replace_source(os.path.abspath(path), iter_transaction_batches(path))
+    return imported
@@ -0,0 +1,260 @@
+import csv
+import importlib
+import os
+from array import array
+from itertools import islice
+from app.aggregates import LedgerTotals
+from datetime import date as _date
+from app.journal import pending_operations
+from app.labels import CATEGORIES, TYPES
+from app.month_index import month_index_for, month_offset
+from app.transaction import Transaction, format_amount, parse_date, to_kopecks
+
+CSV_HEADER = ["Date", "Type", "Category", "Amount"]
+DEFAULT_BATCH_SIZE = 10_000
+# Расширение сжатия -> модуль стандартной библиотеки (импортируется при первом обращении)
+COMPRESSORS = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma"}
+CSV_SUFFIXES = (".csv",) + tuple(".csv" + suffix for suffix in COMPRESSORS)
+
+
+def compression_of(filepath) -> str:
+    """Расширение сжатия файла (".gz", ".bz2", ".xz") или пустая строка для обычного файла."""
+    suffix = os.path.splitext(str(filepath))[1].lower()
+    return suffix if suffix in COMPRESSORS else ""
+
+
+def is_csv_name(filename) -> bool:
+    """Проверяет, что имя файла - CSV, в том числе сжатый (.csv.gz, .csv.bz2, .csv.xz)."""
+    return str(filename).lower().endswith(CSV_SUFFIXES)
+
+
+def open_csv(filepath, mode: str = "r", compression: str = None):
+    """
+    Открывает CSV-файл как текстовый поток (или двоичный, если в mode есть "b").
+    Сжатые файлы распаковываются и сжимаются по мере чтения и записи, без
+    временной распакованной копии на диске; дозапись ("a") добавляет к
+    сжатому файлу новый поток, который читается вместе с прежними.
+    :param compression: Сжатие, если его нельзя определить по имени файла
+        (например, для временного файла при перезаписи).
+    """
+    if compression is None:
+        compression = compression_of(filepath)
+    binary = "b" in mode
+    if not compression:
+        if binary:
+            return open(filepath, mode)
+        return open(filepath, mode, newline="", encoding="utf-8")
+    module = importlib.import_module(COMPRESSORS[compression])
+    if binary:
+        return module.open(filepath, mode)
+    return module.open(filepath, mode + "t", newline="", encoding="utf-8")
+
+
+def sync_file(filepath) -> None:
+    """
+    Сбрасывает закрытый файл на диск (fsync). Сжатый поток дописывает
+    последний блок только при закрытии, поэтому fsync делается после него.
+    """
+    fd = os.open(filepath, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def transaction_to_row(transaction):
+    """Поля транзакции в порядке колонок CSV_HEADER."""
+    return [
+        transaction.date.strftime("%Y-%m-%d"),
+        transaction.type,
+        transaction.category,
+        format_amount(transaction.kopecks),
+    ]
+
+
+def row_to_transaction(row):
+    """Создает транзакцию из полей в порядке колонок CSV_HEADER."""
+    date, transaction_type, category, amount = row
+    return Transaction(amount, category, date, transaction_type)
+
+
+def column_positions(header):
+    """Возвращает номера колонок Date, Type, Category и Amount."""
+    try:
+        return tuple(header.index(name) for name in CSV_HEADER)
+    except ValueError:
+        raise ValueError(f"В заголовке CSV должны быть колонки {', '.join(CSV_HEADER)}")
+
+
+def _iso_day(value):
+    """Дата (строка или date) в виде строки ГГГГ-ММ-ДД; None остается None."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = _date.fromordinal(parse_date(value))
+    return value.isoformat()
+
+
+class RowFilter:
+    """
+    Условия отбора строк при загрузке: период [start, end], категории и тип.
+    Проверяются по исходным строкам CSV до разбора суммы и даты: дата
+    ГГГГ-ММ-ДД сравнивается как строка, лексический порядок совпадает с
+    календарным. Пустой фильтр (без условий) ложен.
+    """
+    def __init__(self, start=None, end=None, categories=None, transaction_type=None):
+        """
+        :param start: Первый день периода (ГГГГ-ММ-ДД или date).
+        :param end: Последний день периода включительно.
+        :param categories: Категория или набор категорий.
+        :param transaction_type: "income" или "expense".
+        """
+        self.start = _iso_day(start)
+        self.end = _iso_day(end)
+        if isinstance(categories, str):
+            categories = [categories]
+        self.categories = frozenset(categories) if categories else None
+        self.type = transaction_type
+
+    def __bool__(self):
+        return any(value is not None for value in (self.start, self.end, self.categories, self.type))
+
+    def accepts(self, transaction) -> bool:
+        """Проверяет уже созданную транзакцию."""
+        return self.accepts_row(transaction.date.strftime("%Y-%m-%d"), transaction.type, transaction.category)
+
+    def accepts_row(self, day: str, transaction_type: str, category: str) -> bool:
+        """Проверяет поля строки; day - дата ГГГГ-ММ-ДД."""
+        return not (
+            (self.start is not None and day < self.start)
+            or (self.end is not None and day > self.end)
+            or (self.categories is not None and category not in self.categories)
+            or (self.type is not None and transaction_type != self.type)
+        )
+
+
+def _iter_filtered_rows(filepath, row_filter: RowFilter):
+    """
+    Выдает только строки, подходящие под фильтр. Если файл отсортирован по
+    дате (см. app.month_index), чтение начинается с месяца начала периода и
+    заканчивается на первой строке после его конца.
+    """
+    start, end, categories, kind = row_filter.start, row_filter.end, row_filter.categories, row_filter.type
+    index = None
+    if (start is not None or end is not None) and not compression_of(filepath):
+        index = month_index_for(filepath)
+    with open_csv(filepath) as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        date_col, type_col, category_col, amount_col = column_positions(header)
+        if index is not None and start is not None:
+            file.seek(month_offset(index, start))
+        for row in reader:
+            if not row:
+                continue
+            day = row[date_col]
+            if len(day) != 10 or day[4] != "-" or day[7] != "-":
+                # Нестрогий (2023-1-5) или неверный (01.10.2023) формат: сравнивать
+                # как текст нельзя, parse_date приводит дату или отклоняет строку
+                day = _iso_day(day)
+            if start is not None and day < start:
+                continue
+            if end is not None and day > end:
+                if index is not None:
+                    break
+                continue
+            if kind is not None and row[type_col] != kind:
+                continue
+            if categories is not None and row[category_col] not in categories:
+                continue
+            yield row[date_col], row[type_col], row[category_col], row[amount_col]
+
+
+def _iter_journaled_rows(filepath, operations):
+    """
+    Выдает строки файла с примененными операциями его журнала (app.journal).
+    Операции ссылаются на позиции в текущем списке, а добавление идет только
+    в конец, поэтому оставшиеся строки файла сохраняют исходный порядок:
+    по операциям строится список слотов (номер строки файла или номер
+    строки из журнала), после чего файл читается одним проходом. В памяти
+    держатся номера строк, а не сами строки.
+    """
+    slots = array("q", range(sum(1 for _ in iter_rows(filepath, journal=False))))
+    added = []
+    for entry in operations:
+        if entry["op"] == "add":
+            slots.append(-1 - len(added))
+            added.append(tuple(entry["row"]))
+        elif entry["op"] == "edit":
+            slots[entry["index"] - 1] = -1 - len(added)
+            added.append(tuple(entry["row"]))
+        elif entry["op"] == "delete":
+            del slots[entry["index"] - 1]
+    rows = iter_rows(filepath, journal=False)
+    position = 0
+    for slot in slots:
+        if slot < 0:
+            yield added[-1 - slot]
+        else:
+            yield next(islice(rows, slot - position, None))
+            position = slot + 1
+
+
+def iter_rows(filepath, row_filter: RowFilter = None, journal: bool = True):
+    """
+    Построчно читает CSV-файл (возможно, сжатый) и выдает кортежи строк
+    (дата, тип, категория, сумма) в порядке колонок CSV_HEADER.
+    :param row_filter: Выдавать только строки, подходящие под фильтр.
+    :param journal: Применить операции журнала файла, еще не свернутые
+        в него, как при загрузке в FinanceTracker. False - только сам файл.
+    """
+    operations = pending_operations(filepath) if journal else None
+    if operations:
+        for row in _iter_journaled_rows(filepath, operations):
+            if not row_filter or row_filter.accepts_row(_iso_day(row[0]), row[1], row[2]):
+                yield row
+        return
+    if row_filter:
+        yield from _iter_filtered_rows(filepath, row_filter)
+        return
+    with open_csv(filepath) as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        date_col, type_col, category_col, amount_col = column_positions(header)
+        for row in reader:
+            if row:
+                yield row[date_col], row[type_col], row[category_col], row[amount_col]
+
+
+def iter_transaction_batches(filepath, batch_size: int = DEFAULT_BATCH_SIZE, row_filter: RowFilter = None,
+                             journal: bool = True):
+    """
+    Читает транзакции из CSV-файла пачками не больше batch_size штук.
+    В памяти одновременно находится только одна пачка.
+    :param row_filter: Создавать транзакции только для подходящих строк.
+    :param journal: Применить операции журнала файла (см. iter_rows).
+    """
+    batch = []
+    for date, transaction_type, category, amount in iter_rows(filepath, row_filter, journal):
+        batch.append(Transaction.from_ordinal(to_kopecks(amount), category, parse_date(date), transaction_type))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def aggregate_csv(filepath) -> LedgerTotals:
+    """
+    Считает итоги по CSV-файлу за один проход, не сохраняя строки:
+    баланс, суммы по категориям и по месяцам. Операции журнала файла
+    учитываются (см. iter_rows).
+    """
+    totals = LedgerTotals()
+    for date, transaction_type, category, amount in iter_rows(filepath):
+        totals.add(to_kopecks(amount), CATEGORIES.encode(category), parse_date(date), TYPES.encode(transaction_type))
+    return totals
@@ -0,0 +1,230 @@
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from app.labels import CATEGORIES, TYPES
+from app.transaction import to_rubles
+
+INITIAL_DAYS = 1024  # начальная емкость ряда в днях
+MAX_DENSE_DAYS = 50 * 366  # наибольшая длина плотного ряда; более далекие дни хранятся отдельно
+
+
+class DailySeries:
+    """
+    Суммы по дням (в копейках) с деревом Фенвика поверх них.
+
+    Дни хранятся как смещения от base (порядковый номер первого дня).
+    Дерево строится лениво за O(дней) при первом запросе после пакетного
+    добавления, а затем поддерживается точечными обновлениями за O(log n).
+    Сумма за любой префикс дней также считается за O(log n).
+
+    Плотный ряд не длиннее MAX_DENSE_DAYS: дни за его пределами (например,
+    ошибочный год 0023 или 9999) хранятся в словаре sparse, и их префиксные
+    суммы считаются двоичным поиском, а не растягивают ряд на тысячи лет.
+    """
+    def __init__(self):
+        self.base = None
+        self.days = array("q")
+        self._tree = None
+        self.sparse = {}  # день вне плотного ряда -> сумма
+        self._sparse_sums = None  # (отсортированные дни sparse, префиксные суммы)
+
+    def _fit(self, ordinal):
+        """
+        Расширяет ряд так, чтобы в него попадал день, и возвращает его смещение;
+        None, если ряд стал бы длиннее MAX_DENSE_DAYS.
+        """
+        if self.base is None:
+            self.base = ordinal
+            self.days = array("q", bytes(8 * INITIAL_DAYS))
+        offset = ordinal - self.base
+        size = len(self.days)
+        if offset < 0:
+            if size - offset > MAX_DENSE_DAYS:
+                return None
+            # День раньше начала ряда: сдвигаем начало с запасом
+            shift = max(-offset, min(size, MAX_DENSE_DAYS - size))
+            self.days = array("q", bytes(8 * shift)) + self.days
+            self.base -= shift
+            self._tree = None
+            offset += shift
+        elif offset >= size:
+            if offset >= MAX_DENSE_DAYS:
+                return None
+            grow = min(max(offset + 1, 2 * size), MAX_DENSE_DAYS) - size
+            self.days.extend(array("q", bytes(8 * grow)))
+            self._tree = None
+        return offset
+
+    def _add_sparse(self, ordinal: int, kopecks: int) -> None:
+        amount = self.sparse.get(ordinal, 0) + kopecks
+        if amount:
+            self.sparse[ordinal] = amount
+        else:
+            self.sparse.pop(ordinal, None)
+        self._sparse_sums = None
+
+    def _anchor(self, ordinals) -> None:
+        """Начинает пустой ряд так, чтобы в плотную часть попало больше всего дней пачки."""
+        ordered = sorted(ordinals)
+        first, best, low = ordered[0], 0, 0
+        for high, ordinal in enumerate(ordered):
+            while ordinal - ordered[low] >= MAX_DENSE_DAYS:
+                low += 1
+            if high - low + 1 > best:
+                first, best = ordered[low], high - low + 1
+        self._fit(first)
+
+    def add(self, ordinal: int, kopecks: int) -> None:
+        """Прибавляет сумму к дню (отрицательная сумма - удаление)."""
+        offset = self._fit(ordinal)
+        if offset is None:
+            self._add_sparse(ordinal, kopecks)
+            return
+        self.days[offset] += kopecks
+        tree = self._tree
+        if tree is not None:
+            i = offset + 1
+            size = len(tree)
+            while i < size:
+                tree[i] += kopecks
+                i += i & -i
+
+    def add_days(self, amounts) -> None:
+        """Пакетно прибавляет суммы {порядковый номер дня: сумма}; дерево перестроится при запросе."""
+        if not amounts:
+            return
+        if self.base is None:
+            self._anchor(amounts)
+        for ordinal, kopecks in amounts.items():
+            offset = ordinal - self.base
+            if not 0 <= offset < len(self.days):
+                offset = self._fit(ordinal)
+                if offset is None:
+                    self._add_sparse(ordinal, kopecks)
+                    continue
+            self.days[offset] += kopecks
+        self._tree = None
+
+    def _build(self):
+        tree = array("q", bytes(8)) + self.days
+        size = len(tree)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        return tree
+
+    def prefix(self, ordinal: int) -> int:
+        """Сумма по всем дням до ordinal включительно."""
+        total = self._sparse_prefix(ordinal) if self.sparse else 0
+        if self.base is None or ordinal < self.base:
+            return total
+        tree = self._tree if self._tree is not None else self._build()
+        i = min(ordinal - self.base + 1, len(tree) - 1)
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _sparse_prefix(self, ordinal: int) -> int:
+        if self._sparse_sums is None:
+            ordinals = sorted(self.sparse)
+            self._sparse_sums = ordinals, list(accumulate(self.sparse[day] for day in ordinals))
+        ordinals, sums = self._sparse_sums
+        position = bisect_right(ordinals, ordinal)
+        return sums[position - 1] if position else 0
+
+    def between(self, start: int, end: int) -> int:
+        """Сумма по дням из [start, end]."""
+        if end < start:
+            return 0
+        return self.prefix(end) - self.prefix(start - 1)
+
+    def day(self, ordinal: int) -> int:
+        """Сумма за один день."""
+        if self.base is not None and 0 <= ordinal - self.base < len(self.days):
+            return self.days[ordinal - self.base]
+        return self.sparse.get(ordinal, 0)
+
+
+class LedgerTimeSeries:
+    """
+    Временные ряды по транзакциям: суммы по дням для каждого типа и для
+    каждой пары (тип, категория); ключи - коды таблиц TYPES и CATEGORIES. Отвечают на запросы баланса на дату и
+    сумм за период за O(log n).
+    """
+    def __init__(self):
+        self.by_type = {}  # код типа -> DailySeries
+        self.by_category = {}  # (код типа, код категории) -> DailySeries
+
+    @staticmethod
+    def _series(table, key) -> DailySeries:
+        series = table.get(key)
+        if series is None:
+            series = table[key] = DailySeries()
+        return series
+
+    def add(self, kopecks, category_code, ordinal, type_code, sign=1) -> None:
+        """
+        Учитывает одну транзакцию, заданную значениями полей (сумма в копейках,
+        коды категории и типа).
+        :param sign: 1 для добавления, -1 для удаления.
+        """
+        self._series(self.by_type, type_code).add(ordinal, sign * kopecks)
+        self._series(self.by_category, (type_code, category_code)).add(ordinal, sign * kopecks)
+
+    def add_many(self, transactions) -> None:
+        """Учитывает пачку транзакций: суммы сначала собираются по дням."""
+        by_type, by_category = {}, {}
+        for t in transactions:
+            for table, key in ((by_type, t.type_code), (by_category, (t.type_code, t.category_code))):
+                days = table.get(key)
+                if days is None:
+                    days = table[key] = {}
+                days[t.ordinal] = days.get(t.ordinal, 0) + t.kopecks
+        for target, source in ((self.by_type, by_type), (self.by_category, by_category)):
+            for key, days in source.items():
+                self._series(target, key).add_days(days)
+
+    def add_transaction(self, transaction) -> None:
+        """Учитывает транзакцию."""
+        self.add(transaction.kopecks, transaction.category_code, transaction.ordinal, transaction.type_code)
+
+    def remove_transaction(self, transaction) -> None:
+        """Исключает ранее учтенную транзакцию."""
+        self.add(transaction.kopecks, transaction.category_code, transaction.ordinal, transaction.type_code, -1)
+
+    def total_between(self, transaction_type, start: int, end: int, category=None) -> float:
+        """Сумма транзакций типа (и категории, если указана) за дни [start, end]."""
+        code = TYPES.get(transaction_type)
+        if category is None:
+            series = self.by_type.get(code)
+        else:
+            series = self.by_category.get((code, CATEGORIES.get(category)))
+        return to_rubles(series.between(start, end)) if series is not None else 0.0
+
+    def _prefix(self, transaction_type, ordinal: int) -> int:
+        series = self.by_type.get(TYPES.get(transaction_type))
+        return series.prefix(ordinal) if series is not None else 0
+
+    def _balance_kopecks(self, ordinal: int) -> int:
+        return self._prefix("income", ordinal) - self._prefix("expense", ordinal)
+
+    def balance_as_of(self, ordinal: int) -> float:
+        """Баланс (доходы минус расходы) по всем транзакциям до дня ordinal включительно."""
+        return to_rubles(self._balance_kopecks(ordinal))
+
+    def running_balance(self, start: int, end: int):
+        """
+        Список (порядковый номер дня, баланс на конец дня) для дней [start, end].
+        Начальный баланс берется из дерева, дальше к нему прибавляются суммы дней.
+        """
+        balance = self._balance_kopecks(start - 1)
+        income = self.by_type.get(TYPES.get("income")) or DailySeries()
+        expense = self.by_type.get(TYPES.get("expense")) or DailySeries()
+        curve = []
+        for ordinal in range(start, end + 1):
+            balance += income.day(ordinal) - expense.day(ordinal)
+            curve.append((ordinal, to_rubles(balance)))
+        return curve
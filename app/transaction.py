@@ -1,13 +1,139 @@
-from datetime import datetime
+from datetime import date as _date, datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import lru_cache
+from app.labels import CATEGORIES, TYPES
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_date(value: str) -> int:
+    """
+    Преобразует строку ГГГГ-ММ-ДД в порядковый номер даты.
+    Повторяющиеся строки берутся из кэша, строгий ISO-формат разбирается
+    через date.fromisoformat, остальное - через strptime, как раньше.
+    """
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        try:
+            return _date.fromisoformat(value).toordinal()
+        except ValueError:
+            pass
+    return datetime.strptime(value, "%Y-%m-%d").toordinal()
+
+
+MINOR_UNITS = 100  # копеек в рубле
+
+
+def to_kopecks(value) -> int:
+    """
+    Переводит сумму в рублях (int, float или строка) в целое число копеек.
+    Строки разбираются точно, без float, и округляются до копеек половиной
+    вверх (от нуля): "0.125" -> 13. Числа float округляются так же по своей
+    кратчайшей десятичной записи: 1.005 -> 101, как и строка "1.005".
+    """
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+    if isinstance(value, str):
+        return _parse_kopecks(value)
+    return _parse_kopecks(repr(float(value)))
+
+
+def _parse_kopecks(text: str) -> int:
+    """
+    Точно переводит строку с суммой в копейки. Обычная запись (цифры и не
+    больше двух знаков после точки) считается целыми числами, остальное
+    (больше знаков, экспонента) - через Decimal.
+    """
+    text = text.strip()
+    sign, body = (-1, text[1:]) if text[:1] == "-" else (1, text[1:] if text[:1] == "+" else text)
+    whole, _, fraction = body.partition(".")
+    if whole.isdecimal() and len(fraction) <= 2 and (not fraction or fraction.isdecimal()):
+        return sign * (int(whole) * MINOR_UNITS + int(fraction.ljust(2, "0")))
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"некорректная сумма: {text!r}") from None
+    if not amount.is_finite():
+        raise ValueError(f"некорректная сумма: {text!r}")
+    return int((amount * MINOR_UNITS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def to_rubles(kopecks: int) -> float:
+    """Сумма в рублях для копеек."""
+    return kopecks / MINOR_UNITS
+
+
+def format_amount(kopecks: int) -> str:
+    """
+    Сумма для записи в CSV: кратчайшая запись вида 100.0 или 12.35,
+    совпадающая с прежним форматом float.
+    """
+    return repr(kopecks / MINOR_UNITS)
+
+
+def format_money(kopecks: int) -> str:
+    """Сумма с двумя знаками после точки, сформированная без float."""
+    sign = "-" if kopecks < 0 else ""
+    rubles, rest = divmod(abs(kopecks), MINOR_UNITS)
+    return f"{sign}{rubles}.{rest:02d}"
+
+
+@lru_cache(maxsize=1 << 16)
+def datetime_from_ordinal(ordinal: int) -> datetime:
+    """Возвращает общий для всех транзакций объект datetime для даты."""
+    return datetime.fromordinal(ordinal)
 
 
 class Transaction:
-    """Класс представляющий транзакцию"""
+    """
+    Класс представляющий транзакцию.
+    Сумма хранится в целых копейках, дата - как порядковый номер, категория
+    и тип - как коды общих таблиц CATEGORIES и TYPES. Хэш вычисляется один
+    раз, поэтому транзакцию не следует изменять после создания.
+    """
+    __slots__ = ("kopecks", "category_code", "ordinal", "type_code", "_hash")
+
     def __init__(self, amount, category, date, transaction_type):
-        self.amount = float(amount)
-        self.category = category
-        self.date = datetime.strptime(date, "%Y-%m-%d")
-        self.type = transaction_type
+        self.kopecks = to_kopecks(amount)
+        self.category_code = CATEGORIES.encode(category)
+        if isinstance(date, str):
+            self.ordinal = parse_date(date)
+        else:
+            self.ordinal = date.toordinal()
+        self.type_code = TYPES.encode(transaction_type)
+        self._hash = None
+
+    @classmethod
+    def from_codes(cls, kopecks, category_code, ordinal, type_code):
+        """Создает транзакцию из копеек, кодов и порядкового номера даты без проверок."""
+        transaction = cls.__new__(cls)
+        transaction.kopecks = kopecks
+        transaction.category_code = category_code
+        transaction.ordinal = ordinal
+        transaction.type_code = type_code
+        transaction._hash = None
+        return transaction
+
+    @classmethod
+    def from_ordinal(cls, kopecks, category, ordinal, transaction_type):
+        """Создает транзакцию из уже разобранных значений (сумма в копейках) без проверок."""
+        return cls.from_codes(kopecks, CATEGORIES.encode(category), ordinal, TYPES.encode(transaction_type))
+
+    @property
+    def category(self) -> str:
+        return CATEGORIES.names[self.category_code]
+
+    @property
+    def type(self) -> str:
+        return TYPES.names[self.type_code]
+
+    @property
+    def amount(self) -> float:
+        """Сумма в рублях."""
+        return self.kopecks / MINOR_UNITS
+
+    @property
+    def date(self) -> datetime:
+        """Дата транзакции."""
+        return datetime_from_ordinal(self.ordinal)
 
     def __str__(self):
         """Строковое представление транзакции."""
@@ -18,14 +144,20 @@ class Transaction:
         if not isinstance(other, Transaction):
             return False
         return (
-            self.amount == other.amount
-            and self.category == other.category
-            and self.date == other.date
-            and self.type == other.type
+            self.kopecks == other.kopecks
+            and self.category_code == other.category_code
+            and self.ordinal == other.ordinal
+            and self.type_code == other.type_code
         )
 
     def __hash__(self):
         """
         Возвращает хэш транзакции для использования в множествах и словарях.
         """
-        return hash((self.amount, self.category, self.date, self.type))
+        if self._hash is None:
+            self._hash = hash((self.kopecks, self.category_code, self.ordinal, self.type_code))
+        return self._hash
+
+    def __reduce__(self):
+        # Коды действительны только в своем процессе, поэтому передаются строки
+        return Transaction.from_ordinal, (self.kopecks, self.category, self.ordinal, self.type)
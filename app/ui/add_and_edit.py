@@ -1,16 +1,23 @@
 from app.finance_traker import FinanceTracker
 from app.transaction import Transaction
 from prompt_toolkit import prompt
-from app.validation import AmountValidator, DateValidator, type_completer
-from app.ui import common
+from app.validation import AmountValidator, DateValidator, category_completer, type_completer
+from app.ui import common, pager
+from app.instrumentation import instrumented
+from app.streaming import is_csv_name
 
 
+@instrumented("ui.add_transaction")
 def add_transaction_ui(tracker: FinanceTracker) -> None:
     """Функция для добавления транзакции (взаимодействие с пользователем)."""
     common.display_header("Добавление транзакции")
     try:
         amount = prompt(("Введите сумму: "), validator=AmountValidator())
-        category = prompt("Введите категорию: ").strip()
+        category = prompt(
+            "Введите категорию: ",
+            completer=category_completer,
+            complete_while_typing=True
+        ).strip()
         if not category:
             print("❌ Ошибка: Категория не может быть пустой.")
             return
@@ -35,6 +42,7 @@ def add_transaction_ui(tracker: FinanceTracker) -> None:
         print(f"❌ Неожиданная ошибка: {e}")
 
 
+@instrumented("ui.edit_transaction")
 def edit_transaction_ui(tracker: FinanceTracker) -> None:
     """Интерфейс для редактирования транзакции."""
     common.display_header("Редактирование транзакции")
@@ -43,17 +51,17 @@ def edit_transaction_ui(tracker: FinanceTracker) -> None:
             print("Нет транзакций для редактирования.")
             return
 
-        print("\nСписок транзакций:")
-        for i, t in enumerate(tracker.transactions, 1):
-            print(f"{i}. {t}")
-
-        index = int(prompt("\nВведите индекс транзакции для редактирования: "))
-        if not (1 <= index <= len(tracker.transactions)):
-            print("❌ Неверный индекс транзакции.")
+        index = pager.choose_transaction(tracker, "редактирования")
+        if index is None:
+            print("⏹ Отменено пользователем.")
             return
 
-        amount = float(prompt("Введите новую сумму: ", validator=AmountValidator()))
-        category = prompt("Введите новую категорию: ").strip()
+        amount = prompt("Введите новую сумму: ", validator=AmountValidator())
+        category = prompt(
+            "Введите новую категорию: ",
+            completer=category_completer,
+            complete_while_typing=True
+        ).strip()
         if not category:
             print("❌ Ошибка: категория не может быть пустой.")
             return
@@ -72,7 +80,7 @@ def edit_transaction_ui(tracker: FinanceTracker) -> None:
         if not filename:
             print("❌ Ошибка: Имя файла не может быть пустым.")
             return
-        elif not filename.endswith(".csv"):
+        elif not is_csv_name(filename):
             filename += ".csv"
 
         new_transaction = Transaction(amount, category, date, transaction_type)
@@ -1,8 +1,11 @@
 from app.finance_traker import FinanceTracker
-from app.ui import common
+from app.ui import common, pager
 from prompt_toolkit import prompt
+from app.instrumentation import instrumented
+from app.streaming import is_csv_name
 
 
+@instrumented("ui.delete_transaction")
 def delete_transaction_ui(tracker: FinanceTracker) -> None:
     """Интерфейс для удаления транзакции."""
     common.display_header("Удаление транзакции")
@@ -11,20 +14,16 @@ def delete_transaction_ui(tracker: FinanceTracker) -> None:
             print("Нет транзакций для удаления.")
             return
 
-        print("\nСписок транзакций:")
-        for i, t in enumerate(tracker.transactions, 1):
-            print(f"{i}. {t}")
-
-        index = int(prompt("\nВведите индекс транзакции для удаления: "))
-        if not (1 <= index <= len(tracker.transactions)):
-            print("❌ Неверный индекс транзакции.")
+        index = pager.choose_transaction(tracker, "удаления")
+        if index is None:
+            print("⏹ Отменено пользователем.")
             return
 
         filename = prompt("Введите имя файла для сохранения (например, data.csv): ").strip()
         if not filename:
             print("❌ Ошибка: Имя файла не может быть пустым.")
             return
-        elif not filename.endswith(".csv"):
+        elif not is_csv_name(filename):
             filename += ".csv"
 
         tracker.delete_transaction(index, filename)
@@ -0,0 +1,155 @@
+import sys
+from bisect import bisect_left
+from typing import Optional
+from prompt_toolkit import prompt
+from app.finance_traker import FinanceTracker
+from app.validation import OptionalAmountValidator, OptionalDateValidator, category_completer
+
+PAGE_SIZE = 20
+
+PAGER_HELP = (
+    "Enter/n - следующая страница, p - предыдущая, g N - перейти к транзакции N,\n"
+    "f - фильтр, c - сбросить фильтр, номер - выбрать транзакцию, q - отмена"
+)
+
+
+class TransactionPager:
+    """
+    Постраничный просмотр транзакций трекера.
+    Форматируются только строки текущей страницы, поэтому стоимость вывода
+    не зависит от размера журнала. Номера в списке - индексы транзакций
+    (с 1), которые принимают edit_transaction и delete_transaction.
+    """
+    def __init__(self, tracker: FinanceTracker, page_size: int = PAGE_SIZE):
+        self.tracker = tracker
+        self.page_size = page_size
+        self.page = 0
+        self.positions = None  # позиции (с нуля) после фильтра; None - все транзакции
+        self.filter_description = ""
+
+    def __len__(self):
+        if self.positions is None:
+            return len(self.tracker.transactions)
+        return len(self.positions)
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-len(self) // self.page_size))
+
+    def _position(self, row: int) -> int:
+        return row if self.positions is None else self.positions[row]
+
+    def apply_filter(self, start=None, end=None, category=None, min_amount=None, max_amount=None) -> None:
+        """Оставляет в списке только транзакции, подходящие под фильтр."""
+        self.positions = self.tracker.find_positions(start, end, category, min_amount, max_amount)
+        conditions = [
+            f"{label}{value}" for label, value in (
+                ("с ", start), ("по ", end), ("категория ", category),
+                ("сумма от ", min_amount), ("сумма до ", max_amount))
+            if value is not None
+        ]
+        self.filter_description = ", ".join(conditions)
+        self.page = 0
+
+    def clear_filter(self) -> None:
+        self.positions = None
+        self.filter_description = ""
+        self.page = 0
+
+    def next_page(self) -> None:
+        self.page = min(self.page + 1, self.pages - 1)
+
+    def previous_page(self) -> None:
+        self.page = max(self.page - 1, 0)
+
+    def jump_to(self, index: int) -> bool:
+        """
+        Переходит к странице с транзакцией index (с 1).
+        Возвращает False, если транзакции нет в текущем списке.
+        """
+        position = index - 1
+        if self.positions is None:
+            if not 0 <= position < len(self):
+                return False
+            row = position
+        else:
+            row = bisect_left(self.positions, position)
+            if row == len(self.positions) or self.positions[row] != position:
+                return False
+        self.page = row // self.page_size
+        return True
+
+    def render_page(self) -> str:
+        """Форматирует текущую страницу одной строкой."""
+        total = len(self)
+        first = self.page * self.page_size
+        transactions = self.tracker.transactions
+        lines = [f"Страница {self.page + 1} из {self.pages} (транзакций: {total})"]
+        if self.filter_description:
+            lines.append(f"Фильтр: {self.filter_description}")
+        for row in range(first, min(first + self.page_size, total)):
+            position = self._position(row)
+            lines.append(f"{position + 1}. {transactions[position]}")
+        if total == 0:
+            lines.append("Нет транзакций, подходящих под фильтр.")
+        return "\n".join(lines)
+
+    def show(self, out=None) -> None:
+        """Выводит текущую страницу одной записью в поток."""
+        (out or sys.stdout).write("\n" + self.render_page() + "\n")
+
+
+def _optional(value: str):
+    value = value.strip()
+    return value or None
+
+
+def prompt_filter(pager: TransactionPager) -> None:
+    """Запрашивает условия фильтра; пустой ввод означает отсутствие условия."""
+    start = _optional(prompt("Дата с (ГГГГ-ММ-ДД, Enter - без ограничения): ",
+                             validator=OptionalDateValidator()))
+    end = _optional(prompt("Дата по (ГГГГ-ММ-ДД, Enter - без ограничения): ",
+                           validator=OptionalDateValidator()))
+    category = _optional(prompt("Категория (Enter - любая): ", completer=category_completer))
+    min_amount = _optional(prompt("Сумма от (Enter - без ограничения): ",
+                                  validator=OptionalAmountValidator()))
+    max_amount = _optional(prompt("Сумма до (Enter - без ограничения): ",
+                                  validator=OptionalAmountValidator()))
+    pager.apply_filter(start, end, category, min_amount, max_amount)  # суммы - строками, см. to_kopecks
+
+
+def choose_transaction(tracker: FinanceTracker, action: str) -> Optional[int]:
+    """
+    Показывает транзакции постранично и возвращает выбранный индекс (с 1)
+    или None, если пользователь отменил выбор.
+    :param action: Действие для подсказки, например "редактирования".
+    """
+    pager = TransactionPager(tracker)
+    print(PAGER_HELP)
+    pager.show()
+    while True:
+        command = prompt(f"\nВведите индекс транзакции для {action} или команду: ").strip().lower()
+        if command in ("", "n"):
+            pager.next_page()
+        elif command == "p":
+            pager.previous_page()
+        elif command == "q":
+            return None
+        elif command == "f":
+            prompt_filter(pager)
+        elif command == "c":
+            pager.clear_filter()
+        elif command.startswith("g") and command[1:].strip().isdigit():
+            if not pager.jump_to(int(command[1:])):
+                print("❌ Транзакции с таким индексом нет в списке.")
+                continue
+        elif command.isdigit():
+            index = int(command)
+            if not (1 <= index <= len(tracker.transactions)):
+                print("❌ Неверный индекс транзакции.")
+                continue
+            return index
+        else:
+            print(PAGER_HELP)
+            continue
+        pager.show()
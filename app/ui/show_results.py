@@ -1,16 +1,22 @@
+from app import reports
 from app.ui import common
 from datetime import datetime
 from prompt_toolkit import prompt
 from app.finance_traker import FinanceTracker
+from app.instrumentation import instrumented
+from app.transaction import format_money
 
 
+@instrumented("ui.show_balance")
 def show_balance_ui(tracker: FinanceTracker):
     """Функция для показа текущего баланса."""
     common.display_header("Текущий баланс")
-    balance = tracker.get_balance()
-    print(f"\n💵 Ваш текущий баланс: {balance:.2f} руб.")
+    totals = tracker.totals
+    balance = totals.total_kopecks("income") - totals.total_kopecks("expense")
+    print(f"\n💵 Ваш текущий баланс: {format_money(balance)} руб.")
 
 
+@instrumented("ui.show_monthly_report")
 def show_monthly_report_ui(tracker: FinanceTracker) -> None:
     """Функция для показа отчета за месяц."""
     common.display_header("Отчет за месяц")
@@ -29,15 +35,15 @@ def show_monthly_report_ui(tracker: FinanceTracker) -> None:
             print(f"{'Дата':<12} | {'Тип':<8} | {'Категория':<20} | {'Сумма':>10}")
             print("-" * 70)
             for t in report:
-                print(f"{t.date} | {t.type:<8} | {t.category:<20} | {t.amount:>10.2f} руб.")
+                print(f"{t.date} | {t.type:<8} | {t.category:<20} | {format_money(t.kopecks):>10} руб.")
             print("-" * 70)
 
             # Вывод итогов
-            income = sum(t.amount for t in report if t.type == "income")
-            expense = sum(t.amount for t in report if t.type == "expense")
-            print(f"\nИтого доходов: {income:.2f} руб.")
-            print(f"Итого расходов: {expense:.2f} руб.")
-            print(f"Баланс за период: {(income - expense):.2f} руб.")
+            income = tracker.totals.month_total_kopecks("income", month, year)
+            expense = tracker.totals.month_total_kopecks("expense", month, year)
+            print(f"\nИтого доходов: {format_money(income)} руб.")
+            print(f"Итого расходов: {format_money(expense)} руб.")
+            print(f"Баланс за период: {format_money(income - expense)} руб.")
         else:
             print("Нет транзакций за указанный период.")
     except ValueError:
@@ -46,6 +52,60 @@ def show_monthly_report_ui(tracker: FinanceTracker) -> None:
         print(f"❌ Неожиданная ошибка: {e}")
 
 
+@instrumented("ui.show_period_report")
+def show_period_report_ui(tracker: FinanceTracker) -> None:
+    """Функция для показа отчета за квартал или год с динамикой по месяцам."""
+    common.display_header("Отчет за квартал или год")
+    try:
+        current_year = datetime.now().year
+        period = prompt("Период: 1 - квартал, 2 - год (по умолчанию 2): ").strip() or "2"
+        year = int(prompt(f"Введите год (по умолчанию {current_year}): ") or current_year)
+        if period == "1":
+            quarter = int(prompt("Введите квартал (1-4): "))
+            if not 1 <= quarter <= 4:
+                print("❌ Ошибка: Квартал должен быть от 1 до 4.")
+                return
+            start, end = reports.quarter_range(year, quarter)
+            title = f"{quarter} квартал {year}"
+        elif period == "2":
+            start, end = reports.year_range(year)
+            title = f"{year} год"
+        else:
+            print("❌ Неверный выбор периода.")
+            return
+
+        grid = tracker.get_report(start, end)
+        if not grid.cells:
+            print("Нет транзакций за указанный период.")
+            return
+
+        lines = [
+            f"\n📊 Отчет: {title}",
+            "-" * 70,
+            f"{'Месяц':<8} | {'Доходы':>12} | {'Расходы':>12} | {'Баланс':>12} | {'Расходы, м/м':>12}",
+            "-" * 70,
+        ]
+        for (row_year, month, income, expense, balance), (*_, delta, percent) in zip(
+                grid.rows(), grid.month_over_month("expense")):
+            change = "-" if delta is None else f"{percent:+.1f}%" if percent is not None else f"{delta:+.2f}"
+            lines.append(
+                f"{month:02d}/{row_year} | {income:>12.2f} | {expense:>12.2f} | {balance:>12.2f} | {change:>12}")
+        lines.append("-" * 70)
+
+        expenses = grid.category_totals("expense")
+        if expenses:
+            lines.append("\nРасходы по категориям:")
+            for category, total in expenses.items():
+                by_month = " ".join(f"{value:>9.2f}" for value in grid.category_series(category))
+                lines.append(f"{category:<20} {total:>12.2f} руб. | {by_month}")
+        print("\n".join(lines))
+    except ValueError:
+        print("❌ Ошибка: Введите корректные числовые значения.")
+    except Exception as e:
+        print(f"❌ Неожиданная ошибка: {e}")
+
+
+@instrumented("ui.plot_spending")
 def plot_spending_ui(tracker: FinanceTracker) -> None:
     """Функция для визуализации расходов по категориям."""
     common.display_header("Анализ расходов")
@@ -54,3 +114,25 @@ def plot_spending_ui(tracker: FinanceTracker) -> None:
         print("\n📈 График успешно построен!")
     except Exception as e:
         print(f"❌ Ошибка при построении графика: {e}")
+
+
+@instrumented("ui.render_charts")
+def render_charts_ui(tracker: FinanceTracker, renderer) -> None:
+    """Функция для сохранения графиков в файлы в фоновом режиме."""
+    common.display_header("Сохранение графиков")
+    previous = renderer.last
+    if previous is not None:
+        if not previous.done():
+            print("⏳ Предыдущие графики еще сохраняются, попробуйте позже.")
+            return
+        try:
+            paths, cached = previous.result()
+            status = "без изменений" if cached else "обновлены"
+            print(f"Предыдущие графики ({status}):")
+            for path in paths:
+                print(f"  {path}")
+        except Exception as e:
+            print(f"❌ Ошибка при сохранении предыдущих графиков: {e}")
+
+    renderer.submit(tracker)
+    print("\n⏳ Графики сохраняются в фоне в папку files/charts. Можно продолжать работу.")
@@ -4,15 +4,20 @@ from app.finance_traker import FinanceTracker, ensure_files_directory_exists
 from prompt_toolkit import prompt
 from app.ui import common
 from typing import Optional
+from app.instrumentation import instrumented
+from app.streaming import is_csv_name
 
 
+@instrumented("ui.export_to_csv")
 def export_to_csv_ui(tracker: FinanceTracker):
     """Функция для экспорта данных в CSV."""
     common.display_header("Экспорт данных")
     try:
         default_filename = f"transactions_{datetime.now().strftime('%-Y%m-%d')}.csv"
-        filename = prompt(f"Введите имя файла (по умолчанию {default_filename}): ").strip() or default_filename
-        if not filename.endswith(".csv"):
+        filename = prompt(
+            f"Введите имя файла (.csv, .csv.gz, .csv.bz2 или .csv.xz; по умолчанию {default_filename}): "
+        ).strip() or default_filename
+        if not is_csv_name(filename):
             filename += ".csv"
         filepath = os.path.join("files", filename)
         if os.path.exists(filepath):
@@ -30,9 +35,12 @@ def export_to_csv_ui(tracker: FinanceTracker):
 
 
 def select_csv_file() -> Optional[str]:
-    """Показывает список CSV-файлов в директории files и позволяет выбрать один."""
+    """
+    Показывает список CSV-файлов в директории files (включая сжатые
+    .csv.gz, .csv.bz2, .csv.xz) и позволяет выбрать один.
+    """
     ensure_files_directory_exists()
-    csv_files = [f for f in os.listdir("files") if f.endswith(".csv")]
+    csv_files = [f for f in os.listdir("files") if is_csv_name(f)]
 
     if not csv_files:
         print("CSV-файлы не найдены. Начните с пустого списка.")
@@ -53,3 +61,43 @@ def select_csv_file() -> Optional[str]:
             elif choice_num == len(csv_files) + 1:
                 return None
         print("❌ Неверный выбор. Попробуйте снова.")
+
+
+@instrumented("ui.import_csv_files")
+def import_csv_files_ui(tracker: FinanceTracker) -> None:
+    """Функция для параллельного импорта нескольких CSV-файлов."""
+    common.display_header("Импорт нескольких файлов")
+    try:
+        ensure_files_directory_exists()
+        csv_files = sorted(f for f in os.listdir("files") if is_csv_name(f))
+        if not csv_files:
+            print("CSV-файлы не найдены.")
+            return
+
+        print("\nДоступные CSV-файлы:")
+        for i, filename in enumerate(csv_files, 1):
+            print(f"{i}. {filename}")
+        choice = prompt("\nВведите номера файлов через запятую (Enter - все): ").strip()
+        if choice:
+            numbers = [int(part) for part in choice.split(",") if part.strip()]
+            if not all(1 <= n <= len(csv_files) for n in numbers):
+                print("❌ Неверный номер файла.")
+                return
+            selected = [csv_files[n - 1] for n in numbers]
+        else:
+            selected = csv_files
+
+        # Строки, которые уже есть в трекере (пересекающиеся выписки), пропускаются
+        stats = tracker.import_csv_files(selected, skip_known=True)
+        print(f"\n{'Файл':<30} | {'Строк':>10} | {'Повторов':>8} | {'Частей':>6} | {'Время, с':>9}")
+        print("-" * 75)
+        for item in stats:
+            print(f"{os.path.basename(item.path):<30} | {item.rows:>10} | {item.skipped:>8} | "
+                  f"{item.chunks:>6} | {item.seconds:>9.3f}")
+        print(f"\n✅ Импортировано транзакций: {sum(item.rows - item.skipped for item in stats)}")
+    except ValueError:
+        print("❌ Ошибка: Введите номера файлов числами.")
+    except KeyboardInterrupt:
+        print("\n⏹ Отменено пользователем.")
+    except Exception as e:
+        print(f"❌ Неожиданная ошибка: {e}")
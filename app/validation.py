@@ -1,13 +1,15 @@
 from datetime import datetime
 from prompt_toolkit.validation import Validator, ValidationError
 from prompt_toolkit.completion import WordCompleter
+from app.labels import CATEGORIES
+from app.transaction import to_kopecks
 
 
 class AmountValidator(Validator):
     """Валидатор для чисел."""
     def validate(self, document):
         try:
-            float(document.text)
+            to_kopecks(document.text)  # так же, как сумма будет разобрана
         except ValueError:
             raise ValidationError(message="Сумма должна быть числом (например: 100 или 50.5)")
 
@@ -22,3 +24,19 @@ class DateValidator(Validator):
 
 
 type_completer = WordCompleter(["income", "expense"], ignore_case=True)
+# Подсказки категорий берутся из общей таблицы категорий при каждом вводе
+category_completer = WordCompleter(lambda: CATEGORIES.names, ignore_case=True)
+
+
+class OptionalDateValidator(DateValidator):
+    """Проверка даты, допускающая пустой ввод."""
+    def validate(self, document):
+        if document.text.strip():
+            super().validate(document)
+
+
+class OptionalAmountValidator(AmountValidator):
+    """Проверка суммы, допускающая пустой ввод."""
+    def validate(self, document):
+        if document.text.strip():
+            super().validate(document)
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# matplotlib импортируется внутри функций: модуль загружается долго.
+
+CHARTS_DIR = os.path.join("files", "charts")
+
+
+def plot_spending_pie(categories: dict) -> None:
+    """Показывает круговую диаграмму расходов по категориям."""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(8, 8))
+    plt.pie(categories.values(), labels=categories.keys(), autopct="%1.1f%%", startangle=140)
+    plt.title("Распределение расходов по категориям")
+    plt.show()
+
+
+def charts_key(categories: dict, months) -> str:
+    """Хэш содержимого данных для графиков: одинаковые данные - те же файлы."""
+    payload = json.dumps(
+        {"categories": sorted(categories.items()), "months": [list(m) for m in months]},
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _pie_chart(figure, categories, months):
+    axes = figure.subplots()
+    axes.pie(list(categories.values()), labels=list(categories.keys()), autopct="%1.1f%%", startangle=140)
+    axes.set_title("Распределение расходов по категориям")
+
+
+def _monthly_bars(figure, categories, months):
+    axes = figure.subplots()
+    labels = [f"{month:02d}.{year}" for year, month, _, _ in months]
+    positions = range(len(months))
+    axes.bar([p - 0.2 for p in positions], [m[2] for m in months], width=0.4, label="Доходы")
+    axes.bar([p + 0.2 for p in positions], [m[3] for m in months], width=0.4, label="Расходы")
+    axes.set_xticks(list(positions), labels, rotation=45)
+    axes.set_title("Доходы и расходы по месяцам")
+    axes.legend()
+
+
+def _balance_line(figure, categories, months):
+    axes = figure.subplots()
+    balance, points = 0.0, []
+    for _, _, income, expense in months:
+        balance += income - expense
+        points.append(balance)
+    axes.plot([f"{month:02d}.{year}" for year, month, _, _ in months], points, marker="o")
+    axes.tick_params(axis="x", rotation=45)
+    axes.set_title("Баланс на конец месяца")
+
+
+CHARTS = {"pie": _pie_chart, "monthly": _monthly_bars, "balance": _balance_line}
+
+
+def render_charts(categories: dict, months, out_dir: str = CHARTS_DIR, formats=("png",)):
+    """
+    Сохраняет графики в файлы без оконного интерфейса (Agg).
+    :param categories: Суммы расходов по категориям.
+    :param months: Список (год, месяц, доходы, расходы).
+    :return: (пути к файлам, True если файлы взяты из кэша).
+    Имена файлов содержат хэш данных, поэтому при неизменных данных
+    отрисовка пропускается. Графики без данных (круговая диаграмма без
+    расходов, помесячные графики без транзакций) не рисуются и в кэше
+    не проверяются.
+    """
+    key = charts_key(categories, months)
+    names = [name for name in CHARTS if (categories if name == "pie" else months)]
+    paths = [
+        os.path.join(out_dir, f"{key}_{name}.{fmt}")
+        for name in names for fmt in formats
+    ]
+    if not paths:
+        return [], False
+    if all(os.path.exists(path) for path in paths):
+        return paths, True
+
+    from matplotlib.figure import Figure
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name in names:
+        figure = Figure(figsize=(8, 8) if name == "pie" else (10, 6), layout="tight")
+        CHARTS[name](figure, categories, months)
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{key}_{name}.{fmt}")
+            temp_path = f"{path}.tmp.{fmt}"
+            figure.savefig(temp_path, format=fmt)
+            os.replace(temp_path, path)
+    return paths, False
+
+
+class ChartRenderer:
+    """
+    Рисует графики в фоновом потоке, чтобы меню не ждало matplotlib.
+    Данные снимаются с трекера в вызывающем потоке, поэтому дальнейшие
+    изменения транзакций не влияют на уже запущенную отрисовку.
+    """
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="charts")
+        self.last = None
+
+    def submit(self, tracker, out_dir: str = CHARTS_DIR, formats=("png",)):
+        """Запускает отрисовку и возвращает Future с результатом render_charts."""
+        categories = dict(tracker.get_expenses_by_category())
+        months = tracker.get_monthly_series()
+        self.last = self._executor.submit(render_charts, categories, months, out_dir, formats)
+        return self.last
+
+    def shutdown(self) -> None:
+        """Дожидается текущей отрисовки и останавливает поток."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,152 @@
+"""
+Замеры производительности FinanceTracker на синтетических журналах.
+
+Запуск: python -m benchmarks.bench_tracker [--sizes 10000 100000 1000000]
+        [--output results.json] [--compare previous.json]
+
+Для каждой операции записываются время, пропускная способность и пиковая
+память (tracemalloc; замер памяти выполняется отдельным прогоном, чтобы
+не искажать время).
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from app.finance_traker import FinanceTracker
+from benchmarks.ledger import generate_transactions, write_ledger_csv
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+REPEATS = 100  # повторов для быстрых операций
+
+
+def _operations(rows: int):
+    """
+    Операции замера: (имя, подготовка, действие, число обработанных строк).
+    Подготовка возвращает трекер, с которым выполняется действие.
+    """
+    def loaded():
+        tracker = FinanceTracker()
+        tracker.load_from_csv("ledger.csv", use_snapshot=False)
+        return tracker
+
+    def with_new_rows():
+        tracker = loaded()
+        tracker.export_to_csv("append.csv")
+        for t in generate_transactions(max(rows // 100, 1), seed=1):
+            tracker.add_transaction(t)
+        return tracker
+
+    def edit(tracker):
+        for i in range(REPEATS):
+            tracker.edit_transaction(i + 1, tracker.transactions[-i - 1], "ledger.csv")
+
+    def delete(tracker):
+        for _ in range(REPEATS):
+            tracker.delete_transaction(1, "ledger.csv")
+
+    def repeat(action):
+        def run(tracker):
+            for _ in range(REPEATS):
+                action(tracker)
+        return run
+
+    return [
+        ("load_from_csv", FinanceTracker, lambda t: t.load_from_csv("ledger.csv", use_snapshot=False), rows),
+        ("load_snapshot", FinanceTracker, lambda t: t.load_from_csv("ledger.csv"), rows),
+        ("export_to_csv_w", loaded, lambda t: t.export_to_csv("export.csv"), rows),
+        ("export_to_csv_a", with_new_rows, lambda t: t.export_to_csv("append.csv", mode="a"), max(rows // 100, 1)),
+        ("get_balance", loaded, repeat(lambda t: t.get_balance()), REPEATS),
+        ("get_monthly_report", loaded, repeat(lambda t: t.get_monthly_report(6, 2021)), REPEATS),
+        ("edit_transaction", loaded, edit, REPEATS),
+        ("delete_transaction", loaded, delete, REPEATS),
+    ]
+
+
+def run_size(rows: int, measure_memory: bool = True):
+    """Выполняет все операции на журнале из rows строк во временной папке."""
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            os.makedirs("files")
+            write_ledger_csv(os.path.join("files", "ledger.csv"), rows)
+            with redirect_stdout(io.StringIO()):
+                FinanceTracker().load_from_csv("ledger.csv")  # создаем снимок
+            for name, prepare, action, processed in _operations(rows):
+                with redirect_stdout(io.StringIO()):
+                    tracker = prepare()
+                    began = time.perf_counter()
+                    action(tracker)
+                    seconds = time.perf_counter() - began
+                    tracker.close()
+
+                    peak = None
+                    if measure_memory:
+                        tracker = prepare()
+                        tracemalloc.start()
+                        action(tracker)
+                        peak = tracemalloc.get_traced_memory()[1]
+                        tracemalloc.stop()
+                        tracker.close()
+                results.append({
+                    "operation": name,
+                    "rows": rows,
+                    "processed": processed,
+                    "seconds": seconds,
+                    "per_second": processed / seconds if seconds else None,
+                    "peak_bytes": peak,
+                })
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def compare(current, previous):
+    """Печатает изменение времени относительно предыдущего прогона."""
+    old = {(r["operation"], r["rows"]): r["seconds"] for r in previous["results"]}
+    for r in current["results"]:
+        before = old.get((r["operation"], r["rows"]))
+        if before:
+            change = (r["seconds"] - before) / before * 100
+            print(f"{r['operation']:<20} {r['rows']:>9} {change:+7.1f}%")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры производительности FinanceTracker.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--no-memory", action="store_true", help="Не замерять пиковую память")
+    parser.add_argument("--output", help="Файл для результатов в формате JSON")
+    parser.add_argument("--compare", help="JSON предыдущего прогона для сравнения")
+    args = parser.parse_args(argv)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [],
+    }
+    print(f"{'Операция':<20} {'Строк':>9} {'Время, с':>9} {'В секунду':>12} {'Пик, МБ':>8}")
+    for rows in args.sizes:
+        for r in run_size(rows, not args.no_memory):
+            report["results"].append(r)
+            peak = f"{r['peak_bytes'] / 2**20:8.1f}" if r["peak_bytes"] is not None else f"{'-':>8}"
+            print(f"{r['operation']:<20} {rows:>9} {r['seconds']:>9.4f} {r['per_second']:>12.0f} {peak}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            print("\nИзменение времени относительно", args.compare)
+            compare(report, json.load(file))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Сравнение сжатых CSV (.csv.gz, .csv.bz2, .csv.xz) с обычным CSV:
+размер файла, скорость записи и чтения.
+
+Запуск: python -m benchmarks.compression [--rows 100000] [--output compression.json]
+
+Запись - потоковая запись всех строк через open_csv, чтение - разбор
+пачками через iter_transaction_batches (как при load_from_csv без снимка).
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from app.streaming import CSV_HEADER, CSV_SUFFIXES, iter_transaction_batches, open_csv, transaction_to_row
+from benchmarks.ledger import generate_transactions
+
+DEFAULT_ROWS = 100_000
+
+
+def measure(rows: int = DEFAULT_ROWS, suffixes=CSV_SUFFIXES):
+    """Возвращает для каждого формата размер файла, время записи и чтения."""
+    lines = [transaction_to_row(t) for t in generate_transactions(rows)]
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for suffix in suffixes:
+            path = os.path.join(directory, "ledger" + suffix)
+            started = time.perf_counter()
+            with open_csv(path, "w") as file:
+                writer = csv.writer(file)
+                writer.writerow(CSV_HEADER)
+                writer.writerows(lines)
+            write_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            read_rows = sum(len(batch) for batch in iter_transaction_batches(path))
+            read_seconds = time.perf_counter() - started
+            results.append({
+                "format": suffix,
+                "rows": read_rows,
+                "bytes": os.path.getsize(path),
+                "write_seconds": write_seconds,
+                "read_seconds": read_seconds,
+                "write_per_second": rows / write_seconds if write_seconds else None,
+                "read_per_second": read_rows / read_seconds if read_seconds else None,
+            })
+    plain = results[0]["bytes"] if results and results[0]["format"] == ".csv" else None
+    for r in results:
+        r["ratio"] = r["bytes"] / plain if plain else None
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Сравнение сжатых и обычных CSV-журналов.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--output", help="Файл для результатов в формате JSON")
+    args = parser.parse_args(argv)
+
+    results = measure(args.rows)
+    print(f"{'Формат':<9} {'Размер, МБ':>10} {'Доля':>6} {'Запись/с':>10} {'Чтение/с':>10}")
+    for r in results:
+        print(f"{r['format']:<9} {r['bytes'] / 2**20:>10.2f} {r['ratio']:>6.2f} "
+              f"{r['write_per_second']:>10.0f} {r['read_per_second']:>10.0f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(),
+                       "results": results}, file, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
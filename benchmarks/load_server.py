@@ -0,0 +1,148 @@
+"""
+Нагрузочный тест JSON-сервиса (app.server): запросы в секунду и задержки.
+
+Запуск: python -m benchmarks.load_server [--clients 50] [--requests 200]
+        [--write-ratio 0.1] [--batch 10] [--rows 100000] [--url http://127.0.0.1:8765]
+        [--output load.json]
+
+Без --url сервис запускается в этом же процессе на свободном порту поверх
+синтетического журнала из --rows транзакций (без записи на диск). Каждый
+клиент держит одно соединение keep-alive и отправляет запросы подряд;
+доля write-ratio запросов - POST /transactions пачками по batch транзакций.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from urllib.parse import urlsplit
+from app.cli import transaction_dict
+from app.finance_traker import FinanceTracker
+from app.server import TrackerService
+from benchmarks.ledger import generate_transactions
+
+READ_PATHS = (
+    "/balance",
+    "/balance?as_of=2021-06-30",
+    "/report/monthly?month=3&year=2021",
+    "/report/categories?type=expense",
+    "/report/period?start=2021-01-01&end=2021-12-31",
+)
+
+
+async def request(reader, writer, method: str, path: str, data=None):
+    """Отправляет запрос по открытому соединению и возвращает (код ответа, JSON)."""
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8") if data is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n"
+        .encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _client(host, port, requests, write_ratio, batches, seed, latencies, errors):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            if rng.random() < write_ratio:
+                method, path, data = "POST", "/transactions", rng.choice(batches)
+            else:
+                method, path, data = "GET", rng.choice(READ_PATHS), None
+            started = time.perf_counter()
+            status, _ = await request(reader, writer, method, path, data)
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host=None, port=None, clients: int = 50, requests: int = 200,
+                   write_ratio: float = 0.1, batch: int = 10, rows: int = 100_000) -> dict:
+    """
+    Прогоняет нагрузку и возвращает сводку: число запросов, время,
+    запросов в секунду и задержки (мс).
+    """
+    service = None
+    if host is None:
+        tracker = FinanceTracker()
+        tracker.add_transactions(list(generate_transactions(rows)))
+        service = TrackerService(tracker)
+        await service.start("127.0.0.1", 0)
+        host, port = "127.0.0.1", service.port
+    source = [transaction_dict(t) for t in generate_transactions(batch * 20, seed=1)]
+    batches = [source[i:i + batch] for i in range(0, len(source), batch)]
+    latencies, errors = [], []
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            _client(host, port, requests, write_ratio, batches, seed, latencies, errors)
+            for seed in range(clients)))
+    finally:
+        seconds = time.perf_counter() - started
+        if service is not None:
+            await service.stop()
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000 if ordered else None
+
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": seconds,
+        "per_second": len(latencies) / seconds if seconds else None,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else None,
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "write_batches": service.writes if service is not None else None,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочный тест JSON-сервиса трекера.")
+    parser.add_argument("--url", help="Адрес запущенного сервиса; без него сервис запускается здесь")
+    parser.add_argument("--clients", type=int, default=50, help="Одновременных соединений")
+    parser.add_argument("--requests", type=int, default=200, help="Запросов на соединение")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="Доля запросов на запись")
+    parser.add_argument("--batch", type=int, default=10, help="Транзакций в одном запросе на запись")
+    parser.add_argument("--rows", type=int, default=100_000, help="Размер журнала встроенного сервиса")
+    parser.add_argument("--output", help="Файл для результатов в формате JSON")
+    args = parser.parse_args(argv)
+
+    host = port = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    result = asyncio.run(run_load(host, port, args.clients, args.requests,
+                                  args.write_ratio, args.batch, args.rows))
+    print(f"Запросов: {result['requests']} (ошибок: {result['errors']}) за {result['seconds']:.2f} с")
+    print(f"В секунду: {result['per_second']:.0f}")
+    print(f"Задержка, мс: средняя {result['mean_ms']:.2f}, p50 {result['p50_ms']:.2f}, "
+          f"p95 {result['p95_ms']:.2f}, p99 {result['p99_ms']:.2f}")
+    if result["write_batches"] is not None:
+        print(f"Пачек записи после объединения: {result['write_batches']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(),
+                       "result": result}, file, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
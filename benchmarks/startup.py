@@ -0,0 +1,84 @@
+"""
+Замер времени импорта модулей приложения (python -X importtime).
+
+Запуск: python -m benchmarks.startup [--runs 5] [--output startup.json]
+Код возврата 1, если время импорта превышает бюджет или при запуске
+подгружаются тяжелые библиотеки, которые должны импортироваться лениво.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Бюджет времени импорта (медиана, мс)
+BUDGET_MS = {
+    "app.finance_traker": 100,
+    "run": 250,
+}
+# Модули, которые не должны импортироваться при запуске
+LAZY_MODULES = ("matplotlib", "numpy")
+
+
+def import_profile(module: str):
+    """
+    Импортирует модуль в отдельном процессе с -X importtime.
+    Возвращает (время импорта модуля в мс, список всех импортированных модулей).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    cumulative_us = None
+    imported = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total_us, name = line.split("|", 2)
+        name = name.strip()
+        imported.append(name)
+        if name == module:
+            cumulative_us = int(total_us)
+    return cumulative_us / 1000, imported
+
+
+def measure(module: str, runs: int = 5) -> dict:
+    """Медианное время импорта и список лениво загружаемых модулей, попавших в импорт."""
+    timings = []
+    eager = set()
+    for _ in range(runs):
+        elapsed_ms, imported = import_profile(module)
+        timings.append(elapsed_ms)
+        eager.update(name for name in imported if name.split(".")[0] in LAZY_MODULES)
+    return {
+        "module": module,
+        "median_ms": statistics.median(timings),
+        "runs_ms": timings,
+        "budget_ms": BUDGET_MS.get(module),
+        "eager_heavy_imports": sorted(eager),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Замер времени импорта приложения.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Файл для результатов в формате JSON")
+    args = parser.parse_args(argv)
+
+    results = [measure(module, args.runs) for module in BUDGET_MS]
+    failed = False
+    for item in results:
+        over_budget = item["median_ms"] > item["budget_ms"]
+        failed = failed or over_budget or bool(item["eager_heavy_imports"])
+        status = "ПРЕВЫШЕН" if over_budget else "ok"
+        print(f"{item['module']:<20} {item['median_ms']:8.1f} мс (бюджет {item['budget_ms']} мс) {status}")
+        if item["eager_heavy_imports"]:
+            print(f"  лишние импорты: {', '.join(item['eager_heavy_imports'])}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+import csv
+import pytest
+
+
+@pytest.fixture
+def write_ledger():
+    """Функция записи CSV-файла с указанными строками (заголовок - при перезаписи, не при дозаписи)."""
+    def write(path, rows, mode="w"):
+        with open(path, mode=mode, newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            if mode == "w":
+                writer.writerow(["Date", "Type", "Category", "Amount"])
+            writer.writerows(rows)
+    return write
@@ -0,0 +1,86 @@
+import csv
+import os
+import threading
+from app.autosave import AutosaveWriter
+from app.finance_traker import FinanceTracker
+from app.transaction import Transaction
+
+
+def read_rows(path):
+    """Читает строки CSV-файла без заголовка."""
+    with open(path, "r", encoding="utf-8") as file:
+        return list(csv.reader(file))[1:]
+
+
+def test_writer_coalesces_changes():
+    """Проверяет, что изменения до срока записываются одним вызовом."""
+    saved = threading.Event()
+    calls = []
+
+    def save():
+        calls.append(1)
+        saved.set()
+
+    writer = AutosaveWriter(save, delay=60, max_pending=5)
+    for _ in range(4):
+        writer.mark_dirty()
+    assert calls == []
+    writer.mark_dirty()  # пятое изменение - запись без ожидания срока
+    assert saved.wait(5)
+    writer.mark_dirty()
+    writer.close()
+    assert len(calls) == 2 and writer.pending == 0
+
+
+def test_tracker_autosave(tmpdir):
+    """Проверяет автосохранение новых, измененных и удаленных транзакций."""
+    path = str(tmpdir.join("data.csv"))
+    tracker = FinanceTracker()
+    tracker.enable_autosave(path, delay=60)
+    tracker.add_transaction(Transaction(100, "Еда", "2023-10-01", "expense"))
+    tracker.add_transaction(Transaction(50000, "Зарплата", "2023-10-01", "income"))
+    assert not os.path.exists(path)
+    tracker.flush()
+    assert len(read_rows(path)) == 2
+
+    # Дальше изменения дописываются в журнал, CSV не переписывается
+    tracker.add_transaction(Transaction(70, "Транспорт", "2023-10-02", "expense"))
+    tracker.edit_transaction(1, Transaction(150, "Еда", "2023-10-01", "expense"), path)
+    tracker.delete_transaction(2, path)
+    tracker.close()
+    assert len(read_rows(path)) == 2
+    assert os.path.exists(path + ".journal")
+
+    reloaded = FinanceTracker()
+    reloaded.load_from_csv(path)
+    assert list(reloaded.transactions) == list(tracker.transactions)
+    assert reloaded.get_balance() == -220
+
+
+def test_autosave_target_survives_export(tmpdir):
+    """Проверяет, что после экспорта в другой файл автосохранение пишет в свой файл."""
+    path, backup = str(tmpdir.join("a.csv")), str(tmpdir.join("backup.csv"))
+    tracker = FinanceTracker()
+    tracker.add_transaction(Transaction(100, "Еда", "2023-10-01", "expense"))
+    tracker.export_to_csv(path)
+    tracker.load_from_csv(path)
+    tracker.enable_autosave(path, delay=60)
+    tracker.export_to_csv(backup)
+    tracker.add_transaction(Transaction(70, "Транспорт", "2023-10-02", "expense"))
+    tracker.close()
+
+    assert not os.path.exists(backup + ".journal")
+    assert len(read_rows(backup)) == 1
+    reloaded = FinanceTracker()
+    reloaded.load_from_csv(path)
+    assert list(reloaded.transactions) == list(tracker.transactions)
+
+    # Новый файл: экспорт раньше первой записи автосохранения тоже не меняет цель
+    session, copy = str(tmpdir.join("session.csv")), str(tmpdir.join("copy.csv"))
+    tracker = FinanceTracker()
+    tracker.enable_autosave(session, delay=60)
+    tracker.export_to_csv(copy)
+    tracker.add_transaction(Transaction(5, "Еда", "2023-10-03", "expense"))
+    tracker.close()
+    assert len(read_rows(session)) == 1
+    assert read_rows(copy) == [] and not os.path.exists(copy + ".journal")
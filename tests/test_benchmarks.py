@@ -0,0 +1,26 @@
+from benchmarks.compression import measure
+from benchmarks.bench_tracker import run_size
+from benchmarks.ledger import generate_transactions
+
+
+def test_generator_is_deterministic():
+    """Проверяет, что генератор журнала воспроизводим."""
+    first = list(generate_transactions(100, categories=5, days=30))
+    assert first == list(generate_transactions(100, categories=5, days=30))
+    assert len({t.category for t in first if t.type == "expense"}) <= 5
+    assert max(t.ordinal for t in first) - min(t.ordinal for t in first) < 30
+
+
+def test_benchmark_smoke():
+    """Проверяет прогон всех замеров на маленьком журнале."""
+    results = run_size(300)
+    assert {r["operation"] for r in results} >= {"load_from_csv", "export_to_csv_a", "delete_transaction"}
+    assert all(r["seconds"] >= 0 and r["peak_bytes"] is not None for r in results)
+
+
+def test_compression_benchmark_smoke():
+    """Проверяет сравнение форматов на маленьком журнале."""
+    results = measure(300)
+    assert [r["format"] for r in results] == [".csv", ".csv.gz", ".csv.bz2", ".csv.xz"]
+    assert all(r["rows"] == 300 for r in results)
+    assert results[1]["bytes"] < results[0]["bytes"]
@@ -0,0 +1,56 @@
+import csv
+from app.bulk_import import import_csv_files
+from app.finance_traker import FinanceTracker
+from app.streaming import open_csv
+
+
+def make_rows(count, category):
+    return [[f"2023-10-{i % 28 + 1:02d}", "expense", category, f"{i}.5"] for i in range(count)]
+
+
+def test_chunked_import_keeps_order(tmpdir, write_ledger):
+    """Проверяет, что деление файла на части не меняет порядок строк."""
+    path = str(tmpdir.join("big.csv"))
+    write_ledger(path, make_rows(500, "Еда"))
+    transactions, stats = import_csv_files([path], max_workers=2, chunk_bytes=1000)
+
+    assert stats[0].chunks > 1
+    assert stats[0].rows == 500
+    assert [t.amount for t in transactions] == [i + 0.5 for i in range(500)]
+
+
+def test_tracker_imports_files_in_order(tmpdir, write_ledger):
+    """Проверяет объединение нескольких файлов в порядке их перечисления."""
+    first, second = str(tmpdir.join("a.csv")), str(tmpdir.join("b.csv"))
+    write_ledger(first, make_rows(3, "Еда"))
+    write_ledger(second, make_rows(2, "Кафе"))
+
+    tracker = FinanceTracker()
+    stats = tracker.import_csv_files([second, first])
+    assert [item.rows for item in stats] == [2, 3]
+    assert [t.category for t in tracker.transactions] == ["Кафе"] * 2 + ["Еда"] * 3
+    assert tracker.get_transaction_by_category("Еда")[0].amount == 0.5
+    assert tracker.verify_aggregates()
+
+
+def test_compressed_file_is_one_chunk(tmpdir):
+    """Проверяет, что сжатый файл разбирается целиком, одной частью."""
+    path = str(tmpdir.join("big.csv.gz"))
+    with open_csv(path, "w") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Date", "Type", "Category", "Amount"])
+        writer.writerows(make_rows(500, "Еда"))
+    transactions, stats = import_csv_files([path], max_workers=2, chunk_bytes=1000)
+
+    assert (stats[0].chunks, stats[0].rows) == (1, 500)
+    assert [t.amount for t in transactions] == [i + 0.5 for i in range(500)]
+
+
+def test_empty_file_has_no_rows(tmpdir, write_ledger):
+    """Проверяет, что пустой файл среди импортируемых дает ноль строк, а не ошибку всего импорта."""
+    empty, ledger = tmpdir.join("empty.csv"), str(tmpdir.join("data.csv"))
+    empty.write_text("", encoding="utf-8")
+    write_ledger(ledger, make_rows(2, "Еда"))
+    transactions, stats = import_csv_files([str(empty), ledger], max_workers=1)
+    assert [(item.rows, item.chunks) for item in stats] == [(0, 0), (2, 1)]
+    assert len(transactions) == 2
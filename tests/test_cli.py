@@ -0,0 +1,125 @@
+import io
+import json
+from app import cli
+from app.finance_traker import FinanceTracker
+
+
+def run(monkeypatch, capsys, argv, stdin=""):
+    """Запускает CLI и возвращает (код завершения, перехваченный вывод)."""
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    code = cli.main(argv)
+    return code, capsys.readouterr()
+
+
+def test_add_and_reports(tmpdir, monkeypatch, capsys):
+    """Проверяет пакетное добавление из JSONL и отчеты в формате JSON."""
+    ledger = str(tmpdir.join("data.csv"))
+    rows = [
+        {"amount": 100, "category": "Еда", "date": "2023-10-01", "type": "expense"},
+        {"amount": 50000, "category": "Зарплата", "date": "2023-10-01", "type": "income"},
+        {"amount": 70, "category": "Транспорт", "date": "2023-11-02", "type": "expense"},
+    ]
+    stdin = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+    code, out = run(monkeypatch, capsys, ["--file", ledger, "--json", "add"], stdin)
+    assert code == cli.EXIT_OK
+    assert json.loads(out.out) == {"added": 3, "total": 3}
+
+    code, out = run(monkeypatch, capsys, ["--file", ledger, "--json", "balance"])
+    assert json.loads(out.out) == {"income": 50000.0, "expense": 170.0, "balance": 49830.0}
+
+    code, out = run(monkeypatch, capsys, ["--file", ledger, "--json", "balance", "--as-of", "2023-10-31"])
+    assert json.loads(out.out) == {"income": 50000.0, "expense": 100.0, "balance": 49900.0}
+
+    code, out = run(monkeypatch, capsys, ["--file", ledger, "--json", "report", "--month", "10", "--year", "2023"])
+    report = json.loads(out.out)
+    assert (report["income"], report["expense"], len(report["transactions"])) == (50000.0, 100.0, 2)
+
+    code, out = run(monkeypatch, capsys, ["--file", ledger, "--json", "categories"])
+    assert json.loads(out.out) == {"Еда": 100.0, "Транспорт": 70.0}
+
+    code, out = run(monkeypatch, capsys, ["--file", ledger, "export"])
+    assert out.out.splitlines()[0] == "Date,Type,Category,Amount"
+    assert out.out.splitlines()[1:] == [
+        "2023-10-01,expense,Еда,100.0",
+        "2023-10-01,income,Зарплата,50000.0",
+        "2023-11-02,expense,Транспорт,70.0",
+    ]
+
+    code, out = run(monkeypatch, capsys, ["--file", ledger, "export", "--from", "2023-10-01",
+                                          "--to", "2023-10-31", "--type", "expense"])
+    assert out.out.splitlines()[1:] == ["2023-10-01,expense,Еда,100.0"]
+
+
+def test_invalid_input_and_missing_file(tmpdir, monkeypatch, capsys):
+    """Проверяет коды завершения при ошибочных данных и отсутствии файла."""
+    ledger = str(tmpdir.join("data.csv"))
+    stdin = "Date,Type,Category,Amount\n2023-10-01,expense,Еда,100\n2023-13-01,expense,Еда,5\n"
+    code, out = run(monkeypatch, capsys, ["--file", ledger, "add", "--format", "csv"], stdin)
+    assert code == cli.EXIT_INVALID
+    assert "строка 3" in out.err
+    assert not tmpdir.join("data.csv").exists()
+
+    code, _ = run(monkeypatch, capsys, ["--file", ledger, "balance"])
+    assert code == cli.EXIT_ERROR
+
+
+def test_balance_is_exact(tmpdir, monkeypatch, capsys):
+    """Проверяет, что баланс считается в копейках: 0.3 - 0.1 дает ровно 0.2."""
+    ledger = tmpdir.join("data.csv")
+    ledger.write_text("Date,Type,Category,Amount\n2023-10-01,income,Зарплата,0.3\n"
+                      "2023-10-02,expense,Еда,0.1\n", encoding="utf-8")
+    for extra in ([], ["--as-of", "2023-10-31"]):
+        code, out = run(monkeypatch, capsys, ["--file", str(ledger), "--json", "balance", *extra])
+        assert json.loads(out.out) == {"income": 0.3, "expense": 0.1, "balance": 0.2}
+
+
+def test_add_appends_without_loading(tmpdir, monkeypatch, capsys):
+    """Проверяет, что add дописывает строки в конец файла, не загружая и не переписывая его."""
+    ledger = tmpdir.join("data.csv")
+    ledger.write_text("Date,Type,Category,Amount\n2023-10-01,income,Зарплата,500.0\n", encoding="utf-8")
+    before = ledger.read_text(encoding="utf-8")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("журнал не должен загружаться или переписываться")
+
+    monkeypatch.setattr(FinanceTracker, "load_from_csv", fail)
+    monkeypatch.setattr(FinanceTracker, "_rewrite_csv", fail)
+    stdin = json.dumps({"amount": 5, "category": "Еда", "date": "2023-10-02", "type": "expense"}) + "\n"
+    code, out = run(monkeypatch, capsys, ["--file", str(ledger), "--json", "add"], stdin)
+    assert (code, json.loads(out.out)) == (cli.EXIT_OK, {"added": 1, "total": 2})
+    assert ledger.read_text(encoding="utf-8") == before + "2023-10-02,expense,Еда,5.0\n"
+
+
+def test_broken_ledger(tmpdir, monkeypatch, capsys):
+    """Проверяет, что ошибка разбора журнала дает код ошибки, а не пустой баланс и дозапись."""
+    ledger = tmpdir.join("data.csv")
+    ledger.write_text("Date,Type,Category,Amount\n2023-10-01,expense,Еда,сто\n", encoding="utf-8")
+    code, out = run(monkeypatch, capsys, ["--file", str(ledger), "--json", "balance"])
+    assert code == cli.EXIT_INVALID and out.out == ""
+    assert "Ошибка в данных журнала" in out.err
+
+    stdin = json.dumps({"amount": 5, "category": "Еда", "date": "2023-10-02", "type": "expense"}) + "\n"
+    code, out = run(monkeypatch, capsys, ["--file", str(ledger), "add"], stdin)
+    assert code == cli.EXIT_INVALID
+    assert ledger.read_text(encoding="utf-8").count("\n") == 2
+
+    tmpdir.join("headless.csv").write_text("a,b\n1,2\n", encoding="utf-8")
+    code, out = run(monkeypatch, capsys, ["--file", str(tmpdir.join("headless.csv")), "balance"])
+    assert code == cli.EXIT_INVALID
+
+
+def test_sqlite_ledger(tmpdir, monkeypatch, capsys):
+    """Проверяет команды с базой SQLite вместо CSV-файла."""
+    db = str(tmpdir.join("ledger.db"))
+    stdin = "Date,Type,Category,Amount\n2023-10-01,income,Зарплата,500\n2023-10-02,expense,Еда,100\n"
+    code, out = run(monkeypatch, capsys, ["--db", db, "--json", "add", "--format", "csv"], stdin)
+    assert (code, json.loads(out.out)) == (cli.EXIT_OK, {"added": 2, "total": 2})
+
+    code, out = run(monkeypatch, capsys, ["--db", db, "--json", "balance", "--as-of", "2023-10-01"])
+    assert json.loads(out.out) == {"income": 500.0, "expense": 0.0, "balance": 500.0}
+    code, out = run(monkeypatch, capsys, ["--db", db, "--json", "report", "--month", "10", "--year", "2023"])
+    assert (json.loads(out.out)["expense"], len(json.loads(out.out)["transactions"])) == (100.0, 2)
+    code, out = run(monkeypatch, capsys, ["--db", db, "--json", "categories"])
+    assert json.loads(out.out) == {"Еда": 100.0}
+    code, out = run(monkeypatch, capsys, ["--db", db, "export"])
+    assert code == cli.EXIT_INVALID
@@ -0,0 +1,63 @@
+from app.finance_traker import FinanceTracker
+from app.transaction import Transaction
+
+
+def make_trackers():
+    """Создает одинаково заполненные трекеры: списочный и колоночный."""
+    rows = [
+        Transaction(50000, "Зарплата", "2023-10-01", "income"),
+        Transaction(100, "Еда", "2023-10-02", "expense"),
+        Transaction(250.5, "Транспорт", "2023-11-03", "expense"),
+        Transaction(300, "Еда", "2023-12-31", "expense"),
+    ]
+    plain = FinanceTracker()
+    columnar = FinanceTracker(columnar=True)
+    for t in rows:
+        plain.add_transaction(t)
+        columnar.add_transaction(t)
+    return plain, columnar
+
+
+def test_columnar_row_views():
+    """Проверяет, что колоночное хранилище возвращает исходные транзакции."""
+    plain, columnar = make_trackers()
+    assert len(columnar.transactions) == 4
+    assert list(columnar.transactions) == plain.transactions
+    assert columnar.transactions[-1] == Transaction(300, "Еда", "2023-12-31", "expense")
+
+
+def test_columnar_queries_match_list():
+    """Проверяет совпадение результатов запросов с обычным списком."""
+    plain, columnar = make_trackers()
+    assert columnar.get_balance() == plain.get_balance()
+    assert columnar.get_transaction_by_category("Еда") == plain.get_transaction_by_category("Еда")
+    assert columnar.get_monthly_report(12, 2023) == plain.get_monthly_report(12, 2023)
+    assert columnar.get_expenses_by_category() == plain.get_expenses_by_category()
+    assert columnar.get_transaction_by_category("Нет такой") == []
+
+
+def test_columnar_edit_and_delete(tmpdir, monkeypatch):
+    """Проверяет редактирование и удаление в колоночном хранилище."""
+    monkeypatch.chdir(tmpdir)  # изменения сохраняются в files/data.csv
+    _, columnar = make_trackers()
+    columnar.edit_transaction(2, Transaction(200, "Кафе", "2023-10-05", "expense"))
+    columnar.delete_transaction(1)
+    assert len(columnar.transactions) == 3
+    assert columnar.transactions[0].category == "Кафе"
+    assert columnar.get_balance() == -750.5
+
+
+def test_columnar_vectorized_queries():
+    """Проверяет векторный отбор позиций колоночного хранилища и поиск через него."""
+    plain, columnar = make_trackers()
+    store = columnar.transactions
+    october = Transaction(0, "", "2023-10-01", "income").ordinal
+    assert store.filter_positions(range(4), low=october, high=october + 30) == [0, 1]
+    assert store.filter_positions([1, 2, 3], min_kopecks=20000, max_kopecks=30000) == [2, 3]
+    assert store.filter_positions([3, 1]) == [3, 1]
+    for query in (
+        {"category": "Еда", "min_amount": 200},
+        {"start": "2023-10-02", "end": "2023-11-30"},
+        {"min_amount": 100, "max_amount": 300},
+    ):
+        assert columnar.find_positions(**query) == plain.find_positions(**query)
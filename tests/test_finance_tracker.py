@@ -2,6 +2,7 @@ import os
 import csv
 from datetime import datetime
 from app.finance_traker import FinanceTracker
+from app.labels import TYPES
 from app.transaction import Transaction
 
 
@@ -14,8 +15,9 @@ def test_add_transaction():
     assert tracker.transactions[0] == transaction
 
 
-def test_delete_transaction():
+def test_delete_transaction(tmpdir, monkeypatch):
     """Проверяет удаление транзакции по индексу."""
+    monkeypatch.chdir(tmpdir)  # изменения сохраняются в files/data.csv
     tracker = FinanceTracker()
     transaction1 = Transaction(100, "Еда", "2023-10-01", "expense")
     transaction2 = Transaction(50000, "Зарплата", "2023-10-01", "income")
@@ -30,8 +32,9 @@ def test_delete_transaction():
     assert tracker.transactions[0].category == "Зарплата"
 
 
-def test_edit_transaction():
+def test_edit_transaction(tmpdir, monkeypatch):
     """Проверяет редактирование транзакции по индексу."""
+    monkeypatch.chdir(tmpdir)  # изменения сохраняются в files/data.csv
     tracker = FinanceTracker()
     transaction1 = Transaction(100, "Еда", "2023-10-01", "expense")
     transaction2 = Transaction(50000, "Зарплата", "2023-10-01", "income")
@@ -126,3 +129,38 @@ def test_edit_transaction_invalid_index():
     assert len(tracker.transactions) == 1
     assert tracker.transactions[0].amount == 100.0
     assert tracker.transactions[0].category == "Еда"
+
+
+def test_aggregates_follow_changes(tmpdir, monkeypatch):
+    """Проверяет, что итоги обновляются при добавлении, изменении и удалении."""
+    monkeypatch.chdir(tmpdir)  # изменения сохраняются в files/data.csv
+    tracker = FinanceTracker()
+    tracker.add_transaction(Transaction(50000, "Зарплата", "2023-10-01", "income"))
+    tracker.add_transaction(Transaction(1500, "Еда", "2023-10-02", "expense"))
+    tracker.add_transaction(Transaction(700, "Транспорт", "2023-11-05", "expense"))
+    tracker.edit_transaction(2, Transaction(2000, "Еда", "2023-11-02", "expense"))
+    tracker.delete_transaction(3)
+
+    assert tracker.get_balance() == 48000
+    assert tracker.get_monthly_totals(10, 2023) == (50000, 0)
+    assert tracker.get_monthly_totals(11, 2023) == (0, 2000)
+    assert tracker.get_expenses_by_category() == {"Еда": 2000}
+    assert tracker.verify_aggregates()
+
+
+def test_aggregates_after_load(tmpdir):
+    """Проверяет пересчет итогов при загрузке из CSV."""
+    filename = tmpdir.join("test_data.csv")
+    with open(filename, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Date", "Type", "Category", "Amount"])
+        writer.writerow(["2023-10-01", "expense", "Еда", "100.0"])
+        writer.writerow(["2023-10-01", "income", "Зарплата", "50000.0"])
+
+    tracker = FinanceTracker()
+    tracker.add_transaction(Transaction(999, "Старое", "2020-01-01", "expense"))
+    tracker.load_from_csv(filename)
+    assert tracker.get_balance() == 49900
+    assert tracker.verify_aggregates()
+    tracker.totals.by_type[TYPES.get("income")][0] += 1
+    assert not tracker.verify_aggregates()
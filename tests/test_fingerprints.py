@@ -0,0 +1,73 @@
+from app import finance_traker
+from app.finance_traker import FinanceTracker
+from app.fingerprints import FINGERPRINTS_SUFFIX, FingerprintIndex, fingerprint
+from app.transaction import Transaction, parse_date
+
+
+def fail_on_build(*args):
+    raise AssertionError("индекс не должен строиться заново")
+
+
+def test_fingerprint_normalizes_key():
+    """Проверяет, что регистр и лишние пробелы категории не меняют отпечаток, а сумма меняет."""
+    key = fingerprint(10000, "Еда", 738794, "expense")
+    assert fingerprint(10000, "  еда ", 738794, "Expense") == key
+    assert fingerprint(10001, "Еда", 738794, "expense") != key
+
+
+def test_index_is_extended_after_append(tmpdir, monkeypatch, write_ledger):
+    """Проверяет, что после дозаписи индекс разбирает только новые строки, а после перезаписи строится заново."""
+    path = str(tmpdir.join("ledger.csv"))
+    write_ledger(path, [["2023-10-01", "expense", "Еда", "100"], ["2023-10-01", "expense", "Еда", "100"]])
+    index = FingerprintIndex.for_csv(path)
+    key = fingerprint(10000, "Еда", parse_date("2023-10-01"), "expense")
+    assert index.counts == {key: 2}
+    assert tmpdir.join("ledger.csv" + FINGERPRINTS_SUFFIX).exists()
+
+    write_ledger(path, [["2023-10-01", "expense", "Еда", "100"], ["2023-10-02", "income", "Зарплата", "5"]], "a")
+    with monkeypatch.context() as patch:
+        patch.setattr(FingerprintIndex, "build", classmethod(fail_on_build))
+        index = FingerprintIndex.for_csv(path)
+    assert index.counts[key] == 3 and len(index.counts) == 2
+
+    write_ledger(path, [["2023-10-03", "expense", "Кафе", "7"]])
+    assert len(FingerprintIndex.for_csv(path).counts) == 1
+
+
+def test_import_skips_known_rows(tmpdir, monkeypatch, write_ledger):
+    """Проверяет импорт пересекающихся выписок: повторы пропускаются, настоящие повторы за день остаются."""
+    monkeypatch.chdir(tmpdir)
+    tmpdir.mkdir("files")
+    coffee = ["2023-10-15", "expense", "Кафе", "150"]
+    write_ledger(tmpdir.join("files", "october.csv"), [["2023-10-01", "expense", "Еда", "100"], coffee, coffee])
+    write_ledger(tmpdir.join("files", "overlap.csv"), [coffee, coffee, coffee, ["2023-11-01", "expense", "Еда", "50"]])
+
+    tracker = FinanceTracker()
+    stats = tracker.import_csv_files(["october.csv", "overlap.csv"], max_workers=1, skip_known=True)
+    assert [(item.rows, item.skipped) for item in stats] == [(3, 0), (4, 2)]
+    assert len(tracker.transactions) == 5
+
+    stats = tracker.import_csv_files(["october.csv"], max_workers=1, skip_known=True)
+    assert (stats[0].skipped, len(tracker.transactions)) == (3, 5)
+
+    # Трекер, совпадающий с файлом, берет счетчики из индекса файла, а не хэширует транзакции
+    tracker.export_to_csv("ledger.csv")
+    loaded = FinanceTracker()
+    loaded.load_from_csv("ledger.csv")
+    monkeypatch.setattr(finance_traker, "count_fingerprints", fail_on_build)
+    stats = loaded.import_csv_files(["overlap.csv"], max_workers=1, skip_known=True)
+    assert (stats[0].skipped, len(loaded.transactions)) == (4, 5)
+
+
+def test_added_transaction_is_known_to_import(tmpdir, monkeypatch, write_ledger):
+    """Проверяет, что транзакция, добавленная после построения отпечатков, не импортируется повторно."""
+    monkeypatch.chdir(tmpdir)
+    tmpdir.mkdir("files")
+    write_ledger(tmpdir.join("files", "october.csv"), [["2023-10-01", "expense", "Еда", "100"]])
+    write_ledger(tmpdir.join("files", "coffee.csv"), [["2023-10-15", "expense", "Кафе", "150"]])
+
+    tracker = FinanceTracker()
+    tracker.import_csv_files(["october.csv"], max_workers=1, skip_known=True)
+    tracker.add_transaction(Transaction(150, "Кафе", "2023-10-15", "expense"))
+    stats = tracker.import_csv_files(["coffee.csv"], max_workers=1, skip_known=True)
+    assert (stats[0].skipped, len(tracker.transactions)) == (1, 2)
@@ -0,0 +1,63 @@
+import random
+from datetime import date
+from app.finance_traker import FinanceTracker
+from app.transaction import Transaction
+
+
+def random_transaction(rng):
+    """Создает случайную транзакцию."""
+    day = date(2023, 1, 1).toordinal() + rng.randrange(400)
+    return Transaction(
+        rng.randrange(1, 1000),
+        rng.choice(["Еда", "Транспорт", "Кафе"]),
+        date.fromordinal(day),
+        rng.choice(["income", "expense"]),
+    )
+
+
+def check_against_scan(tracker):
+    """Сверяет индексные запросы с линейным перебором."""
+    rows = list(tracker.transactions)
+    for category in ("Еда", "Транспорт", "Кафе"):
+        assert tracker.get_transaction_by_category(category) == [t for t in rows if t.category == category]
+    for year, month in ((2023, 1), (2023, 6), (2024, 2)):
+        expected = [t for t in rows if (t.date.year, t.date.month) == (year, month)]
+        assert tracker.get_monthly_report(month, year) == expected
+    start, end = date(2023, 3, 10), date(2023, 9, 1)
+    expected = sorted(
+        (t for t in rows if start.toordinal() <= t.ordinal <= end.toordinal()),
+        key=lambda t: t.ordinal,
+    )
+    assert [t.ordinal for t in tracker.get_transactions_between(start, end)] == [t.ordinal for t in expected]
+    assert sorted(map(str, tracker.get_transactions_between(start, end))) == sorted(map(str, expected))
+
+
+def test_indexes_follow_changes(tmpdir):
+    """Проверяет индексы после добавления, изменения, удаления и загрузки."""
+    rng = random.Random(7)
+    for columnar in (False, True):
+        tracker = FinanceTracker(columnar=columnar)
+        for _ in range(200):
+            tracker.add_transaction(random_transaction(rng))
+        check_against_scan(tracker)
+        for _ in range(20):
+            index = rng.randrange(1, len(tracker.transactions) + 1)
+            if rng.random() < 0.5:
+                tracker.edit_transaction(index, random_transaction(rng), tmpdir.join("data.csv"))
+            else:
+                tracker.delete_transaction(index, tmpdir.join("data.csv"))
+        check_against_scan(tracker)
+
+        tracker.load_from_csv(tmpdir.join("data.csv"))
+        tracker.add_transaction(random_transaction(rng))
+        check_against_scan(tracker)
+
+
+def test_range_query_by_strings():
+    """Проверяет запрос по диапазону дат, заданных строками."""
+    tracker = FinanceTracker()
+    tracker.add_transaction(Transaction(300, "Еда", "2023-10-03", "expense"))
+    tracker.add_transaction(Transaction(100, "Еда", "2023-10-01", "expense"))
+    tracker.add_transaction(Transaction(200, "Еда", "2023-10-02", "expense"))
+    result = tracker.get_transactions_between("2023-10-01", "2023-10-02")
+    assert [t.amount for t in result] == [100, 200]
@@ -0,0 +1,38 @@
+import pstats
+from app import instrumentation
+from app.finance_traker import FinanceTracker
+from app.instrumentation import STATS, StatsRegistry
+from app.transaction import Transaction
+
+
+def test_registry_histogram():
+    """Проверяет учет вызовов, строк и корзин гистограммы."""
+    registry = StatsRegistry()
+    registry.record("op", 0.0005, rows=10)
+    registry.record("op", 0.5, rows=5)
+    stats = registry.operations["op"]
+    assert (stats.calls, stats.rows, stats.max) == (2, 15, 0.5)
+    assert stats.histogram == [1, 0, 0, 1, 0, 0]
+    assert "op" in registry.format()
+
+
+def test_tracker_methods_are_instrumented():
+    """Проверяет, что методы трекера записывают статистику."""
+    STATS.reset()
+    tracker = FinanceTracker()
+    tracker.add_transaction(Transaction(100, "Еда", "2023-10-01", "expense"))
+    tracker.add_transaction(Transaction(200, "Еда", "2023-10-02", "expense"))
+    tracker.get_monthly_report(10, 2023)
+    assert STATS.operations["tracker.add_transaction"].calls == 2
+    assert STATS.operations["tracker.get_monthly_report"].rows == 2
+
+
+def test_session_profile(tmpdir, monkeypatch):
+    """Проверяет сохранение профиля сессии по переменной окружения."""
+    path = str(tmpdir.join("session.pstats"))
+    monkeypatch.setenv(instrumentation.PROFILE_ENV, path)
+    monkeypatch.setenv(instrumentation.STATS_ENV, "1")
+    profiler = instrumentation.start_session()
+    FinanceTracker().get_balance()
+    instrumentation.finish_session(profiler)
+    assert pstats.Stats(path).total_calls > 0
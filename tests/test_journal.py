@@ -0,0 +1,175 @@
+import csv
+import os
+import pytest
+from app.bulk_import import import_csv_files
+from app.finance_traker import FinanceTracker
+from app.storage import CsvStorage, SqliteStorage, migrate_csv_files
+from app.streaming import RowFilter, aggregate_csv, iter_rows
+from app.transaction import Transaction
+
+
+def read_rows(path):
+    """Читает строки CSV-файла без заголовка."""
+    with open(path, "r", encoding="utf-8") as file:
+        return list(csv.reader(file))[1:]
+
+
+@pytest.fixture
+def ledger(tmpdir, write_ledger):
+    """Путь к CSV-файлу с тремя транзакциями."""
+    path = str(tmpdir.join("data.csv"))
+    write_ledger(path, [
+        ["2023-10-01", "expense", "Еда", "100.0"],
+        ["2023-10-01", "income", "Зарплата", "50000.0"],
+        ["2023-10-02", "expense", "Транспорт", "70.0"],
+    ])
+    return path
+
+
+def test_changes_go_to_journal(ledger):
+    """Проверяет, что изменения дописываются в журнал, а CSV не переписывается."""
+    path = ledger
+    tracker = FinanceTracker()
+    tracker.load_from_csv(path)
+    tracker.add_transaction(Transaction(300, "Кафе", "2023-10-03", "expense"))
+    tracker.edit_transaction(4, Transaction(350, "Кафе", "2023-10-03", "expense"), path)
+    tracker.delete_transaction(1, path)
+    tracker.close()
+
+    assert len(read_rows(path)) == 3
+    assert os.path.exists(path + ".journal")
+
+    reloaded = FinanceTracker()
+    reloaded.load_from_csv(path)
+    assert list(reloaded.transactions) == list(tracker.transactions)
+    assert reloaded.get_balance() == 50000 - 70 - 350
+
+
+def test_journal_compaction(ledger):
+    """Проверяет сжатие журнала в CSV при превышении порога."""
+    path = ledger
+    tracker = FinanceTracker()
+    tracker.load_from_csv(path)
+    tracker.journal_threshold = 2
+    tracker.delete_transaction(1, path)
+    assert len(read_rows(path)) == 3
+    tracker.delete_transaction(1, path)
+
+    assert read_rows(path) == [["2023-10-02", "expense", "Транспорт", "70.0"]]
+    assert not os.path.exists(path + ".journal")
+
+
+def test_stale_journal_is_ignored(ledger, write_ledger):
+    """Проверяет, что журнал не применяется к перезаписанному CSV."""
+    path = ledger
+    tracker = FinanceTracker()
+    tracker.load_from_csv(path)
+    tracker.delete_transaction(1, path)
+    tracker.delete_transaction(1, path)
+    tracker.close()
+
+    os.remove(path)
+    write_ledger(path, [["2023-11-01", "expense", "Еда", "1.0"]])
+    reloaded = FinanceTracker()
+    reloaded.load_from_csv(path)
+    assert len(reloaded.transactions) == 1
+
+
+def test_torn_journal_tail(ledger):
+    """Проверяет, что недописанная последняя запись журнала пропускается."""
+    path = ledger
+    tracker = FinanceTracker()
+    tracker.load_from_csv(path)
+    tracker.delete_transaction(1, path)
+    tracker.delete_transaction(1, path)
+    tracker.close()
+    with open(path + ".journal", "a", encoding="utf-8") as file:
+        file.write('{"op": "del')
+
+    reloaded = FinanceTracker()
+    reloaded.load_from_csv(path)
+    assert [t.category for t in reloaded.transactions] == ["Транспорт"]
+
+
+def test_append_after_torn_tail(ledger):
+    """Проверяет, что недописанная запись обрезается и не склеивается со следующей операцией."""
+    path = ledger
+    tracker = FinanceTracker()
+    tracker.load_from_csv(path)
+    tracker.delete_transaction(1, path)
+    tracker.close()
+    with open(path + ".journal", "a", encoding="utf-8") as file:
+        file.write('{"op": "del')
+
+    resumed = FinanceTracker()
+    resumed.load_from_csv(path)
+    resumed.delete_transaction(1, path)
+    resumed.close()
+
+    reloaded = FinanceTracker()
+    reloaded.load_from_csv(path)
+    assert [t.category for t in reloaded.transactions] == ["Транспорт"]
+
+
+def journaled_tracker(path):
+    """Загружает файл и вносит изменения, которые остаются в журнале."""
+    tracker = FinanceTracker()
+    tracker.load_from_csv(path)
+    tracker.add_transaction(Transaction(300, "Кафе", "2023-10-03", "expense"))
+    tracker.edit_transaction(3, Transaction(80, "Транспорт", "2023-10-02", "expense"), path)
+    tracker.delete_transaction(1, path)
+    tracker.close()
+    return tracker
+
+
+def test_readers_apply_journal(ledger):
+    """Проверяет, что чтение файла в обход трекера учитывает операции журнала."""
+    path = ledger
+    tracker = journaled_tracker(path)
+    expected = list(tracker.transactions)
+
+    assert aggregate_csv(path).balance == tracker.get_balance() == 50000 - 80 - 300
+    assert import_csv_files([path], max_workers=1)[0] == expected
+    storage = CsvStorage(path)
+    assert storage.balance() == tracker.get_balance()
+    assert storage.transactions_by_category("Еда") == []
+    assert list(iter_rows(path, RowFilter(categories="Транспорт"))) == [("2023-10-02", "expense", "Транспорт", "80.0")]
+    database = SqliteStorage(":memory:")
+    assert migrate_csv_files([path], database) == {path: 3}
+    assert database.balance() == tracker.get_balance()
+
+
+def test_append_to_journaled_file_keeps_journal(ledger):
+    """Проверяет, что дозапись не делает журнал другого трекера устаревшим: строки хранилища идут в журнал."""
+    path = ledger
+    tracker = journaled_tracker(path)
+
+    other = FinanceTracker()
+    other.add_transaction(Transaction(5, "Еда", "2023-10-05", "expense"))
+    other.export_to_csv(path, mode="a")
+    assert CsvStorage(path).append(other.transactions) == 1
+    assert len(read_rows(path)) == 3
+
+    reloaded = FinanceTracker()
+    reloaded.load_from_csv(path)
+    assert list(reloaded.transactions) == list(tracker.transactions) + list(other.transactions)
+
+
+def test_copy_keeps_journal_binding(tmpdir, ledger):
+    """Проверяет, что полная копия в другой файл не переносит журнал на нее."""
+    path = ledger
+    backup = str(tmpdir.join("backup.csv"))
+    tracker = FinanceTracker()
+    tracker.load_from_csv(path)
+    tracker.export_to_csv(backup)
+    tracker.add_transaction(Transaction(5, "Еда", "2023-10-05", "expense"))
+    tracker.delete_transaction(1, path)
+    tracker.export_to_csv(backup, mode="a")
+    tracker.close()
+
+    assert len(read_rows(path)) == 3 and os.path.exists(path + ".journal")
+    assert not os.path.exists(backup + ".journal")
+    assert len(read_rows(backup)) == 4
+    reloaded = FinanceTracker()
+    reloaded.load_from_csv(path)
+    assert list(reloaded.transactions) == list(tracker.transactions)
@@ -0,0 +1,30 @@
+import pickle
+from prompt_toolkit.document import Document
+from app.labels import CATEGORIES, LabelTable
+from app.transaction import Transaction
+from app.validation import category_completer
+
+
+def test_label_table_codes():
+    """Проверяет выдачу и стабильность кодов строк."""
+    table = LabelTable(["income", "expense"])
+    assert table.encode("expense") == 1
+    assert table.encode("transfer") == 2
+    assert table.get("нет") is None
+    assert table.decode(2) == "transfer" and len(table) == 3 and "income" in table
+
+
+def test_transactions_share_codes():
+    """Проверяет, что транзакции хранят коды общей таблицы и переживают pickle."""
+    first = Transaction(100, "Кино", "2023-10-01", "expense")
+    second = Transaction(200, "Кино", "2023-10-02", "expense")
+    assert first.category_code == second.category_code == CATEGORIES.get("Кино")
+    assert first.category == "Кино" and first.type == "expense"
+    assert pickle.loads(pickle.dumps(first)) == first
+
+
+def test_category_completer():
+    """Проверяет подсказки категорий из общей таблицы."""
+    Transaction(100, "Книги", "2023-10-01", "expense")
+    completions = [c.text for c in category_completer.get_completions(Document("кни"), None)]
+    assert "Книги" in completions
@@ -0,0 +1,73 @@
+import csv
+from app.finance_traker import FinanceTracker
+from app.transaction import Transaction
+
+
+def read_rows(path):
+    """Читает все строки CSV-файла."""
+    with open(path, "r", encoding="utf-8") as file:
+        return list(csv.reader(file))
+
+
+def fail_on_read(*args):
+    raise AssertionError("файл не должен перечитываться")
+
+
+def test_append_writes_only_tail(tmpdir):
+    """Проверяет, что дозапись пишет только новый хвост и не читает файл."""
+    path = str(tmpdir.join("archive.csv"))
+    tracker = FinanceTracker()
+    tracker.add_transaction(Transaction(100, "Еда", "2023-10-01", "expense"))
+    tracker.export_to_csv(path, mode="a")
+    tracker._existing_fingerprints = fail_on_read
+
+    tracker.add_transaction(Transaction(100, "Еда", "2023-10-01", "expense"))
+    tracker.add_transaction(Transaction(5, "Кафе", "2023-09-01", "expense"))
+    tracker.export_to_csv(path, mode="a")
+
+    assert read_rows(path) == [
+        ["Date", "Type", "Category", "Amount"],
+        ["2023-10-01", "expense", "Еда", "100.0"],
+        ["2023-10-01", "expense", "Еда", "100.0"],
+        ["2023-09-01", "expense", "Кафе", "5.0"],
+    ]
+
+
+def test_manifest_is_used_across_sessions(tmpdir):
+    """Проверяет использование манифеста новым трекером с тем же началом."""
+    path = str(tmpdir.join("archive.csv"))
+    first = FinanceTracker()
+    first.add_transaction(Transaction(100, "Еда", "2023-10-01", "expense"))
+    first.export_to_csv(path, mode="a")
+
+    second = FinanceTracker()
+    second._existing_fingerprints = fail_on_read
+    second.add_transaction(Transaction(100, "Еда", "2023-10-01", "expense"))
+    second.add_transaction(Transaction(200, "Кафе", "2023-10-02", "expense"))
+    second.export_to_csv(path, mode="a")
+    assert len(read_rows(path)) == 3
+
+
+def test_append_fallback_keeps_order_and_duplicates(tmpdir, write_ledger):
+    """Проверяет построчную сверку, когда манифест не подходит."""
+    path = str(tmpdir.join("archive.csv"))
+    write_ledger(path, [["2023-10-01", "expense", "Еда", "100.0"]])
+
+    tracker = FinanceTracker()
+    for amount, day in ((300, "03"), (100, "01"), (100, "01"), (200, "02")):
+        tracker.add_transaction(Transaction(amount, "Еда", f"2023-10-{day}", "expense"))
+    tracker.export_to_csv(path, mode="a")
+
+    assert [row[3] for row in read_rows(path)[1:]] == ["100.0", "300.0", "100.0", "200.0"]
+
+
+def test_edit_invalidates_append_mark(tmpdir):
+    """Проверяет, что изменение записанной строки отключает быструю дозапись."""
+    path = str(tmpdir.join("archive.csv"))
+    tracker = FinanceTracker()
+    tracker.add_transaction(Transaction(100, "Еда", "2023-10-01", "expense"))
+    tracker.export_to_csv(path, mode="a")
+    tracker.edit_transaction(1, Transaction(150, "Еда", "2023-10-01", "expense"), str(tmpdir.join("other.csv")))
+    tracker.export_to_csv(path, mode="a")
+
+    assert [row[3] for row in read_rows(path)[1:]] == ["100.0", "150.0"]
@@ -0,0 +1,39 @@
+from app.month_index import MONTH_INDEX_SUFFIX, month_index_for, month_offset
+from app.streaming import RowFilter, iter_rows
+
+
+def month_filter(month):
+    return RowFilter(month + "-01", month + "-28")
+
+
+def test_offsets_point_to_month_start(tmpdir, write_ledger):
+    """Проверяет, что смещения индекса указывают на первую строку месяца."""
+    path = str(tmpdir.join("sorted.csv"))
+    write_ledger(path, [[f"2023-{month:02d}-{day:02d}", "expense", "Еда", day]
+                        for month in (1, 2, 4) for day in (1, 15)])
+    index = month_index_for(path)
+    assert list(index["months"]) == ["2023-01", "2023-02", "2023-04"]
+    with open(path, "rb") as file:
+        file.seek(month_offset(index, "2023-03-10"))
+        assert file.readline().startswith(b"2023-04-01,")
+    assert month_offset(index, "2024-01-01") == index["end"]
+    assert tmpdir.join("sorted.csv" + MONTH_INDEX_SUFFIX).exists()
+
+
+def test_unsorted_file_is_read_fully(tmpdir, write_ledger):
+    """Проверяет, что неотсортированный файл не индексируется и фильтр видит все строки."""
+    path = str(tmpdir.join("unsorted.csv"))
+    write_ledger(path, [["2023-02-01", "expense", "Еда", 1], ["2023-01-05", "expense", "Еда", 2],
+                        ["2023-02-20", "expense", "Еда", 3]])
+    assert month_index_for(path) is None
+    assert [row[3] for row in iter_rows(path, month_filter("2023-02"))] == ["1", "3"]
+
+
+def test_index_is_rebuilt_after_change(tmpdir, write_ledger):
+    """Проверяет, что индекс устаревает при изменении файла и перестраивается."""
+    path = str(tmpdir.join("ledger.csv"))
+    write_ledger(path, [["2023-01-01", "expense", "Еда", 1], ["2023-02-01", "expense", "Еда", 2]])
+    assert [row[3] for row in iter_rows(path, month_filter("2023-02"))] == ["2"]
+    write_ledger(path, [["2023-03-01", "expense", "Еда", 3]], "a")
+    assert list(month_index_for(path)["months"]) == ["2023-01", "2023-02", "2023-03"]
+    assert [row[3] for row in iter_rows(path, month_filter("2023-03"))] == ["3"]
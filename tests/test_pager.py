@@ -0,0 +1,47 @@
+import io
+from app.finance_traker import FinanceTracker
+from app.transaction import Transaction
+from app.ui.pager import TransactionPager
+
+
+def make_tracker(count=45):
+    tracker = FinanceTracker()
+    for i in range(count):
+        category = "Еда" if i % 3 == 0 else "Транспорт"
+        tracker.add_transaction(Transaction(10 * (i + 1), category, f"2023-{i % 12 + 1:02d}-01", "expense"))
+    return tracker
+
+
+def test_render_only_visible_page():
+    """Проверяет, что на странице выводятся только строки текущего окна."""
+    pager = TransactionPager(make_tracker(), page_size=20)
+    assert pager.pages == 3
+    pager.next_page()
+    lines = pager.render_page().splitlines()
+    assert lines[0] == "Страница 2 из 3 (транзакций: 45)"
+    assert lines[1].startswith("21. ") and lines[-1].startswith("40. ")
+    out = io.StringIO()
+    pager.next_page()
+    pager.next_page()
+    pager.show(out)
+    assert out.getvalue().count("\n") == 7  # заголовок и 5 строк последней страницы
+
+
+def test_jump_and_filter():
+    """Проверяет переход к индексу и фильтрацию по категории, датам и сумме."""
+    tracker = make_tracker()
+    pager = TransactionPager(tracker, page_size=10)
+    assert pager.jump_to(33) and pager.page == 3
+    assert not pager.jump_to(46)
+
+    pager.apply_filter(category="Еда", min_amount=100)
+    assert pager.positions == tracker.find_positions(category="Еда", min_amount=100)
+    assert all(tracker.transactions[p].category == "Еда" for p in pager.positions)
+    assert all(tracker.transactions[p].amount >= 100 for p in pager.positions)
+    assert not pager.jump_to(2)
+    assert pager.jump_to(pager.positions[-1] + 1) and pager.page == (len(pager) - 1) // 10
+
+    positions = tracker.find_positions(start="2023-03-01", end="2023-04-30", max_amount=200)
+    assert positions == [2, 3, 14, 15]
+    pager.clear_filter()
+    assert len(pager) == 45
@@ -0,0 +1,45 @@
+from datetime import date
+from app.finance_traker import FinanceTracker
+from app.reports import month_bounds, quarter_range
+from app.transaction import Transaction
+
+
+def make_tracker():
+    tracker = FinanceTracker()
+    tracker.add_transactions([
+        Transaction(50000, "Зарплата", "2023-01-10", "income"),
+        Transaction(1000, "Еда", "2023-01-15", "expense"),
+        Transaction(500, "Транспорт", "2023-02-01", "expense"),
+        Transaction(1500, "Еда", "2023-02-20", "expense"),
+        Transaction(50000, "Зарплата", "2023-03-10", "income"),
+        Transaction(300, "Еда", "2023-04-01", "expense"),
+    ])
+    return tracker
+
+
+def test_quarter_grid_matches_monthly_reports():
+    """Проверяет сетку отчета за квартал против помесячных отчетов."""
+    tracker = make_tracker()
+    grid = tracker.get_report(*quarter_range(2023, 1))
+    assert grid.months == [(2023, 1), (2023, 2), (2023, 3)]
+    for year, month, income, expense, balance in grid.rows():
+        assert (income, expense) == tracker.get_monthly_totals(month, year)
+        assert balance == income - expense
+    assert grid.category_totals("expense") == {"Еда": 2500.0, "Транспорт": 500.0}
+    assert grid.category_series("Еда") == [1000.0, 1500.0, 0.0]
+
+    changes = grid.month_over_month("expense")
+    assert changes[0][3] is None
+    assert changes[1][2:] == (2000.0, 1000.0, 100.0)
+    assert changes[2][4] == -100.0
+
+
+def test_report_follows_changes_and_clips_range():
+    """Проверяет обрезку крайних месяцев и учет изменений после построения."""
+    tracker = make_tracker()
+    grid = tracker.get_report("2023-01-12", "2023-02-10")
+    assert grid.rows()[0][2:4] == (0.0, 1000.0)
+    assert grid.rows()[1][3] == 500.0
+    tracker._pop(2)
+    assert tracker.get_report("2023-01-01", "2023-01-31").month_total(2023, 1, "expense") == 0.0
+    assert month_bounds(date(2023, 12, 30).toordinal(), date(2024, 1, 2).toordinal())[1][:2] == (2024, 1)
@@ -0,0 +1,80 @@
+import asyncio
+from app.finance_traker import FinanceTracker
+from app.server import TrackerService
+from benchmarks.load_server import request, run_load
+
+ROWS = [
+    {"amount": 100, "category": "Еда", "date": "2023-10-01", "type": "expense"},
+    {"amount": 50000, "category": "Зарплата", "date": "2023-10-01", "type": "income"},
+    {"amount": 70, "category": "Транспорт", "date": "2023-11-02", "type": "expense"},
+]
+
+
+def serve_and(scenario):
+    """Запускает сервис на свободном порту, выполняет сценарий с открытым соединением и останавливает сервис."""
+    async def main():
+        service = TrackerService(FinanceTracker())
+        await service.start("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        try:
+            return await scenario(service, lambda *args: request(reader, writer, *args))
+        finally:
+            writer.close()
+            await service.stop()
+    return asyncio.run(main())
+
+
+def test_endpoints():
+    """Проверяет добавление транзакций и отчеты через JSON-сервис."""
+    async def scenario(service, call):
+        assert await call("POST", "/transactions", ROWS) == (201, {"added": 3, "total": 3})
+        assert await call("GET", "/balance") == (200, {"income": 50000.0, "expense": 170.0, "balance": 49830.0})
+        status, data = await call("GET", "/balance?as_of=2023-10-31")
+        assert data["expense"] == 100.0 and data["balance"] == 49900.0
+        status, report = await call("GET", "/report/monthly?month=10&year=2023")
+        assert (report["income"], report["expense"], len(report["transactions"])) == (50000.0, 100.0, 2)
+        assert await call("GET", "/report/categories") == (200, {"Еда": 100.0, "Транспорт": 70.0})
+        status, period = await call("GET", "/report/period?start=2023-10-01&end=2023-12-31")
+        assert [(m["month"], m["expense"]) for m in period["months"]] == [(10, 100.0), (11, 70.0), (12, 0.0)]
+        await call("POST", "/transactions", [{**ROWS[1], "amount": 0.3}, {**ROWS[0], "amount": 0.1}])
+        status, data = await call("GET", "/balance")
+        assert data["balance"] == 49830.2  # в копейках, без ошибки округления float
+    serve_and(scenario)
+
+
+def test_errors():
+    """Проверяет коды ответов на некорректные запросы; неверная пачка не добавляется частично."""
+    async def scenario(service, call):
+        status, data = await call("POST", "/transactions", [ROWS[0], {**ROWS[1], "type": "gift"}])
+        assert status == 400 and len(data["errors"]) == 1
+        assert service.tracker.transactions == []
+        assert (await call("GET", "/report/monthly?month=13&year=2023"))[0] == 400
+        assert (await call("GET", "/balance?as_of=2023-13-01"))[0] == 400
+        assert (await call("GET", "/unknown"))[0] == 404
+        assert (await call("GET", "/transactions"))[0] == 405
+    serve_and(scenario)
+
+
+def test_concurrent_writes_are_serialized():
+    """Проверяет, что одновременные записи не теряются и объединяются задачей записи."""
+    async def scenario(service, call):
+        async def client():
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            try:
+                return await request(reader, writer, "POST", "/transactions", ROWS)
+            finally:
+                writer.close()
+        results = await asyncio.gather(*(client() for _ in range(20)))
+        assert all(status == 201 for status, _ in results)
+        assert max(data["total"] for _, data in results) == 60
+        assert len(service.tracker.transactions) == 60
+        assert service.tracker.verify_aggregates()
+        assert service.writes <= 20
+    serve_and(scenario)
+
+
+def test_load_smoke():
+    """Проверяет прогон нагрузочного теста на маленьком журнале."""
+    result = asyncio.run(run_load(clients=5, requests=20, write_ratio=0.2, rows=500))
+    assert result["requests"] == 100 and result["errors"] == 0
+    assert result["per_second"] > 0
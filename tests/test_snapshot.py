@@ -0,0 +1,61 @@
+import os
+import app.finance_traker
+from app.finance_traker import FinanceTracker
+from app.snapshot import snapshot_path
+
+
+ROWS = [
+    ["2023-10-01", "expense", "Еда", "100.5"],
+    ["2023-10-01", "income", "Зарплата", "50000.0"],
+    ["2023-12-31", "expense", "Транспорт", "70.0"],
+]
+
+
+def test_snapshot_is_used_when_fresh(tmpdir, monkeypatch, write_ledger):
+    """Проверяет, что повторная загрузка идет из свежего снимка."""
+    path = str(tmpdir.join("data.csv"))
+    write_ledger(path, ROWS)
+    first = FinanceTracker()
+    first.load_from_csv(path)
+    assert os.path.exists(snapshot_path(path))
+
+    def fail(*args):
+        raise AssertionError("CSV не должен разбираться")
+
+    monkeypatch.setattr(app.finance_traker, "iter_transaction_batches", fail)
+    second = FinanceTracker()
+    second.load_from_csv(path)
+    assert list(second.transactions) == list(first.transactions)
+    assert second.get_balance() == first.get_balance()
+
+
+def test_stale_snapshot_is_ignored(tmpdir, write_ledger):
+    """Проверяет, что снимок не используется после изменения CSV."""
+    path = str(tmpdir.join("data.csv"))
+    write_ledger(path, ROWS)
+    FinanceTracker().load_from_csv(path)
+
+    os.remove(path)
+    write_ledger(path, ROWS[:1])
+    tracker = FinanceTracker()
+    tracker.load_from_csv(path)
+    assert len(tracker.transactions) == 1
+
+
+def test_snapshot_follows_rewrite(tmpdir, write_ledger):
+    """Проверяет обновление снимка при перезаписи CSV и применение журнала."""
+    path = str(tmpdir.join("data.csv"))
+    write_ledger(path, ROWS)
+    tracker = FinanceTracker()
+    tracker.load_from_csv(path)
+    tracker.delete_transaction(1, path)
+    tracker.close()
+
+    reloaded = FinanceTracker(columnar=True)
+    reloaded.load_from_csv(path)
+    assert [t.category for t in reloaded.transactions] == ["Зарплата", "Транспорт"]
+
+    reloaded.export_to_csv(path)
+    again = FinanceTracker()
+    again.load_from_csv(path)
+    assert list(again.transactions) == list(reloaded.transactions)
@@ -0,0 +1,7 @@
+from benchmarks.startup import BUDGET_MS, measure
+
+
+def test_no_heavy_imports_at_startup():
+    """Проверяет, что при запуске не подгружаются тяжелые библиотеки (бюджет времени - в benchmarks.startup)."""
+    for module in BUDGET_MS:
+        assert measure(module, runs=1)["eager_heavy_imports"] == []
@@ -0,0 +1,122 @@
+import pytest
+from app.finance_traker import FinanceTracker
+from app.migrate import main as migrate_main
+from app.storage import CsvStorage, SqliteStorage, StorageBackend
+from app.transaction import Transaction
+
+ROWS = [
+    ["2023-10-01", "income", "Зарплата", "50000.0"],
+    ["2023-10-02", "expense", "Еда", "1500.0"],
+    ["2023-11-01", "expense", "Еда", "500.0"],
+    ["2023-12-31", "expense", "Транспорт", "70.0"],
+]
+
+
+def test_sqlite_queries_match_tracker(tmpdir, write_ledger):
+    """Проверяет запросы SQLite на совпадение с трекером."""
+    csv_path = str(tmpdir.join("data.csv"))
+    write_ledger(csv_path, ROWS)
+    tracker = FinanceTracker()
+    tracker.load_from_csv(csv_path)
+
+    for storage in (SqliteStorage(tmpdir.join("ledger.db")), CsvStorage(tmpdir.join("copy.csv"))):
+        tracker.save_to_storage(storage)
+        assert storage.balance() == tracker.get_balance()
+        assert storage.monthly_report(10, 2023) == tracker.get_monthly_report(10, 2023)
+        assert storage.transactions_by_category("Еда") == tracker.get_transaction_by_category("Еда")
+        assert storage.category_totals("expense") == tracker.get_expenses_by_category()
+
+        storage.append([Transaction(30, "Еда", "2023-11-05", "expense")])
+        restored = FinanceTracker()
+        restored.load_from_storage(storage)
+        assert len(restored.transactions) == 5
+        assert restored.get_balance() == storage.balance()
+        storage.close()
+
+
+def test_migrate_command(tmpdir, write_ledger):
+    """Проверяет перенос нескольких CSV-файлов в базу."""
+    first, second = str(tmpdir.join("a.csv")), str(tmpdir.join("b.csv"))
+    write_ledger(first, ROWS[:2])
+    write_ledger(second, ROWS[2:])
+    db = str(tmpdir.join("ledger.db"))
+
+    assert migrate_main(["--db", db, first, second]) == 0
+    storage = SqliteStorage(db)
+    assert storage.monthly_totals(10, 2023) == (50000, 1500)
+    assert storage.balance() == 50000 - 1500 - 500 - 70
+    storage.close()
+
+    # Повторный перенос заменяет строки файла, а не дублирует их
+    write_ledger(second, ROWS[2:] + [["2024-01-01", "expense", "Еда", "30.0"]])
+    assert migrate_main(["--db", db, first, second]) == 0
+    storage = SqliteStorage(db)
+    assert storage.count() == 5
+    assert storage.balance() == 50000 - 1500 - 500 - 70 - 30
+    storage.close()
+
+
+def test_tracker_queries_attached_storage(tmpdir, write_ledger):
+    """Проверяет, что трекер с подключенным хранилищем отвечает запросами к нему, не загружая строки."""
+    csv_path = str(tmpdir.join("data.csv"))
+    write_ledger(csv_path, ROWS)
+    loaded = FinanceTracker()
+    loaded.load_from_csv(csv_path)
+    storage = SqliteStorage(tmpdir.join("ledger.db"))
+    loaded.save_to_storage(storage)
+
+    tracker = FinanceTracker()
+    tracker.attach_storage(storage)
+    tracker.add_transaction(Transaction(30, "Еда", "2023-11-05", "expense"))
+    loaded.add_transaction(Transaction(30, "Еда", "2023-11-05", "expense"))
+    assert len(tracker.transactions) == 0 and tracker.get_transaction_count() == 5
+    assert tracker.get_balance() == loaded.get_balance()
+    assert tracker.get_totals("2023-10-31") == loaded.get_totals("2023-10-31") == (50000, 1500)
+    assert tracker.get_monthly_totals(11, 2023) == loaded.get_monthly_totals(11, 2023)
+    assert tracker.get_monthly_report(11, 2023) == loaded.get_monthly_report(11, 2023)
+    assert tracker.get_transaction_by_category("Еда") == loaded.get_transaction_by_category("Еда")
+    assert tracker.get_expenses_by_category() == loaded.get_expenses_by_category()
+    tracker.close()
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "csv"])
+def test_storage_mode_range_queries(tmpdir, write_ledger, backend):
+    """Проверяет запросы за период в режиме хранилища и явный отказ там, где хранилище не отвечает."""
+    csv_path = str(tmpdir.join("data.csv"))
+    write_ledger(csv_path, ROWS)
+    loaded = FinanceTracker()
+    loaded.load_from_csv(csv_path)
+    if backend == "sqlite":
+        storage = SqliteStorage(tmpdir.join("ledger.db"))
+    else:
+        storage = CsvStorage(tmpdir.join("copy.csv"))
+    loaded.save_to_storage(storage)
+
+    tracker = FinanceTracker()
+    tracker.attach_storage(storage)
+    for day in ("2023-10-01", "2023-11-30", "2099-01-01"):
+        assert tracker.get_balance_as_of(day) == loaded.get_balance_as_of(day)
+    period = ("2023-10-02", "2023-11-30")
+    assert tracker.get_totals_between(*period) == loaded.get_totals_between(*period) == (0, 2000)
+    assert tracker.get_transactions_between("2023-10-02", "2023-12-31") == loaded.get_transactions_between(
+        "2023-10-02", "2023-12-31")
+    assert tracker.get_monthly_series() == loaded.get_monthly_series()
+    for query in (lambda: tracker.get_report("2023-01-01", "2023-12-31"),
+                  lambda: tracker.get_running_balance("2023-10-01", "2023-10-31"),
+                  lambda: tracker.find_positions(category="Еда"),
+                  lambda: tracker.delete_transaction(1),
+                  lambda: tracker.export_to_csv(str(tmpdir.join("out.csv")))):
+        with pytest.raises(NotImplementedError):
+            query()
+    tracker.close()
+
+
+def test_backend_interface_is_abstract():
+    """Проверяет, что хранилище без реализации запросов нельзя создать."""
+    class Incomplete(StorageBackend):
+        def iter_batches(self):
+            return iter(())
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
@@ -0,0 +1,117 @@
+import csv
+import os
+import pytest
+from app.finance_traker import FinanceTracker
+from app.snapshot import snapshot_path
+from app.streaming import RowFilter, aggregate_csv, is_csv_name, iter_transaction_batches, open_csv
+from app.transaction import Transaction
+
+
+def test_batches_are_bounded(tmpdir, write_ledger):
+    """Проверяет, что транзакции выдаются пачками ограниченного размера."""
+    path = tmpdir.join("ledger.csv")
+    write_ledger(path, [["2023-10-%02d" % day, "expense", "Еда", day] for day in range(1, 11)])
+    batches = list(iter_transaction_batches(path, batch_size=4))
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert batches[2][1].amount == 10.0
+
+
+def test_columns_are_found_by_header(tmpdir):
+    """Проверяет чтение файла с другим порядком колонок."""
+    path = tmpdir.join("ledger.csv")
+    with open(path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Amount", "Category", "Type", "Date"])
+        writer.writerow(["100.5", "Еда", "expense", "2023-10-01"])
+    (transaction,), = iter_transaction_batches(path)
+    assert transaction.amount == 100.5
+    assert transaction.type == "expense"
+
+
+def test_aggregate_only(tmpdir, write_ledger):
+    """Проверяет подсчет итогов без загрузки строк."""
+    path = tmpdir.join("ledger.csv")
+    write_ledger(path, [
+        ["2023-10-01", "income", "Зарплата", "50000"],
+        ["2023-10-02", "expense", "Еда", "1500"],
+        ["2023-11-01", "expense", "Еда", "500"],
+    ])
+    totals = aggregate_csv(path)
+    assert totals.balance == 48000
+    assert totals.category_totals("expense") == {"Еда": 2000}
+    assert totals.month_total("expense", 10, 2023) == 1500
+    assert totals.month_total("income", 11, 2023) == 0
+
+
+@pytest.mark.parametrize("suffix", [".csv.gz", ".csv.bz2", ".csv.xz"])
+def test_compressed_export_and_load(tmpdir, monkeypatch, suffix):
+    """Проверяет запись, дозапись и чтение сжатых CSV без распаковки на диск."""
+    monkeypatch.chdir(tmpdir)
+    tracker = FinanceTracker()
+    tracker.add_transaction(Transaction(100, "Еда", "2023-10-01", "expense"))
+    tracker.export_to_csv("ledger" + suffix)
+    tracker.add_transaction(Transaction(50000, "Зарплата", "2023-10-02", "income"))
+    tracker.export_to_csv("ledger" + suffix, "a")
+
+    path = tmpdir.join("files", "ledger" + suffix)
+    with open_csv(path) as file:
+        assert file.read().splitlines() == [
+            "Date,Type,Category,Amount", "2023-10-01,expense,Еда,100.0", "2023-10-02,income,Зарплата,50000.0"]
+    with open(path, "rb") as file:
+        assert not file.read().startswith(b"Date")
+
+    loaded = FinanceTracker()
+    loaded.load_from_csv("ledger" + suffix)
+    assert loaded.transactions == tracker.transactions
+    assert not os.path.exists(snapshot_path(path))
+    assert is_csv_name("ledger" + suffix) and not is_csv_name("ledger" + suffix + ".tmp")
+
+
+def test_filtered_load_skips_rows_before_parsing(tmpdir, monkeypatch, write_ledger):
+    """Проверяет загрузку с фильтром: отброшенные строки не разбираются, исходный файл не перезаписывается."""
+    monkeypatch.chdir(tmpdir)
+    tmpdir.mkdir("files")
+    write_ledger(tmpdir.join("files", "data.csv"), [
+        ["2023-09-30", "expense", "Еда", "не число"],
+        ["2023-10-01", "expense", "Еда", "100"],
+        ["2023-10-5", "expense", "Кафе", "7"],
+        ["2023-10-31", "income", "Зарплата", "50000"],
+        ["2023-11-01", "expense", "Еда", "не число"],
+    ])
+    tracker = FinanceTracker()
+    tracker.load_from_csv("data.csv", start="2023-10-01", end="2023-10-31", transaction_type="expense")
+    assert [(t.category, t.amount) for t in tracker.transactions] == [("Еда", 100.0), ("Кафе", 7.0)]
+
+    tracker.load_from_csv("data.csv", start="2023-10-01", end="2023-10-31", categories=["Зарплата"])
+    assert tracker.totals.income == 50000.0
+    tracker.export_to_csv("data.csv")
+    assert len(list(iter_transaction_batches(tmpdir.join("files", "data.csv"), row_filter=RowFilter(
+        categories="Кафе")))[0]) == 1
+    tracker.export_to_csv("october.csv")
+    assert tmpdir.join("files", "october.csv").exists()
+
+
+def test_filtered_load_applies_journal(tmpdir, monkeypatch):
+    """Проверяет, что при непустом журнале фильтр применяется после его операций."""
+    monkeypatch.chdir(tmpdir)
+    tracker = FinanceTracker()
+    tracker.add_transaction(Transaction(100, "Еда", "2023-10-01", "expense"))
+    tracker.add_transaction(Transaction(5, "Кафе", "2023-10-02", "expense"))
+    tracker.export_to_csv("data.csv")
+    tracker.edit_transaction(1, Transaction(200, "Еда", "2023-10-01", "expense"), "data.csv")
+    tracker.close()
+
+    filtered = FinanceTracker()
+    filtered.load_from_csv("data.csv", categories="Еда")
+    assert [t.amount for t in filtered.transactions] == [200.0]
+
+
+def test_filtered_load_rejects_bad_dates(tmpdir, monkeypatch, write_ledger):
+    """Проверяет, что дата не в формате ГГГГ-ММ-ДД не проходит фильтр по тексту, а отклоняется как без фильтра."""
+    monkeypatch.chdir(tmpdir)
+    tmpdir.mkdir("files")
+    write_ledger(tmpdir.join("files", "data.csv"), [["01.10.2023", "expense", "Еда", "100"]])
+    with pytest.raises(ValueError):
+        FinanceTracker().load_from_csv("data.csv", start="2023-01-01", end="2023-12-31", strict=True)
+    with pytest.raises(ValueError):
+        FinanceTracker().load_from_csv("data.csv", strict=True)
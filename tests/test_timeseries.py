@@ -0,0 +1,83 @@
+import math
+import random
+from datetime import date
+from app.finance_traker import FinanceTracker
+from app.timeseries import MAX_DENSE_DAYS, DailySeries
+from app.transaction import Transaction
+
+
+def brute_total(tracker, transaction_type, start, end, category=None):
+    return sum(
+        t.amount for t in tracker.transactions
+        if t.type == transaction_type and start <= t.ordinal <= end
+        and (category is None or t.category == category)
+    )
+
+
+def test_daily_series_grows_both_ways():
+    """Проверяет префиксные суммы при расширении ряда в обе стороны."""
+    series = DailySeries()
+    series.add(10_000, 500)
+    series.prefix(10_000)  # дерево построено, дальше точечные обновления
+    series.add(10_003, 200)
+    series.add(5_000, 100)  # раньше начала ряда
+    series.add(20_000, 400)  # дальше конца ряда
+    assert series.prefix(4_999) == 0
+    assert series.prefix(10_000) == 600
+    assert series.between(10_001, 19_999) == 200
+    assert series.prefix(30_000) == 1200
+
+
+def test_outlier_dates_do_not_stretch_series():
+    """Проверяет, что далекие даты (0023, 9999 год) хранятся отдельно и учитываются в суммах."""
+    series = DailySeries()
+    first, last = date(23, 1, 1).toordinal(), date(9999, 12, 31).toordinal()
+    series.add_days({first: 5, date(2023, 1, 10).toordinal(): 100, last: 7})
+    series.add(date(2023, 6, 1).toordinal(), 200)
+    series.add(date(500, 1, 1).toordinal(), 3)
+    assert len(series.days) <= MAX_DENSE_DAYS
+    assert series.prefix(first) == 5
+    assert series.prefix(date(2023, 12, 31).toordinal()) == 308
+    assert series.between(date(2000, 1, 1).toordinal(), last) == 307
+    series.add(first, -5)
+    assert series.prefix(date(1000, 1, 1).toordinal()) == 3 and series.day(first) == 0
+
+
+def test_tracker_time_queries_match_full_scan():
+    """Сверяет запросы по датам с полным перебором после изменений."""
+    rng = random.Random(7)
+    tracker = FinanceTracker()
+    categories = ["Еда", "Транспорт", "Зарплата"]
+    start = date(2023, 1, 1).toordinal()
+
+    def random_transaction():
+        day = date.fromordinal(start + rng.randrange(365)).isoformat()
+        return Transaction(rng.randint(1, 1000), rng.choice(categories), day, rng.choice(["income", "expense"]))
+
+    tracker.add_transactions([random_transaction() for _ in range(300)])
+    tracker.get_balance_as_of("2023-06-30")  # ряды строятся при первом запросе
+    for _ in range(50):
+        action = rng.random()
+        if action < 0.4:
+            tracker.add_transaction(random_transaction())
+        elif action < 0.7:
+            tracker._replace(rng.randint(1, len(tracker.transactions)), random_transaction())
+        else:
+            tracker._pop(rng.randint(1, len(tracker.transactions)))
+
+    for _ in range(20):
+        low = start + rng.randrange(365)
+        high = low + rng.randrange(120)
+        income, expense = tracker.get_totals_between(date.fromordinal(low), date.fromordinal(high))
+        assert math.isclose(income, brute_total(tracker, "income", low, high), abs_tol=1e-6)
+        assert math.isclose(expense, brute_total(tracker, "expense", low, high), abs_tol=1e-6)
+        assert math.isclose(
+            tracker.get_category_total_between("Еда", date.fromordinal(low), date.fromordinal(high)),
+            brute_total(tracker, "expense", low, high, "Еда"), abs_tol=1e-6)
+        assert math.isclose(
+            tracker.get_balance_as_of(date.fromordinal(high)),
+            brute_total(tracker, "income", 0, high) - brute_total(tracker, "expense", 0, high), abs_tol=1e-6)
+
+    curve = tracker.get_running_balance("2023-12-01", "2023-12-31")
+    assert len(curve) == 31
+    assert math.isclose(curve[-1][1], tracker.get_balance_as_of("2023-12-31"), abs_tol=1e-6)
@@ -1,4 +1,6 @@
-from app.transaction import Transaction
+from app.finance_traker import FinanceTracker
+import pytest
+from app.transaction import Transaction, format_amount, format_money, to_kopecks
 from datetime import datetime
 
 
@@ -16,3 +18,60 @@ def test_transaction_str():
     transaction = Transaction(100, "Еда", "2023-10-01", "expense")
     expected_str = "2023-10-01 | EXPENSE | Еда: 100.0 руб."
     assert str(transaction) == expected_str
+
+
+def test_transaction_date_parsing():
+    """Проверяет быстрый и запасной разбор даты."""
+    assert Transaction(1, "Еда", "2023-10-01", "expense").ordinal == datetime(2023, 10, 1).toordinal()
+    assert Transaction(1, "Еда", "2023-1-5", "expense").date == datetime(2023, 1, 5)
+    try:
+        Transaction(1, "Еда", "01.10.2023", "expense")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ожидалась ошибка разбора даты")
+
+
+def test_transaction_equality_and_hash():
+    """Проверяет сравнение и хэширование транзакций."""
+    first = Transaction(100, "Еда", "2023-10-01", "expense")
+    second = Transaction(100.0, "Еда", "2023-10-01", "expense")
+    assert first == second
+    assert hash(first) == hash(second)
+    assert len({first, second}) == 1
+    assert not hasattr(first, "__dict__")
+
+
+def test_amount_in_kopecks():
+    """Проверяет точное хранение сумм в копейках и сравнение транзакций."""
+    transaction = Transaction("0.29", "Еда", "2023-10-01", "expense")
+    assert transaction.kopecks == 29
+    assert Transaction(0.1 + 0.2, "Еда", "2023-10-01", "expense") == Transaction(0.3, "Еда", "2023-10-01", "expense")
+    assert format_amount(10000) == "100.0" and format_amount(1235) == "12.35"
+    assert format_money(-5) == "-0.05" and format_money(123456) == "1234.56"
+
+
+def test_balance_is_exact():
+    """Проверяет, что суммирование копеек не накапливает ошибку."""
+    tracker = FinanceTracker()
+    tracker.add_transactions([Transaction(0.1, "Еда", "2023-10-01", "income") for _ in range(1000)])
+    tracker.add_transaction(Transaction(0.3, "Еда", "2023-10-02", "expense"))
+    assert tracker.get_balance() == 99.7
+
+
+def test_string_amounts_are_exact():
+    """Проверяет точный разбор строковых сумм и округление половины вверх."""
+    assert to_kopecks("123456789012345.67") == 12345678901234567
+    assert to_kopecks("0.125") == 13 and to_kopecks("-0.125") == -13
+    assert to_kopecks(" 100 ") == 10000 and to_kopecks("5.") == 500 and to_kopecks(".5") == 50
+    assert to_kopecks("-12.3") == -1230 and to_kopecks("1e+16") == 10 ** 18
+    for bad in ("", "сто", "nan", "1.2.3"):
+        with pytest.raises(ValueError):
+            to_kopecks(bad)
+
+
+def test_float_amounts_round_like_strings():
+    """Проверяет, что float округляется до копеек так же, как его запись строкой."""
+    for text in ("1.005", "0.125", "-2.675", "100.5", "0.1"):
+        assert to_kopecks(float(text)) == to_kopecks(text)
+    assert to_kopecks(0.1 + 0.2) == 30
@@ -0,0 +1,53 @@
+import os
+from app.finance_traker import FinanceTracker
+from app.transaction import Transaction
+from app.visualization import ChartRenderer, render_charts
+
+
+def make_tracker():
+    tracker = FinanceTracker()
+    tracker.add_transaction(Transaction(50000, "Зарплата", "2023-10-01", "income"))
+    tracker.add_transaction(Transaction(1500, "Еда", "2023-10-02", "expense"))
+    tracker.add_transaction(Transaction(700, "Транспорт", "2023-11-05", "expense"))
+    return tracker
+
+
+def test_monthly_series():
+    """Проверяет помесячные итоги для графиков."""
+    assert make_tracker().get_monthly_series() == [(2023, 10, 50000, 1500), (2023, 11, 0, 700)]
+
+
+def test_render_charts_is_cached(tmpdir):
+    """Проверяет сохранение графиков в файлы и пропуск повторной отрисовки."""
+    tracker = make_tracker()
+    out_dir = str(tmpdir.join("charts"))
+    paths, cached = tracker.render_charts(out_dir, formats=("png", "svg"))
+    assert not cached
+    assert len(paths) == 6
+    assert all(os.path.getsize(path) > 0 for path in paths)
+
+    assert tracker.render_charts(out_dir, formats=("png", "svg")) == (paths, True)
+
+    tracker.add_transaction(Transaction(10, "Еда", "2023-11-06", "expense"))
+    new_paths, cached = tracker.render_charts(out_dir, formats=("png", "svg"))
+    assert not cached
+    assert set(new_paths).isdisjoint(paths)
+
+
+def test_render_charts_without_expenses_is_cached(tmpdir):
+    """Проверяет кэш, когда круговая диаграмма не рисуется (нет расходов)."""
+    out_dir = str(tmpdir.join("charts"))
+    months = [(2023, 10, 50000.0, 0.0)]
+    paths, cached = render_charts({}, months, out_dir)
+    assert len(paths) == 2 and not cached
+    assert render_charts({}, months, out_dir) == (paths, True)
+    assert render_charts({}, [], out_dir) == ([], False)
+
+
+def test_background_renderer(tmpdir):
+    """Проверяет отрисовку в фоновом потоке."""
+    renderer = ChartRenderer()
+    future = renderer.submit(make_tracker(), str(tmpdir.join("charts")))
+    renderer.shutdown()
+    paths, cached = future.result()
+    assert len(paths) == 3 and not cached